@@ -28,12 +28,20 @@ MLIR_CAPI_EXPORTED MlirStringRef aieTranslateToIPU(MlirOperation op);
 MLIR_CAPI_EXPORTED MlirStringRef aieTranslateToXAIEV2(MlirOperation op);
 MLIR_CAPI_EXPORTED MlirStringRef aieTranslateToBCF(MlirOperation op, int col,
                                                    int row);
+MLIR_CAPI_EXPORTED MlirStringRef aieTranslateToLdScript(MlirOperation op,
+                                                        int col, int row);
+MLIR_CAPI_EXPORTED MlirStringRef aieTranslateToTargetArch(MlirOperation op);
+MLIR_CAPI_EXPORTED MlirStringRef aieTranslateGraphXPE(MlirOperation op);
+MLIR_CAPI_EXPORTED MlirStringRef aieTranslateShimSolution(MlirOperation op);
+MLIR_CAPI_EXPORTED MlirStringRef aieTranslateSCSimConfig(MlirOperation op);
+MLIR_CAPI_EXPORTED MlirStringRef aieFlowsToJSON(MlirOperation op);
 MLIR_CAPI_EXPORTED MlirStringRef aieLLVMLink(MlirStringRef *modules,
                                              int nModules);
 #ifdef AIE_ENABLE_GENERATE_CDO_DIRECT
 MLIR_CAPI_EXPORTED MlirLogicalResult aieTranslateToCDODirect(
     MlirOperation moduleOp, MlirStringRef workDirPath, byte_ordering endianness,
-    bool emitUnified, bool axiDebug, bool aieSim, size_t partitionStartCol);
+    bool emitUnified, bool axiDebug, bool aieSim, size_t partitionStartCol,
+    MlirStringRef *sections, int nSections);
 #endif
 
 #ifdef __cplusplus
@@ -28,7 +28,11 @@ std::unique_ptr<mlir::OperationPass<AIE::DeviceOp>>
 createAIELowerMulticastPass();
 std::unique_ptr<mlir::OperationPass<AIE::DeviceOp>>
 createAIEBroadcastPacketPass();
+std::unique_ptr<mlir::OperationPass<AIE::DeviceOp>>
+createAIEAssignIpuBdIdsPass();
 std::unique_ptr<mlir::OperationPass<AIE::DeviceOp>> createAIEDmaToIpuPass();
+std::unique_ptr<mlir::OperationPass<AIE::DeviceOp>>
+createAIEOptimizeIpuInstructionsPass();
 std::unique_ptr<mlir::OperationPass<mlir::ModuleOp>> createAIEXToStandardPass();
 
 /// Generate the code for registering passes.
@@ -18,8 +18,11 @@ extern "C" {
 #include "mlir/IR/BuiltinOps.h"
 #include "mlir/Support/LogicalResult.h"
 
+#include "llvm/ADT/ArrayRef.h"
 #include "llvm/Support/raw_ostream.h"
 
+#include <string>
+
 namespace xilinx {
 namespace AIE {
 
@@ -35,8 +38,19 @@ mlir::LogicalResult AIETranslateShimSolution(mlir::ModuleOp module,
                                              llvm::raw_ostream &);
 mlir::LogicalResult AIETranslateGraphXPE(mlir::ModuleOp module,
                                          llvm::raw_ostream &);
-mlir::LogicalResult AIETranslateToIPU(mlir::ModuleOp module,
-                                      llvm::raw_ostream &output);
+/// Encodings of the IPU instruction stream written by AIETranslateToIPU.
+enum class IPUInstFormat {
+  /// One hex word per line.
+  Text,
+  /// Raw little-endian 32-bit words.
+  Binary,
+  /// Raw little-endian 32-bit words, preceded by the number of words.
+  LengthPrefixed,
+};
+
+mlir::LogicalResult
+AIETranslateToIPU(mlir::ModuleOp module, llvm::raw_ostream &output,
+                  IPUInstFormat format = IPUInstFormat::Text);
 std::vector<uint32_t> AIETranslateToIPU(mlir::ModuleOp);
 mlir::LogicalResult AIETranslateToLdScript(mlir::ModuleOp module,
                                            llvm::raw_ostream &output,
@@ -55,7 +69,8 @@ mlir::LogicalResult
 AIETranslateToCDODirect(mlir::ModuleOp m, llvm::StringRef workDirPath,
                         byte_ordering endianness = Little_Endian,
                         bool emitUnified = false, bool axiDebug = false,
-                        bool aieSim = false, size_t partitionStartCol = 1);
+                        bool aieSim = false, size_t partitionStartCol = 1,
+                        llvm::ArrayRef<std::string> sections = {});
 #endif
 #ifdef AIE_ENABLE_AIRBIN
 mlir::LogicalResult AIETranslateToAirbin(mlir::ModuleOp module,
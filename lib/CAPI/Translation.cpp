@@ -59,11 +59,15 @@ MlirStringRef aieTranslateModuleToLLVMIR(MlirOperation moduleOp) {
 MlirLogicalResult
 aieTranslateToCDODirect(MlirOperation moduleOp, MlirStringRef workDirPath,
                         byte_ordering endianness, bool emitUnified,
-                        bool axiDebug, bool aieSim, size_t partitionStartCol) {
+                        bool axiDebug, bool aieSim, size_t partitionStartCol,
+                        MlirStringRef *sections, int nSections) {
   ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  std::vector<std::string> sectionNames;
+  for (int i = 0; i < nSections; ++i)
+    sectionNames.emplace_back(sections[i].data, sections[i].length);
   auto status = AIETranslateToCDODirect(
       mod, llvm::StringRef(workDirPath.data, workDirPath.length), endianness,
-      emitUnified, axiDebug, aieSim, partitionStartCol);
+      emitUnified, axiDebug, aieSim, partitionStartCol, sectionNames);
   std::vector<std::string> diagnostics;
   ScopedDiagnosticHandler handler(mod.getContext(), [&](Diagnostic &d) {
     llvm::raw_string_ostream(diagnostics.emplace_back())
@@ -110,6 +114,72 @@ MlirStringRef aieTranslateToBCF(MlirOperation moduleOp, int col, int row) {
   return mlirStringRefCreate(cStr, bcf.size());
 }
 
+MlirStringRef aieTranslateToLdScript(MlirOperation moduleOp, int col, int row) {
+  std::string ldScript;
+  llvm::raw_string_ostream os(ldScript);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIETranslateToLdScript(mod, os, col, row)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(ldScript.size()));
+  ldScript.copy(cStr, ldScript.size());
+  return mlirStringRefCreate(cStr, ldScript.size());
+}
+
+MlirStringRef aieTranslateToTargetArch(MlirOperation moduleOp) {
+  std::string arch;
+  llvm::raw_string_ostream os(arch);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIETranslateToTargetArch(mod, os)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(arch.size()));
+  arch.copy(cStr, arch.size());
+  return mlirStringRefCreate(cStr, arch.size());
+}
+
+MlirStringRef aieTranslateGraphXPE(MlirOperation moduleOp) {
+  std::string xpe;
+  llvm::raw_string_ostream os(xpe);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIETranslateGraphXPE(mod, os)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(xpe.size()));
+  xpe.copy(cStr, xpe.size());
+  return mlirStringRefCreate(cStr, xpe.size());
+}
+
+MlirStringRef aieTranslateShimSolution(MlirOperation moduleOp) {
+  std::string shimSolution;
+  llvm::raw_string_ostream os(shimSolution);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIETranslateShimSolution(mod, os)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(shimSolution.size()));
+  shimSolution.copy(cStr, shimSolution.size());
+  return mlirStringRefCreate(cStr, shimSolution.size());
+}
+
+MlirStringRef aieTranslateSCSimConfig(MlirOperation moduleOp) {
+  std::string scsimConfig;
+  llvm::raw_string_ostream os(scsimConfig);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIETranslateSCSimConfig(mod, os)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(scsimConfig.size()));
+  scsimConfig.copy(cStr, scsimConfig.size());
+  return mlirStringRefCreate(cStr, scsimConfig.size());
+}
+
+MlirStringRef aieFlowsToJSON(MlirOperation moduleOp) {
+  std::string json;
+  llvm::raw_string_ostream os(json);
+  ModuleOp mod = llvm::cast<ModuleOp>(unwrap(moduleOp));
+  if (failed(AIEFlowsToJSON(mod, os)))
+    return mlirStringRefCreate(nullptr, 0);
+  char *cStr = static_cast<char *>(malloc(json.size()));
+  json.copy(cStr, json.size());
+  return mlirStringRefCreate(cStr, json.size());
+}
+
 MlirStringRef aieLLVMLink(MlirStringRef *modules, int nModules) {
   std::string ll;
   llvm::raw_string_ostream os(ll);
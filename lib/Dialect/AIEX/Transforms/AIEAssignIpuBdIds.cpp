@@ -0,0 +1,208 @@
+//===- AIEAssignIpuBdIds.cpp ------------------------------------*- C++ -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+#include "aie/Dialect/AIE/IR/AIEDialect.h"
+#include "aie/Dialect/AIEX/IR/AIEXDialect.h"
+#include "aie/Dialect/AIEX/Transforms/AIEXPasses.h"
+
+#include "mlir/Dialect/Func/IR/FuncOps.h"
+#include "mlir/Pass/Pass.h"
+
+#include "llvm/ADT/DenseMap.h"
+
+#define DEBUG_TYPE "aie-assign-ipu-bd-ids"
+
+using namespace mlir;
+using namespace xilinx;
+using namespace xilinx::AIEX;
+
+namespace {
+
+// A transfer whose BD is in use.
+struct InFlight {
+  IpuDmaMemcpyNdOp op;
+  AIE::DMAChannelDir channelDir;
+  int channelIndex;
+  // Order in which the transfers were issued.
+  unsigned issued;
+};
+
+struct BdIdAllocator {
+  const AIE::AIETargetModel &targetModel;
+  llvm::DenseMap<StringRef, AIE::ShimDMAAllocationOp> allocations;
+  // The transfers in flight on each shim column, by BD id.
+  llvm::DenseMap<int, SmallVector<std::optional<InFlight>>> columns;
+  unsigned issued = 0;
+  unsigned numSerialized = 0;
+
+  BdIdAllocator(AIE::DeviceOp device) : targetModel(device.getTargetModel()) {
+    for (auto alloc : device.getOps<AIE::ShimDMAAllocationOp>())
+      allocations[alloc.getSymName()] = alloc;
+  }
+
+  SmallVector<std::optional<InFlight>> &bds(int col) {
+    auto &bds = columns[col];
+    if (bds.empty())
+      bds.resize(targetModel.getNumBDs(col, 0));
+    return bds;
+  }
+
+  // The host has waited on a channel of `col`: a sync returns once the tasks
+  // pushed before it on its channel have issued their tokens.
+  void wait(int col, AIE::DMAChannelDir channelDir, int channelIndex) {
+    for (auto &bd : bds(col))
+      if (bd && bd->channelDir == channelDir &&
+          bd->channelIndex == channelIndex)
+        bd = std::nullopt;
+  }
+
+  // MM2S tasks don't issue tokens, so the host can't wait for them directly.
+  // Once it has received every output issued so far, though, the inputs sent
+  // before then have been consumed, and their BDs are free again. (Inputs sent
+  // ahead for outputs that are only issued later need explicit ids.)
+  void releaseInputsIfDrained() {
+    for (auto &column : columns)
+      for (auto &bd : column.second)
+        if (bd && bd->channelDir == AIE::DMAChannelDir::S2MM)
+          return;
+    for (auto &column : columns)
+      for (auto &bd : column.second)
+        if (bd && bd->channelDir == AIE::DMAChannelDir::MM2S)
+          bd = std::nullopt;
+  }
+
+  // The first MM2S transfer in flight issued after `transfer`, on any column.
+  std::optional<InFlight> laterInput(const InFlight &transfer) {
+    std::optional<InFlight> first;
+    for (auto &column : columns)
+      for (auto &bd : column.second)
+        if (bd && bd->channelDir == AIE::DMAChannelDir::MM2S &&
+            bd->issued > transfer.issued &&
+            (!first || bd->issued < first->issued))
+          first = bd;
+    return first;
+  }
+
+  void visitSync(IpuSyncOp op) {
+    auto channelDir = static_cast<AIE::DMAChannelDir>(op.getDirection());
+    for (int col = op.getColumn(), e = col + op.getColumnNum(); col < e; col++)
+      wait(col, channelDir, op.getChannel());
+    if (channelDir == AIE::DMAChannelDir::S2MM)
+      releaseInputsIfDrained();
+  }
+
+  LogicalResult visitMemcpy(IpuDmaMemcpyNdOp op) {
+    auto alloc = allocations.lookup(op.getMetadata());
+    if (!alloc)
+      return op.emitOpError("couldn't find shim_dma_allocation op");
+    int col = alloc.getCol();
+    InFlight transfer{op, alloc.getChannelDir(),
+                      static_cast<int>(alloc.getChannelIndex()), issued++};
+    auto &inFlight = bds(col);
+
+    if (int64_t id = op.getId(); id >= 0) {
+      if (id >= static_cast<int64_t>(inFlight.size()))
+        return op.emitOpError("BD ID exceeds the maximum ID.");
+      if (auto &earlier = inFlight[id]) {
+        auto diag = op.emitWarning("BD ")
+                    << id << " of shim column " << col
+                    << " may still be in use by an earlier transfer";
+        diag.attachNote(earlier->op.getLoc()) << "earlier transfer here";
+      }
+      inFlight[id] = transfer;
+      return success();
+    }
+
+    auto isFree = [](const std::optional<InFlight> &bd) { return !bd; };
+    if (llvm::none_of(inFlight, isFree)) {
+      // Wait for the oldest transfer that can be waited for.
+      std::optional<InFlight> oldest;
+      for (auto &bd : inFlight)
+        if (bd->channelDir == AIE::DMAChannelDir::S2MM &&
+            (!oldest || bd->issued < oldest->issued))
+          oldest = bd;
+      if (!oldest)
+        return op.emitOpError("all ")
+               << inFlight.size() << " BDs of shim column " << col
+               << " are in use by MM2S transfers, which can't be waited for";
+      // The output may be computed from inputs that are only sent after it,
+      // and then waiting for it never returns.
+      if (auto later = laterInput(*oldest)) {
+        auto diag = op.emitOpError("all ")
+                    << inFlight.size() << " BDs of shim column " << col
+                    << " are in use, and waiting for the transfer on S2MM "
+                       "channel "
+                    << oldest->channelIndex
+                    << " could deadlock, as it may depend on an MM2S transfer "
+                       "issued after it";
+        diag.attachNote(oldest->op.getLoc()) << "S2MM transfer here";
+        diag.attachNote(later->op.getLoc()) << "later MM2S transfer here";
+        return diag;
+      }
+      op.emitWarning("all ")
+          << inFlight.size() << " BDs of shim column " << col
+          << " are in use: waiting for the transfer on S2MM channel "
+          << oldest->channelIndex << " serializes this one";
+      OpBuilder builder(op);
+      builder.create<IpuSyncOp>(op.getLoc(), col, /*row=*/0,
+                                static_cast<uint32_t>(oldest->channelDir),
+                                oldest->channelIndex, /*column_num=*/1,
+                                /*row_num=*/1);
+      wait(col, oldest->channelDir, oldest->channelIndex);
+      releaseInputsIfDrained();
+      numSerialized++;
+    }
+
+    auto free = llvm::find_if(inFlight, isFree);
+    int id = std::distance(inFlight.begin(), free);
+    LLVM_DEBUG(llvm::dbgs()
+               << "BD " << id << " of column " << col << ": " << op << "\n");
+    op.setIdAttr(IntegerAttr::get(IntegerType::get(op.getContext(), 64), id));
+    *free = transfer;
+    return success();
+  }
+};
+
+} // namespace
+
+struct AIEAssignIpuBdIdsPass : AIEAssignIpuBdIdsBase<AIEAssignIpuBdIdsPass> {
+  void runOnOperation() override {
+    AIE::DeviceOp device = getOperation();
+    for (auto f : device.getOps<func::FuncOp>()) {
+      if (f.isDeclaration())
+        continue;
+      // BDs are not carried over from one runtime sequence to the next.
+      BdIdAllocator allocator(device);
+      for (Operation &o : f.getBody().front()) {
+        if (auto sync = dyn_cast<IpuSyncOp>(o))
+          allocator.visitSync(sync);
+        else if (auto memcpy = dyn_cast<IpuDmaMemcpyNdOp>(o);
+                 memcpy && failed(allocator.visitMemcpy(memcpy)))
+          return signalPassFailure();
+      }
+      numSerializedTransfers += allocator.numSerialized;
+
+      auto unassigned = f.walk([](IpuDmaMemcpyNdOp op) {
+        if (static_cast<int64_t>(op.getId()) >= 0)
+          return WalkResult::advance();
+        op.emitOpError("BD IDs are only assigned to the transfers at the top "
+                       "level of a runtime sequence");
+        return WalkResult::interrupt();
+      });
+      if (unassigned.wasInterrupted())
+        return signalPassFailure();
+    }
+  }
+};
+
+std::unique_ptr<OperationPass<AIE::DeviceOp>>
+AIEX::createAIEAssignIpuBdIdsPass() {
+  return std::make_unique<AIEAssignIpuBdIdsPass>();
+}
@@ -231,6 +231,8 @@ struct DmaToIpuPattern : OpConversionPattern<IpuDmaMemcpyNdOp> {
     ddr_id = IntegerAttr::get(i32ty, arg_idx);
 
     // bd_id
+    if (static_cast<int64_t>(op.getId()) < 0)
+      return op.emitOpError("has no BD ID; run aie-assign-ipu-bd-ids first");
     bd_id = IntegerAttr::get(i32ty, op.getId());
 
     // buffer_length
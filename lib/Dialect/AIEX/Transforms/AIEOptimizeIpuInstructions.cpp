@@ -0,0 +1,182 @@
+//===- AIEOptimizeIpuInstructions.cpp ---------------------------*- C++ -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+#include "aie/Dialect/AIE/IR/AIEDialect.h"
+#include "aie/Dialect/AIEX/IR/AIEXDialect.h"
+#include "aie/Dialect/AIEX/Transforms/AIEXPasses.h"
+
+#include "mlir/Dialect/Func/IR/FuncOps.h"
+#include "mlir/Interfaces/SideEffectInterfaces.h"
+#include "mlir/Pass/Pass.h"
+
+#include "llvm/ADT/DenseMap.h"
+#include "llvm/ADT/DenseSet.h"
+
+#define DEBUG_TYPE "aie-optimize-ipu-instructions"
+
+using namespace mlir;
+using namespace xilinx;
+using namespace xilinx::AIEX;
+
+namespace {
+
+// Shim tile DMA registers, as in AIEDmaToIpu.cpp and aiex.py.
+constexpr uint32_t SHIM_DMA_BD0_BASE_ADDR = 0x1D000;
+constexpr uint32_t SHIM_BD_OFFSET = 0x20;
+constexpr uint32_t SHIM_NUM_BDS = 16;
+constexpr uint32_t SHIM_DMA_S2MM_0_TASK_QUEUE = 0x1D204;
+constexpr uint32_t SHIM_DMA_MM2S_0_TASK_QUEUE = 0x1D214;
+constexpr uint32_t TASK_QUEUE_START_BD_ID_MASK = 0xF;
+
+bool isTaskQueue(uint32_t address) {
+  for (uint32_t queue :
+       {SHIM_DMA_S2MM_0_TASK_QUEUE, SHIM_DMA_MM2S_0_TASK_QUEUE})
+    if (address == queue || address == queue + 0x8)
+      return true;
+  return false;
+}
+
+// What is known about the registers of one shim BD.
+struct BdState {
+  // The writebd_shimtile whose values the registers hold, but for the ones in
+  // `registers`.
+  IpuWriteBdExShimTileOp writeBd;
+  // Registers written by write32s since, by their offset in the BD.
+  llvm::DenseMap<uint32_t, uint32_t> registers;
+  // Writes to the BD that no DMA can have read yet, as no task has been pushed
+  // on the column since them. They are dead once they are overwritten.
+  // (Rewriting a BD that a running task still uses is racy to begin with.)
+  IpuWriteBdExShimTileOp pendingWriteBd;
+  llvm::DenseMap<uint32_t, IpuWrite32Op> pendingRegisters;
+
+  void forget() {
+    writeBd = nullptr;
+    registers.clear();
+  }
+};
+
+struct IpuInstructionOptimizer {
+  // Keyed by (column, bd_id).
+  llvm::DenseMap<std::pair<int, int>, BdState> bds;
+  SmallVector<Operation *> erased;
+
+  void erase(Operation *op) {
+    erased.push_back(op);
+    op->remove();
+  }
+
+  void visitWriteBd(IpuWriteBdExShimTileOp op) {
+    BdState &bd = bds[{op.getColumn(), op.getBdId()}];
+    if (bd.writeBd && bd.registers.empty() &&
+        bd.writeBd->getAttrDictionary() == op->getAttrDictionary()) {
+      LLVM_DEBUG(llvm::dbgs() << "redundant: " << op << "\n");
+      return erase(op);
+    }
+    // All the registers of the BD are overwritten.
+    if (bd.pendingWriteBd)
+      erase(bd.pendingWriteBd);
+    for (auto &[offset, write] : bd.pendingRegisters)
+      erase(write);
+    bd = {op, {}, op, {}};
+  }
+
+  void visitWrite32(IpuWrite32Op op) {
+    uint32_t address = op.getAddress();
+    if (op.getRow() != 0)
+      return;
+    if (isTaskQueue(address))
+      return visitPush(op.getColumn(),
+                       op.getValue() & TASK_QUEUE_START_BD_ID_MASK);
+    if (address < SHIM_DMA_BD0_BASE_ADDR ||
+        address >= SHIM_DMA_BD0_BASE_ADDR + SHIM_NUM_BDS * SHIM_BD_OFFSET)
+      return;
+
+    int bdId = (address - SHIM_DMA_BD0_BASE_ADDR) / SHIM_BD_OFFSET;
+    uint32_t offset = (address - SHIM_DMA_BD0_BASE_ADDR) % SHIM_BD_OFFSET;
+    BdState &bd = bds[{op.getColumn(), bdId}];
+    if (auto known = bd.registers.find(offset);
+        known != bd.registers.end() && known->second == op.getValue()) {
+      LLVM_DEBUG(llvm::dbgs() << "redundant: " << op << "\n");
+      return erase(op);
+    }
+    if (auto pending = bd.pendingRegisters.find(offset);
+        pending != bd.pendingRegisters.end())
+      erase(pending->second);
+    bd.registers[offset] = op.getValue();
+    bd.pendingRegisters[offset] = op;
+  }
+
+  // A task starting at BD `bdId` is pushed on a queue of `column`: from now on
+  // the DMA may read any BD of the column, and may update the ones of the task
+  // (their iteration state).
+  void visitPush(int column, int bdId) {
+    for (auto &[key, bd] : bds)
+      if (key.first == column) {
+        bd.pendingWriteBd = nullptr;
+        bd.pendingRegisters.clear();
+      }
+
+    llvm::DenseSet<int> visited;
+    for (std::optional<int> next = bdId;
+         next && visited.insert(*next).second;) {
+      BdState &bd = bds[{column, *next}];
+      if (!bd.writeBd || !bd.registers.empty()) {
+        // The chain of the task is not known.
+        for (auto &[key, other] : bds)
+          if (key.first == column)
+            other.forget();
+        return;
+      }
+      if (bd.writeBd.getUseNextBd())
+        next = bd.writeBd.getNextBd();
+      else
+        next = std::nullopt;
+      bd.forget();
+    }
+  }
+
+  // Returns the number of instructions removed.
+  size_t run(Block &block) {
+    for (Operation &o : llvm::make_early_inc_range(block)) {
+      auto writeBd = dyn_cast<IpuWriteBdExShimTileOp>(o);
+      if (writeBd && writeBd.getColumnNum() == 1)
+        visitWriteBd(writeBd);
+      else if (auto write32 = dyn_cast<IpuWrite32Op>(o))
+        visitWrite32(write32);
+      else if (isa<IpuSyncOp, func::ReturnOp>(o) || isMemoryEffectFree(&o))
+        continue;
+      else
+        // Anything else may touch the BDs in ways that aren't modeled.
+        bds.clear();
+    }
+    for (Operation *op : erased)
+      op->destroy();
+    return erased.size();
+  }
+};
+
+} // namespace
+
+struct AIEOptimizeIpuInstructionsPass
+    : AIEOptimizeIpuInstructionsBase<AIEOptimizeIpuInstructionsPass> {
+  void runOnOperation() override {
+    AIE::DeviceOp device = getOperation();
+    for (auto f : device.getOps<func::FuncOp>()) {
+      if (f.isDeclaration())
+        continue;
+      numRemovedWrites += IpuInstructionOptimizer().run(f.getBody().front());
+    }
+  }
+};
+
+std::unique_ptr<OperationPass<AIE::DeviceOp>>
+AIEX::createAIEOptimizeIpuInstructionsPass() {
+  return std::make_unique<AIEOptimizeIpuInstructionsPass>();
+}
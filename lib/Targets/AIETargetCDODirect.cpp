@@ -751,15 +751,25 @@ LogicalResult generateCDOBinary(const StringRef outputPath,
   return success();
 }
 
+// Generate the separate CDO binaries, or only those named in `sections`
+// ("error_handling", "elfs", "init" and "enable"). Only the "elfs" section
+// reads the core ELFs, so the others can be generated before the cores are
+// compiled, and each section can be generated by a separate process.
 LogicalResult generateCDOBinariesSeparately(AIEControl &ctl,
                                             const StringRef workDirPath,
-                                            DeviceOp &targetOp, bool aieSim) {
-  if (failed(generateCDOBinary(
+                                            DeviceOp &targetOp, bool aieSim,
+                                            ArrayRef<std::string> sections) {
+  auto wanted = [&sections](StringRef section) {
+    return sections.empty() || llvm::is_contained(sections, section);
+  };
+
+  if (wanted("error_handling") &&
+      failed(generateCDOBinary(
           workDirPath.str() + ps + "aie_cdo_error_handling.bin",
           std::bind(&AIEControl::addErrorHandlingToCDO, ctl))))
     return failure();
 
-  if (!targetOp.getOps<CoreOp>().empty() &&
+  if (wanted("elfs") && !targetOp.getOps<CoreOp>().empty() &&
       failed(generateCDOBinary(workDirPath.str() + ps + "aie_cdo_elfs.bin",
                                [&ctl, &targetOp, &workDirPath, &aieSim] {
                                  return ctl.addAieElfsToCDO(
@@ -767,12 +777,13 @@ LogicalResult generateCDOBinariesSeparately(AIEControl &ctl,
                                })))
     return failure();
 
-  if (failed(generateCDOBinary(
+  if (wanted("init") &&
+      failed(generateCDOBinary(
           workDirPath.str() + ps + "aie_cdo_init.bin",
           [&ctl, &targetOp] { return ctl.addInitConfigToCDO(targetOp); })))
     return failure();
 
-  if (!targetOp.getOps<CoreOp>().empty() &&
+  if (wanted("enable") && !targetOp.getOps<CoreOp>().empty() &&
       failed(generateCDOBinary(
           workDirPath.str() + ps + "aie_cdo_enable.bin",
           [&ctl, &targetOp] { return ctl.addCoreEnableToCDO(targetOp); })))
@@ -806,7 +817,17 @@ namespace xilinx::AIE {
 LogicalResult AIETranslateToCDODirect(ModuleOp m, llvm::StringRef workDirPath,
                                       byte_ordering endianness,
                                       bool emitUnified, bool axiDebug,
-                                      bool aieSim, size_t partitionStartCol) {
+                                      bool aieSim, size_t partitionStartCol,
+                                      ArrayRef<std::string> sections) {
+  // A misspelled section would otherwise silently produce no file.
+  static const StringRef knownSections[] = {"error_handling", "elfs", "init",
+                                            "enable"};
+  for (const std::string &section : sections)
+    if (!llvm::is_contained(knownSections, section))
+      return m.emitError("unknown CDO section '")
+             << section
+             << "'; expected one of error_handling, elfs, init, enable";
+
   auto devOps = m.getOps<DeviceOp>();
   assert(llvm::range_size(devOps) == 1 &&
          "only exactly 1 device op supported.");
@@ -826,6 +847,7 @@ LogicalResult AIETranslateToCDODirect(ModuleOp m, llvm::StringRef workDirPath,
   initializeCDOGenerator(endianness, axiDebug);
   if (emitUnified)
     return generateCDOUnified(ctl, workDirPath, targetOp, aieSim);
-  return generateCDOBinariesSeparately(ctl, workDirPath, targetOp, aieSim);
+  return generateCDOBinariesSeparately(ctl, workDirPath, targetOp, aieSim,
+                                       sections);
 }
 } // namespace xilinx::AIE
@@ -18,6 +18,7 @@
 
 #include "llvm/ADT/ArrayRef.h"
 #include "llvm/ADT/TypeSwitch.h"
+#include "llvm/Support/EndianStream.h"
 #include "llvm/Support/Format.h"
 
 #include <vector>
@@ -154,9 +155,20 @@ std::vector<uint32_t> xilinx::AIE::AIETranslateToIPU(ModuleOp module) {
 }
 
 LogicalResult xilinx::AIE::AIETranslateToIPU(ModuleOp module,
-                                             raw_ostream &output) {
+                                             raw_ostream &output,
+                                             IPUInstFormat format) {
   auto instructions = AIETranslateToIPU(module);
+  if (format == IPUInstFormat::Text) {
+    for (auto w : instructions)
+      output << llvm::format("%08X\n", w);
+    return success();
+  }
+  // The binary formats can be mapped straight into the instruction buffer of
+  // a little-endian host, without parsing.
+  if (format == IPUInstFormat::LengthPrefixed)
+    llvm::support::endian::write<uint32_t>(output, instructions.size(),
+                                           llvm::endianness::little);
   for (auto w : instructions)
-    output << llvm::format("%08X\n", w);
+    llvm::support::endian::write<uint32_t>(output, w, llvm::endianness::little);
   return success();
 }
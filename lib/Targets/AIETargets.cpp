@@ -149,8 +149,22 @@ void registerAIETranslations() {
   static llvm::cl::opt<size_t> cdoPartitionStartCol(
       "cdo-partition-start-col", llvm::cl::init(1),
       llvm::cl::desc("Partition starting column for CDO generation"));
+  static llvm::cl::list<std::string> cdoSections(
+      "cdo-section", llvm::cl::CommaSeparated,
+      llvm::cl::desc("Only emit these separate CDO bins (error_handling, "
+                     "elfs, init, enable); default is all"));
 #endif
 
+  static llvm::cl::opt<IPUInstFormat> ipuInstFormat(
+      "aie-ipu-instgen-format", llvm::cl::init(IPUInstFormat::Text),
+      llvm::cl::desc("Encoding of the IPU instruction stream"),
+      llvm::cl::values(
+          clEnumValN(IPUInstFormat::Text, "text", "one hex word per line"),
+          clEnumValN(IPUInstFormat::Binary, "binary",
+                     "raw little-endian words"),
+          clEnumValN(IPUInstFormat::LengthPrefixed, "length-prefixed",
+                     "raw little-endian words, preceded by the word count")));
+
   TranslateFromMLIRRegistration registrationMMap(
       "aie-generate-mmap", "Generate AIE memory map",
       [](ModuleOp module, raw_ostream &output) {
@@ -311,14 +325,14 @@ void registerAIETranslations() {
         LLVM_DEBUG(llvm::dbgs() << "work-dir-path: " << workDirPath_ << "\n");
         return AIETranslateToCDODirect(module, workDirPath_.c_str(), endianness,
                                        cdoUnified, axiDebug, cdoAieSim,
-                                       cdoPartitionStartCol);
+                                       cdoPartitionStartCol, cdoSections);
       },
       registerDialects);
 #endif
   TranslateFromMLIRRegistration registrationIPU(
       "aie-ipu-instgen", "Generate instructions for IPU",
       [](ModuleOp module, raw_ostream &output) {
-        return AIETranslateToIPU(module, output);
+        return AIETranslateToIPU(module, output, ipuInstFormat);
       },
       registerDialects);
 }
@@ -96,15 +96,19 @@ PYBIND11_MODULE(_aie, m) {
       "generate_cdo",
       [](MlirOperation op, const std::string &workDirPath,
          byte_ordering endianness, bool emitUnified, bool axiDebug, bool aieSim,
-         size_t partitionStartCol) {
+         size_t partitionStartCol, const std::vector<std::string> &sections) {
+        std::vector<MlirStringRef> sectionRefs;
+        for (auto &section : sections)
+          sectionRefs.push_back({section.data(), section.size()});
         if (mlirLogicalResultIsFailure(aieTranslateToCDODirect(
                 op, {workDirPath.data(), workDirPath.size()}, endianness,
-                emitUnified, axiDebug, aieSim, partitionStartCol)))
+                emitUnified, axiDebug, aieSim, partitionStartCol,
+                sectionRefs.data(), sectionRefs.size())))
           throw std::runtime_error("Failed to generate cdo");
       },
       "module"_a, "work_dir_path"_a, "endianness"_a = Little_Endian,
       "emit_unified"_a = false, "axi_debug"_a = false, "aiesim"_a = false,
-      "partition_start_col"_a = 1);
+      "partition_start_col"_a = 1, "sections"_a = std::vector<std::string>{});
 #endif
 
   m.def(
@@ -133,6 +137,46 @@ PYBIND11_MODULE(_aie, m) {
       },
       "module"_a, "col"_a, "row"_a);
 
+  m.def(
+      "generate_ldscript",
+      [&stealCStr](MlirOperation op, int col, int row) {
+        return stealCStr(aieTranslateToLdScript(op, col, row));
+      },
+      "module"_a, "col"_a, "row"_a);
+
+  m.def(
+      "generate_target_arch",
+      [&stealCStr](MlirOperation op) {
+        return stealCStr(aieTranslateToTargetArch(op));
+      },
+      "module"_a);
+
+  m.def(
+      "generate_xpe",
+      [&stealCStr](MlirOperation op) {
+        return stealCStr(aieTranslateGraphXPE(op));
+      },
+      "module"_a);
+
+  m.def(
+      "generate_shim_solution",
+      [&stealCStr](MlirOperation op) {
+        return stealCStr(aieTranslateShimSolution(op));
+      },
+      "module"_a);
+
+  m.def(
+      "generate_scsim_config",
+      [&stealCStr](MlirOperation op) {
+        return stealCStr(aieTranslateSCSimConfig(op));
+      },
+      "module"_a);
+
+  m.def(
+      "generate_flows_json",
+      [&stealCStr](MlirOperation op) { return stealCStr(aieFlowsToJSON(op)); },
+      "module"_a);
+
   m.def(
       "aie_llvm_link",
       [&stealCStr](std::vector<std::string> moduleStrs) {
@@ -14,6 +14,7 @@
 #include "mlir/Bindings/Python/PybindAdaptors.h"
 #include "mlir/CAPI/IR.h"
 
+#include <pybind11/numpy.h>
 #include <pybind11/operators.h>
 
 using namespace mlir;
@@ -145,7 +146,35 @@ void xilinx::AIE::bindTypes(py::module_ &m) {
            py::return_value_policy::reference)
       .def("get_num_dest_switchbox_connections",
            &AIETargetModel::getNumDestSwitchboxConnections,
-           py::return_value_policy::reference);
+           py::return_value_policy::reference)
+      // The source and destination connection counts of the switchboxes of the
+      // whole array, as (source, dest) dicts from bundle to a (col, row) array,
+      // instead of one call per tile and bundle.
+      .def(
+          "get_switchbox_capacities",
+          [](const AIETargetModel &targetModel, int maxCol, int maxRow) {
+            py::dict sources, dests;
+            for (WireBundle bundle : {WireBundle::North, WireBundle::South,
+                                      WireBundle::East, WireBundle::West}) {
+              py::array_t<uint32_t> source({maxCol + 1, maxRow + 1});
+              py::array_t<uint32_t> dest({maxCol + 1, maxRow + 1});
+              auto sourceView = source.mutable_unchecked<2>();
+              auto destView = dest.mutable_unchecked<2>();
+              for (int col = 0; col <= maxCol; col++)
+                for (int row = 0; row <= maxRow; row++) {
+                  sourceView(col, row) =
+                      targetModel.getNumSourceSwitchboxConnections(col, row,
+                                                                   bundle);
+                  destView(col, row) =
+                      targetModel.getNumDestSwitchboxConnections(col, row,
+                                                                 bundle);
+                }
+              sources[py::cast(bundle)] = source;
+              dests[py::cast(bundle)] = dest;
+            }
+            return py::make_tuple(sources, dests);
+          },
+          py::arg("max_col"), py::arg("max_row"));
 
   py::class_<PySwitchboxOp, PyOperation>(m, "SwitchboxOp")
       .def("get_tileid", [](const PySwitchboxOp &p) {
@@ -19,9 +19,15 @@
 #include <pybind11/stl.h>
 
 #include <algorithm>
+#include <cstring>
 #include <string>
 #include <vector>
 
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
 namespace py = pybind11;
 using namespace py::literals;
 
@@ -54,6 +60,66 @@ public:
     ipuInstructions->sync(XCL_BO_SYNC_BO_TO_DEVICE);
   }
 
+  // The words of a contiguous uint32 array, as built by the batched encoders of
+  // aie.dialects.aiex.ipu, are copied in one go.
+  void loadIPUInstructionsArray(
+      const py::array_t<uint32_t, py::array::c_style> &insts) {
+    ipuInstructions = std::make_unique<xrt::bo>(
+        *device, insts.nbytes(), XCL_BO_FLAGS_CACHEABLE, kernel->group_id(0));
+    std::memcpy(ipuInstructions->map<uint32_t *>(), insts.data(),
+                insts.nbytes());
+    ipuInstructions->sync(XCL_BO_SYNC_BO_TO_DEVICE);
+  }
+
+  // Loads the instructions written by `aie-translate --aie-ipu-instgen
+  // --aie-ipu-instgen-format=binary` (or `length-prefixed`): the file is
+  // mmapped and its little-endian words copied into the instruction buffer as
+  // they are, without any parsing.
+  void loadIPUInstructionsFile(const std::string &path, bool lengthPrefixed) {
+    int fd = open(path.c_str(), O_RDONLY);
+    if (fd < 0)
+      throw std::runtime_error("couldn't open " + path);
+    struct stat st;
+    if (fstat(fd, &st) < 0) {
+      close(fd);
+      throw std::runtime_error("couldn't stat " + path);
+    }
+    size_t nBytes = st.st_size;
+    if (nBytes == 0 || nBytes % sizeof(uint32_t)) {
+      close(fd);
+      throw std::runtime_error(path + " is not a binary instruction stream");
+    }
+    void *mapped = mmap(nullptr, nBytes, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (mapped == MAP_FAILED)
+      throw std::runtime_error("couldn't mmap " + path);
+
+    const uint32_t *words = static_cast<const uint32_t *>(mapped);
+    size_t nWords = nBytes / sizeof(uint32_t);
+    if (lengthPrefixed) {
+      if (words[0] != nWords - 1) {
+        munmap(mapped, nBytes);
+        throw std::runtime_error(path + " holds " + std::to_string(nWords - 1) +
+                                 " words but its header says " +
+                                 std::to_string(words[0]));
+      }
+      ++words;
+      --nWords;
+    }
+    if (nWords == 0) {
+      munmap(mapped, nBytes);
+      throw std::runtime_error(path + " holds no instructions");
+    }
+
+    ipuInstructions =
+        std::make_unique<xrt::bo>(*device, nWords * sizeof(uint32_t),
+                                  XCL_BO_FLAGS_CACHEABLE, kernel->group_id(0));
+    std::memcpy(ipuInstructions->map<uint32_t *>(), words,
+                nWords * sizeof(uint32_t));
+    munmap(mapped, nBytes);
+    ipuInstructions->sync(XCL_BO_SYNC_BO_TO_DEVICE);
+  }
+
   template <typename ElementT>
   std::vector<py::memoryview>
   mmapBuffers(std::vector<std::vector<int>> shapes) {
@@ -145,7 +211,11 @@ PYBIND11_MODULE(_xrt, m) {
   py::class_<PyXCLBin>(m, "XCLBin", py::module_local())
       .def(py::init<const std::string &, const std::string &, int>(),
            "xclbin_path"_a, "kernel_name"_a, "device_index"_a = 0)
+      .def("load_ipu_instructions", &PyXCLBin::loadIPUInstructionsArray,
+           "insts"_a.noconvert())
       .def("load_ipu_instructions", &PyXCLBin::loadIPUInstructions, "insts"_a)
+      .def("load_ipu_instructions_file", &PyXCLBin::loadIPUInstructionsFile,
+           "path"_a, "length_prefixed"_a = false)
       .def("sync_buffers_to_device", &PyXCLBin::syncBuffersToDevice)
       .def("sync_buffers_from_device", &PyXCLBin::syncBuffersFromDevice)
       .def("run", &PyXCLBin::run)
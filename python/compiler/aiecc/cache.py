@@ -0,0 +1,130 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Content-addressed on-disk cache for per-core build artifacts.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "aiecc",
+)
+
+# Bump this whenever the layout of a cache entry or the way keys are computed changes.
+CACHE_VERSION = 1
+
+
+def hash_file(path, h=None):
+    if h is None:
+        h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h
+
+
+def toolchain_fingerprint(tools):
+    """Identify the tools used to build an artifact by their resolved path, size
+    and modification time, which is much cheaper than asking each for its version."""
+    fingerprint = []
+    for tool in tools:
+        path = tool if os.path.isabs(tool) else shutil.which(tool)
+        if path is None or not os.path.exists(path):
+            fingerprint.append(f"{tool}:missing")
+            continue
+        path = os.path.realpath(path)
+        st = os.stat(path)
+        fingerprint.append(f"{tool}:{path}:{st.st_size}:{st.st_mtime_ns}")
+    return fingerprint
+
+
+class BuildCache:
+    """Stores build outputs under the hash of everything that went into them.
+
+    Each entry is a directory `<cache_dir>/<key[:2]>/<key>` holding the cached
+    files by name. The modification time of the entry directory is used as its
+    last-use time; when the cache grows beyond `max_size` bytes, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size=None):
+        self.cache_dir = os.path.join(os.path.abspath(cache_dir), f"v{CACHE_VERSION}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, files=(), strings=()):
+        h = hashlib.sha256()
+        for s in strings:
+            h.update(str(s).encode())
+            h.update(b"\0")
+        for f in files:
+            hash_file(f, h)
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def lookup(self, key, outputs):
+        """Copy the cached files for `key` to the paths in `outputs` (a dict of
+        entry file name to destination path). Returns True on a hit."""
+        entry = self._entry_dir(key)
+        if not all(os.path.isfile(os.path.join(entry, name)) for name in outputs):
+            self.misses += 1
+            return False
+        for name, dst in outputs.items():
+            shutil.copyfile(os.path.join(entry, name), dst)
+        # Mark the entry as recently used.
+        os.utime(entry)
+        self.hits += 1
+        return True
+
+    def store(self, key, outputs):
+        """Insert the files in `outputs` (entry file name to source path) into
+        the cache under `key`, then evict old entries if over budget."""
+        if not all(os.path.isfile(src) for src in outputs.values()):
+            return
+        entry = self._entry_dir(key)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # Populate a private directory and rename it into place so that
+        # concurrent builds never observe a partially written entry.
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=os.path.dirname(entry))
+        for name, src in outputs.items():
+            shutil.copyfile(src, os.path.join(staging, name))
+        try:
+            os.rename(staging, entry)
+        except OSError:
+            # Someone else stored the same entry first.
+            shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        for prefix in os.scandir(self.cache_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                size = sum(f.stat().st_size for f in os.scandir(entry.path))
+                yield entry.path, entry.stat().st_mtime, size
+
+    def evict(self):
+        if self.max_size is None:
+            return
+        entries = sorted(self.entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
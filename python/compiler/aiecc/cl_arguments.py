@@ -27,6 +27,14 @@ def parse_args(args=None):
         default=None,
         help="directory used for temporary file storage",
     )
+    parser.add_argument(
+        "--batch",
+        dest="batch",
+        default=[],
+        action="append",
+        metavar="file",
+        help="MLIR file or (quoted) glob of files to compile together with the other --batch designs, sharing the -j worker limit. Can be repeated.",
+    )
     parser.add_argument(
         "-v",
         dest="verbose",
@@ -158,6 +166,20 @@ def parse_args(args=None):
         action="store",
         help="Compile with max n-threads in the machine (default is 4).  An argument of zero corresponds to the maximum number of threads on the machine.",
     )
+    parser.add_argument(
+        "--max-memory",
+        dest="max_memory",
+        default=None,
+        type=_size,
+        help="Only start a command when the memory it is expected to use, based on earlier runs of the same tool, fits in this many bytes (with an optional K, M, G or T suffix) together with the commands already running",
+    )
+    parser.add_argument(
+        "--schedule",
+        dest="schedule",
+        default="critical-path",
+        choices=["critical-path", "fifo"],
+        help="Order in which ready compilation steps are started when more are ready than there are threads: longest remaining chain of work first (default), or in the order they became ready",
+    )
     parser.add_argument(
         "--profile",
         dest="profiling",
@@ -165,6 +187,12 @@ def parse_args(args=None):
         action="store_true",
         help="Profile commands to find the most expensive executions.",
     )
+    parser.add_argument(
+        "--trace-file",
+        dest="trace_file",
+        default=None,
+        help="Write a timeline of the commands run, in Chrome trace format, to this file",
+    )
     parser.add_argument(
         "--unified",
         dest="unified",
@@ -179,6 +207,75 @@ def parse_args(args=None):
         action="store_false",
         help="Compile cores independently in separate processes",
     )
+    parser.add_argument(
+        "--in-process",
+        dest="in_process",
+        default=False,
+        action="store_true",
+        help="Run MLIR passes and translations through the Python bindings instead of aie-opt/aie-translate. The passes run on threads and hold a -j worker slot, like the tools they replace",
+    )
+    parser.add_argument(
+        "--no-in-process",
+        dest="in_process",
+        default=False,
+        action="store_false",
+        help="Run MLIR passes and translations with aie-opt/aie-translate",
+    )
+    parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        default=False,
+        action="store_true",
+        help="Skip the steps whose inputs are unchanged since the last build in the same project directory",
+    )
+    parser.add_argument(
+        "--no-incremental",
+        dest="incremental",
+        default=False,
+        action="store_false",
+        help="Rebuild every step (default)",
+    )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        default=False,
+        action="store_true",
+        help="Reuse per-core build artifacts from a persistent cache",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        default=False,
+        action="store_false",
+        help="Do not use the persistent build cache",
+    )
+    parser.add_argument(
+        "--toolchain-cache",
+        dest="toolchain_cache",
+        default=True,
+        action="store_true",
+        help="Keep artifacts built from the toolchain alone, such as the chess intrinsic wrapper, in the cache directory across runs (default)",
+    )
+    parser.add_argument(
+        "--no-toolchain-cache",
+        dest="toolchain_cache",
+        default=True,
+        action="store_false",
+        help="Rebuild toolchain artifacts on every run",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        dest="cache_dir",
+        default=None,
+        help="Directory of the persistent build cache (default is ~/.cache/aiecc)",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        dest="cache_max_size",
+        default=None,
+        type=_size,
+        help="Evict least recently used cache entries beyond this size, e.g. 4G (default is unbounded)",
+    )
     parser.add_argument(
         "-n",
         dest="execute",
@@ -215,6 +312,20 @@ def parse_args(args=None):
         default="ipu_insts.txt",
         help="Output instructions filename for IPU target",
     )
+    parser.add_argument(
+        "--ipu-optimize-insts",
+        dest="ipu_optimize",
+        default=False,
+        action="store_true",
+        help="Remove redundant and dead writes from the IPU instructions (aie-optimize-ipu-instructions)",
+    )
+    parser.add_argument(
+        "--ipu-insts-format",
+        dest="insts_format",
+        default="text",
+        choices=["text", "binary", "length-prefixed"],
+        help="Encoding of the IPU instructions: one hex word per line (default), or raw little-endian words, optionally preceded by the word count, which XCLBin.load_ipu_instructions_file mmaps and copies into the instruction buffer without parsing",
+    )
     parser.add_argument(
         "--aie-generate-cdo",
         dest="cdo",
@@ -295,6 +406,17 @@ def _int(arg, kind, pred):
     return i
 
 
+def _size(arg):
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    s = arg.strip().upper().rstrip("B")
+    try:
+        if s and s[-1] in units:
+            return int(float(s[:-1]) * units[s[-1]])
+        return int(s)
+    except ValueError:
+        raise _error("requires a size such as 512M or 4G, but found '{}'", arg)
+
+
 def _case_insensitive_regex(arg):
     import re
 
@@ -0,0 +1,107 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Make-like tracking of the steps run in an aiecc project directory.
+"""
+
+import json
+import os
+import re
+
+from aie.compiler.aiecc.cache import hash_file
+
+MANIFEST_NAME = "aiecc_manifest.json"
+
+# Bump this whenever the layout of the manifest changes.
+MANIFEST_VERSION = 1
+
+OUTPUT_FLAGS = ("-o", "--output")
+
+
+def command_files(command):
+    """Split a command line into the files it reads and the files it writes.
+
+    Outputs are the arguments following an output flag. Inputs are all other
+    existing files named on the command line, including those embedded in
+    arguments such as `-Wl,-T,file` or `SECTION:JSON:file`.
+    """
+    inputs, outputs = [], []
+    # The tool itself is identified by the command line, not by its contents.
+    for i, arg in enumerate(command[1:], 1):
+        if command[i - 1] in OUTPUT_FLAGS:
+            outputs.append(arg)
+            continue
+        for part in re.split(r"[\s,:=]", arg):
+            if part and part not in inputs and os.path.isfile(part):
+                inputs.append(part)
+    return inputs, outputs
+
+
+class Manifest:
+    """Records, for every step of a build, the hashes of the files it read and
+    wrote. A step is up to date when it has been recorded with the same inputs
+    and all its outputs still exist as they were written.
+
+    Output hashes are taken when the manifest is saved at the end of a
+    successful build, so that outputs edited in place by later steps are
+    recorded in their final state.
+    """
+
+    def __init__(self, dirname):
+        self.path = os.path.join(dirname, MANIFEST_NAME)
+        self.steps = {}
+        self.reused = []
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.steps = manifest["steps"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self._pending = {}
+        self._hashes = {}
+
+    def _hash(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        # Libraries and runtime objects are inputs to many steps; only hash
+        # each version of a file once.
+        stat_key = (path, st.st_size, st.st_mtime_ns)
+        if stat_key not in self._hashes:
+            self._hashes[stat_key] = hash_file(path).hexdigest()
+        return self._hashes[stat_key]
+
+    def up_to_date(self, key, inputs, outputs, stamp=""):
+        """Returns True if the step named `key` can be skipped. Otherwise the
+        step is expected to run and is recorded with the given inputs."""
+        inputs = {path: self._hash(path) for path in inputs}
+        step = self.steps.get(key)
+        if (
+            outputs
+            and step is not None
+            and step["stamp"] == stamp
+            and step["inputs"] == inputs
+            and set(step["outputs"]) == set(outputs)
+            and all(self._hash(path) == h for path, h in step["outputs"].items())
+        ):
+            self.reused.append(key)
+            return True
+        self.steps.pop(key, None)
+        self._pending[key] = {"stamp": stamp, "inputs": inputs, "outputs": outputs}
+        return False
+
+    def save(self):
+        for key, step in self._pending.items():
+            step["outputs"] = {path: self._hash(path) for path in step["outputs"]}
+            self.steps[key] = step
+        self._pending = {}
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "steps": self.steps}, f, indent=1)
+        os.replace(tmp, self.path)
@@ -10,12 +10,15 @@ aiecc - AIE compiler driver for MLIR tools
 
 import os
 import stat
+import struct
 import sys
 import time
 import subprocess
 import shutil
 import asyncio
+import copy
 import glob
+import hashlib
 import random
 import json
 import tempfile
@@ -28,9 +31,21 @@ from aie.extras.util import find_ops
 from aie.passmanager import PassManager
 from aie.ir import Module, Context, Location
 from aie.dialects import aie as aiedialect
+from aie.dialects import aiex as aiexdialect
 
 import aie.compiler.aiecc.cl_arguments
 import aie.compiler.aiecc.configure
+from aie.compiler.aiecc.cache import BuildCache, DEFAULT_CACHE_DIR
+from aie.compiler.aiecc.incremental import Manifest, command_files
+from aie.compiler.aiecc.memory import MemoryBudget
+from aie.compiler.aiecc.scheduler import (
+    TaskGraph,
+    WorkerPool,
+    current_slot,
+    current_task,
+)
+from aie.compiler.aiecc.toolchain import Toolchain
+from aie.compiler.aiecc.trace import Trace, peak_rss
 
 import rich.progress as progress
 import re
@@ -89,6 +104,39 @@ CREATE_PATH_FINDER_FLOWS = Pipeline().Nested(
     "aie.device", Pipeline().add_pass("aie-create-pathfinder-flows")
 )
 DMA_TO_IPU = Pipeline().Nested("aie.device", Pipeline().add_pass("aie-dma-to-ipu"))
+CREATE_PHYSICAL_FLOWS = Pipeline().Nested(
+    "aie.device",
+    Pipeline()
+    .add_pass("aie-create-pathfinder-flows")
+    .add_pass("aie-lower-broadcast-packet")
+    .add_pass("aie-create-packet-flows")
+    .add_pass("aie-lower-multicast"),
+)
+FIND_FLOWS = Pipeline().Nested("aie.device", Pipeline().add_pass("aie-find-flows"))
+
+
+def dma_to_ipu_pipeline(assign_bd_ids=False, optimize=False):
+    passes = Pipeline()
+    if assign_bd_ids:
+        passes.add_pass("aie-assign-ipu-bd-ids")
+    passes.add_pass("aie-dma-to-ipu")
+    if optimize:
+        passes.add_pass("aie-optimize-ipu-instructions")
+    return Pipeline().Nested("aie.device", passes)
+
+
+def core_lowering_pipeline(col, row):
+    return (
+        Pipeline()
+        .Nested(
+            "aie.device",
+            Pipeline()
+            .add_pass("aie-localize-locks")
+            .add_pass("aie-normalize-address-spaces"),
+        )
+        .add_pass("aie-standard-lowering", tilecol=col, tilerow=row)
+        .add_pass("aiex-standard-lowering")
+    )
 
 
 async def read_file_async(file_path: str) -> str:
@@ -181,21 +229,30 @@ mem_topology = {
 }
 
 
-def emit_partition(mlir_module_str, kernel_id="0x901", start_columns=None):
-    with Context(), Location.unknown():
-        module = Module.parse(mlir_module_str)
-        tiles = find_ops(
-            module.operation,
-            lambda o: isinstance(o.operation.opview, aiedialect.TileOp),
-        )
-        min_col = min([t.col.value for t in tiles])
-        max_col = max([t.col.value for t in tiles])
+def parsed_module(mlir_module):
+    """Parse `mlir_module` in a fresh Context if it is a string; modules (and
+    operations) are used as they are."""
+    if isinstance(mlir_module, str):
+        with Context(), Location.unknown():
+            return Module.parse(mlir_module)
+    return mlir_module
+
+
+def emit_partition(mlir_module, kernel_id="0x901", start_columns=None, uuid=None):
+    module = parsed_module(mlir_module)
+    tiles = find_ops(
+        module.operation,
+        lambda o: isinstance(o.operation.opview, aiedialect.TileOp),
+    )
+    min_col = min([t.col.value for t in tiles])
+    max_col = max([t.col.value for t in tiles])
 
     num_cols = max_col - min_col + 1
     if start_columns is None:
         start_columns = list(range(1, 6 - num_cols))
 
-    uuid = random.randint(2222, 9999)
+    if uuid is None:
+        uuid = random.randint(2222, 9999)
     return {
         "aie_partition": {
             "name": "QoS",
@@ -225,20 +282,32 @@ def emit_partition(mlir_module_str, kernel_id="0x901", start_columns=None):
     }
 
 
-def generate_cores_list(mlir_module_str):
-    with Context(), Location.unknown():
-        module = Module.parse(mlir_module_str)
-        return [
-            (
-                c.tile.owner.opview.col.value,
-                c.tile.owner.opview.row.value,
-                c.elf_file.value if c.elf_file is not None else None,
-            )
-            for c in find_ops(
-                module.operation,
-                lambda o: isinstance(o.operation.opview, aiedialect.CoreOp),
-            )
-        ]
+def generate_cores_list(mlir_module):
+    module = parsed_module(mlir_module)
+    return [
+        (
+            c.tile.owner.opview.col.value,
+            c.tile.owner.opview.row.value,
+            c.elf_file.value if c.elf_file is not None else None,
+        )
+        for c in find_ops(
+            module.operation,
+            lambda o: isinstance(o.operation.opview, aiedialect.CoreOp),
+        )
+    ]
+
+
+def has_unassigned_bd_ids(mlir_module):
+    """Whether any ipu.dma_memcpy_nd of `mlir_module` leaves its BD id (-1)
+    to aie-assign-ipu-bd-ids."""
+    module = parsed_module(mlir_module)
+    return bool(
+        find_ops(
+            module.operation,
+            lambda o: isinstance(o.operation.opview, aiexdialect.IpuDmaMemcpyNdOp)
+            and o.operation.opview.id.value < 0,
+        )
+    )
 
 
 def emit_design_bif(root_path, has_cores=True):
@@ -273,6 +342,12 @@ async def extract_input_files(file_core_bcf):
     return " ".join(re.findall(r"^_include _file (.*)", core_bcf, re.MULTILINE))
 
 
+# Extract the object files a core is linked with from its GNU linker script.
+async def extract_ldscript_input_files(file_core_ldscript):
+    core_ldscript = await read_file_async(file_core_ldscript)
+    return re.findall(r"^INPUT\((.*)\)", core_ldscript, re.MULTILINE)
+
+
 def do_run(command, verbose=False):
     if verbose:
         print(" ".join(command))
@@ -282,18 +357,24 @@ def do_run(command, verbose=False):
 
 
 def run_passes(pass_pipeline, mlir_module_str, outputfile=None, verbose=False):
-    if verbose:
-        print("Running:", pass_pipeline)
     with Context() as ctx, Location.unknown():
         module = Module.parse(mlir_module_str)
-        PassManager.parse(pass_pipeline).run(module.operation)
+        run_passes_module(pass_pipeline, module, outputfile, verbose)
         mlir_module_str = str(module)
-        if outputfile:
-            with open(outputfile, "w") as g:
-                g.write(mlir_module_str)
     return mlir_module_str
 
 
+def run_passes_module(pass_pipeline, module, outputfile=None, verbose=False):
+    """Like run_passes, but transforms an already parsed module in place."""
+    if verbose:
+        print("Running:", pass_pipeline)
+    PassManager.parse(pass_pipeline, module.context).run(module.operation)
+    if outputfile:
+        with open(outputfile, "w") as g:
+            g.write(str(module))
+    return module
+
+
 def corefile(dirname, core, ext):
     col, row, _ = core
     return os.path.join(dirname, f"core_{col}_{row}.{ext}")
@@ -333,41 +414,163 @@ def chesshack(llvmir_chesslinked):
 
 
 class FlowRunner:
-    def __init__(self, mlir_module_str, opts, tmpdirname):
-        self.mlir_module_str = mlir_module_str
+    def __init__(
+        self,
+        mlir_module,
+        opts,
+        tmpdirname,
+        toolchain=None,
+        trace=None,
+        elf_dir=".",
+        name=None,
+    ):
+        # The design is parsed once and this module (and its Context) is shared
+        # by every later stage of the flow. A module handed in by the caller is
+        # copied so that it is not lowered from under them.
+        if isinstance(mlir_module, str):
+            self.ctx = Context()
+            with self.ctx, Location.unknown():
+                self.module = Module.parse(mlir_module)
+        else:
+            self.ctx = mlir_module.context
+            self.module = mlir_module.operation.clone()
         self.opts = opts
         self.tmpdirname = tmpdirname
-        self.runtimes = dict()
+        # Designs compiled together share their toolchain lookups and trace.
+        if toolchain is None:
+            toolchain = make_toolchain(opts)
+        self.toolchain = toolchain
+        if trace is None and opts.trace_file:
+            trace = Trace()
+        self.trace = trace
+        self.elf_dir = elf_dir
+        self.name = name
+        self.runtimes = []
         self.progress_bar = None
+        self.pool = None
         self.maxtasks = 5
         self.stopall = False
         self.peano_clang_path = os.path.join(opts.peano_install_dir, "bin", "clang")
         self.peano_opt_path = os.path.join(opts.peano_install_dir, "bin", "opt")
         self.peano_llc_path = os.path.join(opts.peano_install_dir, "bin", "llc")
+        self.cache = None
+        self.toolchain_fingerprint = []
+        self.manifest = None
+        if opts.incremental and opts.execute:
+            self.manifest = Manifest(tmpdirname)
+        if opts.cache and opts.execute:
+            self.cache = BuildCache(
+                opts.cache_dir or DEFAULT_CACHE_DIR, opts.cache_max_size
+            )
+            self.toolchain_fingerprint = self.toolchain.fingerprint(
+                [
+                    "aie-opt",
+                    "aie-translate",
+                    "xchesscc_wrapper",
+                    self.peano_clang_path,
+                    self.peano_opt_path,
+                    self.peano_llc_path,
+                ]
+            )
 
     def prepend_tmp(self, x):
         return os.path.join(self.tmpdirname, x)
 
-    async def do_call(self, task, command, force=False):
+    async def run_passes_in_process(self, task, pass_pipeline, module):
+        """Run a pass pipeline on a copy of `module` using the bound PassManager,
+        instead of writing the module out and running aie-opt on it.
+
+        The passes run on a thread of their own so that the event loop keeps
+        scheduling other work; like an aie-opt call, they hold the worker slot
+        of the task that runs them."""
+        pass_pipeline = str(pass_pipeline)
+        if task:
+            self.progress_bar.update(task, advance=0, command=pass_pipeline[0:30])
+        start = time.time()
+        if self.opts.verbose:
+            print("Running:", pass_pipeline)
+
+        def run():
+            with self.ctx:
+                result = module.operation.clone()
+                PassManager.parse(pass_pipeline).run(result.operation)
+            return result
+
+        result = await asyncio.get_running_loop().run_in_executor(None, run)
+        end = time.time()
+        if self.opts.verbose:
+            print(f"Done in {end - start:.3f} sec: {pass_pipeline}")
+        self.runtimes.append((pass_pipeline, end - start))
+        self.trace_span("passes", start, end, command=pass_pipeline)
+        return result
+
+    def trace_span(self, name, start, end, **args):
+        if not self.trace:
+            return
+        graph_task = current_task.get()
+        if graph_task:
+            args = {"task": graph_task.name, **graph_task.labels, **args}
+        self.trace.span(name, start, end, current_slot.get(), **args)
+
+    async def do_call(
+        self, task, command, force=False, inputs=(), outputs=(), incremental=True
+    ):
+        """Run `command`. `inputs` and `outputs` list files the command reads
+        and writes that are not named on its command line; commands whose
+        inputs cannot all be known (such as compiles that include headers)
+        pass `incremental=False`."""
         if self.stopall:
             return
 
         commandstr = " ".join(command)
+        if self.manifest and incremental and not force:
+            command_inputs, command_outputs = command_files(command)
+            if self.manifest.up_to_date(
+                commandstr,
+                command_inputs + list(inputs),
+                command_outputs + list(outputs),
+            ):
+                if self.opts.verbose:
+                    print("Up to date:", commandstr)
+                return
         if task:
             self.progress_bar.update(task, advance=0, command=commandstr[0:30])
+        tool = os.path.basename(command[0])
+        memory = self.pool.memory if self.pool else None
+        reservation = None
+        if memory and (self.opts.execute or force):
+            # Wait until the tool is expected to fit in --max-memory.
+            reservation = await memory.reserve(tool)
         start = time.time()
         if self.opts.verbose:
             print(commandstr)
+        rss = 0
         if self.opts.execute or force:
-            proc = await asyncio.create_subprocess_exec(*command)
-            await proc.wait()
+            try:
+                proc = await asyncio.create_subprocess_exec(*command)
+                if self.trace or reservation:
+                    rss = await peak_rss(
+                        proc, on_sample=reservation.update if reservation else None
+                    )
+                await proc.wait()
+            finally:
+                if reservation:
+                    await memory.release(reservation, rss)
             ret = proc.returncode
         else:
             ret = 0
         end = time.time()
         if self.opts.verbose:
             print(f"Done in {end - start:.3f} sec: {commandstr}")
-        self.runtimes[commandstr] = end - start
+        self.runtimes.append((commandstr, end - start))
+        self.trace_span(
+            tool,
+            start,
+            end,
+            command=commandstr,
+            exit_code=ret,
+            peak_rss_kb=rss,
+        )
         if task:
             self.progress_bar.update(task, advance=1, command="")
             self.maxtasks = max(self.progress_bar._tasks[task].completed, self.maxtasks)
@@ -408,34 +611,57 @@ class FlowRunner:
         return llvmir_chesslinked_path
 
     async def prepare_for_chesshack(self, task, aie_target):
-        if opts.compile and opts.xchesscc:
-            install_path = aie.compiler.aiecc.configure.install_path()
-            runtime_lib_path = os.path.join(install_path, "aie_runtime_lib")
-            chess_intrinsic_wrapper_cpp = os.path.join(
-                runtime_lib_path, aie_target.upper(), "chess_intrinsic_wrapper.cpp"
+        if self.opts.compile and self.opts.xchesscc:
+            # The wrapper only depends on the toolchain, so designs that are
+            # compiled together build it once.
+            return await self.toolchain.build_once(
+                ("chess_intrinsic_wrapper", aie_target, self.opts.execute),
+                lambda: self.build_chess_intrinsic_wrapper(task, aie_target),
             )
 
-            chess_intrinsic_wrapper_ll_path = self.prepend_tmp(
-                "chess_intrinsic_wrapper.ll"
+    async def build_chess_intrinsic_wrapper(self, task, aie_target):
+        chess_intrinsic_wrapper_cpp = os.path.join(
+            self.toolchain.runtime_lib_path(aie_target),
+            "chess_intrinsic_wrapper.cpp",
+        )
+
+        chess_intrinsic_wrapper_ll_path = self.prepend_tmp("chess_intrinsic_wrapper.ll")
+
+        # The wrapper only changes with its source and the chess compiler, so
+        # it is kept across runs in the toolchain cache.
+        cache = self.toolchain.cache
+        if cache:
+            cache_key = cache.key(
+                files=[chess_intrinsic_wrapper_cpp],
+                strings=[
+                    "chess_intrinsic_wrapper",
+                    aie_target,
+                    *self.toolchain.fingerprint(["xchesscc_wrapper", "xchesscc"]),
+                ],
             )
+            cached_outputs = {
+                "chess_intrinsic_wrapper.ll": chess_intrinsic_wrapper_ll_path
+            }
+            if cache.lookup(cache_key, cached_outputs):
+                if self.opts.verbose:
+                    print("Reusing cached", chess_intrinsic_wrapper_cpp)
+                return chess_intrinsic_wrapper_ll_path
 
-            # fmt: off
-            await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+f", "+P", "4", chess_intrinsic_wrapper_cpp, "-o", chess_intrinsic_wrapper_ll_path])
-            # fmt: on
+        # fmt: off
+        await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+f", "+P", "4", chess_intrinsic_wrapper_cpp, "-o", chess_intrinsic_wrapper_ll_path])
+        # fmt: on
 
-            # this has to be here and not higher because there are tests that check for the command string for the above do_call
-            if not self.opts.execute:
-                return
-            chess_intrinsic_wrapper = await read_file_async(
-                chess_intrinsic_wrapper_ll_path
-            )
-            chess_intrinsic_wrapper = re.sub(
-                r"^target.*", "", chess_intrinsic_wrapper, flags=re.MULTILINE
-            )
-            await write_file_async(
-                chess_intrinsic_wrapper, chess_intrinsic_wrapper_ll_path
-            )
-            return chess_intrinsic_wrapper_ll_path
+        # this has to be here and not higher because there are tests that check for the command string for the above do_call
+        if not self.opts.execute:
+            return
+        chess_intrinsic_wrapper = await read_file_async(chess_intrinsic_wrapper_ll_path)
+        chess_intrinsic_wrapper = re.sub(
+            r"^target.*", "", chess_intrinsic_wrapper, flags=re.MULTILINE
+        )
+        await write_file_async(chess_intrinsic_wrapper, chess_intrinsic_wrapper_ll_path)
+        if cache and not self.stopall:
+            cache.store(cache_key, cached_outputs)
+        return chess_intrinsic_wrapper_ll_path
 
     async def process_core(
         self,
@@ -445,106 +671,188 @@ class FlowRunner:
         chess_intrinsic_wrapper_ll_path,
         file_with_addresses,
     ):
-        async with self.limit:
-            if self.stopall:
-                return
+        if self.stopall:
+            return
 
-            install_path = aie.compiler.aiecc.configure.install_path()
-            runtime_lib_path = os.path.join(
-                install_path, "aie_runtime_lib", aie_target.upper()
-            )
-            clang_path = os.path.dirname(shutil.which("clang"))
-            # The build path for libc can be very different from where it's installed.
-            llvmlibc_build_lib_path = os.path.join(
-                clang_path,
-                "..",
-                "runtimes",
-                "runtimes-" + aie_target.lower() + "-none-unknown-elf-bins",
-                "libc",
-                "lib",
-                "libc.a",
-            )
-            llvmlibc_install_lib_path = os.path.join(
-                clang_path,
-                "..",
-                "lib",
-                aie_target.lower() + "-none-unknown-elf",
-                "libc.a",
-            )
-            me_basic_o = os.path.join(runtime_lib_path, "me_basic.o")
-            if os.path.isfile(llvmlibc_build_lib_path):
-                libc = llvmlibc_build_lib_path
-            else:
-                libc = llvmlibc_install_lib_path
+        clang_link_args = self.toolchain.core_link_args(aie_target)
 
-            clang_link_args = [me_basic_o, libc, "-Wl,--gc-sections"]
+        if self.opts.progress:
+            task = self.progress_bar.add_task(
+                "[yellow] Core (%d, %d)" % core[0:2],
+                total=self.maxtasks,
+                command="starting",
+            )
+        else:
+            task = None
 
-            if opts.progress:
-                task = self.progress_bar.add_task(
-                    "[yellow] Core (%d, %d)" % core[0:2],
-                    total=self.maxtasks,
-                    command="starting",
-                )
+        # fmt: off
+        corecol, corerow, elf_file = core
+        if not self.opts.unified:
+            if self.opts.in_process:
+                core_module = await self.run_passes_in_process(task, core_lowering_pipeline(corecol, corerow), self.module)
             else:
-                task = None
-
-            # fmt: off
-            corecol, corerow, elf_file = core
-            if not opts.unified:
                 file_core = corefile(self.tmpdirname, core, "mlir")
                 await self.do_call(task, ["aie-opt", "--aie-localize-locks", "--aie-normalize-address-spaces", "--aie-standard-lowering=tilecol=%d tilerow=%d" % core[0:2], "--aiex-standard-lowering", file_with_addresses, "-o", file_core])
-                file_opt_core = corefile(self.tmpdirname, core, "opt.mlir")
-                await self.do_call(task, ["aie-opt", f"--pass-pipeline={LOWER_TO_LLVM_PIPELINE}", file_core, "-o", file_opt_core])
-            if self.opts.xbridge:
-                file_core_bcf = corefile(self.tmpdirname, core, "bcf")
+        if self.opts.xbridge:
+            file_core_bcf = corefile(self.tmpdirname, core, "bcf")
+            if self.opts.in_process:
+                await write_file_async(aiedialect.generate_bcf(self.module.operation, corecol, corerow), file_core_bcf)
+            else:
                 await self.do_call(task, ["aie-translate", file_with_addresses, "--aie-generate-bcf", "--tilecol=%d" % corecol, "--tilerow=%d" % corerow, "-o", file_core_bcf])
+        else:
+            file_core_ldscript = corefile(self.tmpdirname, core, "ld.script")
+            if self.opts.in_process:
+                await write_file_async(aiedialect.generate_ldscript(self.module.operation, corecol, corerow), file_core_ldscript)
             else:
-                file_core_ldscript = corefile(self.tmpdirname, core, "ld.script")
                 await self.do_call(task, ["aie-translate", file_with_addresses, "--aie-generate-ldscript", "--tilecol=%d" % corecol, "--tilerow=%d" % corerow, "-o", file_core_ldscript])
-            if not self.opts.unified:
-                file_core_llvmir = corefile(self.tmpdirname, core, "ll")
+        file_core_obj = corefile(self.tmpdirname, core, "o")
+        file_core_elf = elf_file if elf_file else corefile(self.elf_dir, core, "elf")
+        # fmt: on
+
+        # Objects pulled in by the linker script are not on the link command line.
+        link_inputs = []
+        if (self.cache or self.manifest) and self.opts.link and not self.opts.xbridge:
+            link_inputs = await extract_ldscript_input_files(file_core_ldscript)
+
+        # Everything that follows only depends on the lowered core and its
+        # linker script, so that is what the cached artifacts are keyed by.
+        cache_key = None
+        cached_outputs = {}
+        if self.cache and self.opts.compile:
+            if self.opts.link:
+                cached_outputs["core.elf"] = file_core_elf
+            if not self.opts.unified and (
+                not self.opts.xchesscc or (self.opts.link and not self.opts.xbridge)
+            ):
+                cached_outputs["core.o"] = file_core_obj
+        if cached_outputs:
+            cache_strings = [
+                aie_target,
+                aie_peano_target,
+                LOWER_TO_LLVM_PIPELINE,
+                *sorted(cached_outputs),
+                *clang_link_args,
+                *self.toolchain_fingerprint,
+            ]
+            if self.opts.xbridge:
+                cache_inputs = [file_core_bcf]
+                cache_inputs += (await extract_input_files(file_core_bcf)).split()
+            else:
+                cache_inputs = [file_core_ldscript, *link_inputs]
+            if self.opts.unified:
+                cache_inputs.append(self.unified_file_core_obj)
+            elif self.opts.in_process:
+                cache_strings.append(str(core_module))
+            else:
+                cache_inputs.append(file_core)
+            if self.opts.xchesscc:
+                cache_inputs.append(chess_intrinsic_wrapper_ll_path)
+            cache_key = self.cache.key(files=cache_inputs, strings=cache_strings)
+            if self.cache.lookup(cache_key, cached_outputs):
+                if self.opts.verbose:
+                    print(f"Reusing cached build of core ({corecol}, {corerow})")
+                self.progress_bar.update(self.completed_task, advance=1)
+                if task:
+                    self.progress_bar.update(task, advance=0, visible=False)
+                return
+
+        # fmt: off
+        if not self.opts.unified:
+            file_core_llvmir = corefile(self.tmpdirname, core, "ll")
+            if self.opts.in_process:
+                core_module = await self.run_passes_in_process(task, LOWER_TO_LLVM_PIPELINE, core_module)
+                await write_file_async(aiedialect.translate_mlir_to_llvmir(core_module.operation), file_core_llvmir)
+            else:
+                file_opt_core = corefile(self.tmpdirname, core, "opt.mlir")
+                await self.do_call(task, ["aie-opt", f"--pass-pipeline={LOWER_TO_LLVM_PIPELINE}", file_core, "-o", file_opt_core])
                 await self.do_call(task, ["aie-translate", "--mlir-to-llvmir", file_opt_core, "-o", file_core_llvmir])
-                file_core_obj = corefile(self.tmpdirname, core, "o")
-
-            file_core_elf = elf_file if elf_file else corefile(".", core, "elf")
-
-            if opts.compile and opts.xchesscc:
-                if not opts.unified:
-                    file_core_llvmir_chesslinked = await self.chesshack(task, file_core_llvmir, chess_intrinsic_wrapper_ll_path)
-                    if self.opts.link and self.opts.xbridge:
-                        link_with_obj = await extract_input_files(file_core_bcf)
-                        await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-d", "-f", "+P", "4", file_core_llvmir_chesslinked, link_with_obj, "+l", file_core_bcf, "-o", file_core_elf])
-                    elif self.opts.link:
-                        await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+P", "4", file_core_llvmir_chesslinked, "-o", file_core_obj])
-                        await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf])
-                else:
-                    file_core_obj = self.unified_file_core_obj
-                    if opts.link and opts.xbridge:
-                        link_with_obj = await extract_input_files(file_core_bcf)
-                        await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-d", "-f", file_core_obj, link_with_obj, "+l", file_core_bcf, "-o", file_core_elf])
-                    elif opts.link:
-                        await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf])
-
-            elif opts.compile:
-                if not opts.unified:
-                    file_core_llvmir_stripped = corefile(self.tmpdirname, core, "stripped.ll")
-                    await self.do_call(task, [self.peano_opt_path, "--passes=default<O2>,strip", "-S", file_core_llvmir, "-o", file_core_llvmir_stripped])
-                    await self.do_call(task, [self.peano_llc_path, file_core_llvmir_stripped, "-O2", "--march=" + aie_target.lower(), "--function-sections", "--filetype=obj", "-o", file_core_obj])
-                else:
-                    file_core_obj = self.unified_file_core_obj
-
-                if opts.link and opts.xbridge:
+
+        if self.opts.compile and self.opts.xchesscc:
+            if not self.opts.unified:
+                file_core_llvmir_chesslinked = await self.chesshack(task, file_core_llvmir, chess_intrinsic_wrapper_ll_path)
+                if self.opts.link and self.opts.xbridge:
+                    link_with_obj = await extract_input_files(file_core_bcf)
+                    await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-d", "-f", "+P", "4", file_core_llvmir_chesslinked, link_with_obj, "+l", file_core_bcf, "-o", file_core_elf])
+                elif self.opts.link:
+                    await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+P", "4", file_core_llvmir_chesslinked, "-o", file_core_obj])
+                    await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf], inputs=link_inputs)
+            else:
+                file_core_obj = self.unified_file_core_obj
+                if self.opts.link and self.opts.xbridge:
                     link_with_obj = await extract_input_files(file_core_bcf)
                     await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-d", "-f", file_core_obj, link_with_obj, "+l", file_core_bcf, "-o", file_core_elf])
-                elif opts.link:
-                    await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf])
+                elif self.opts.link:
+                    await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf], inputs=link_inputs)
 
-            self.progress_bar.update(self.progress_bar.task_completed, advance=1)
-            if task:
-                self.progress_bar.update(task, advance=0, visible=False)
-            # fmt: on
+        elif self.opts.compile:
+            if not self.opts.unified:
+                file_core_llvmir_stripped = corefile(self.tmpdirname, core, "stripped.ll")
+                await self.do_call(task, [self.peano_opt_path, "--passes=default<O2>,strip", "-S", file_core_llvmir, "-o", file_core_llvmir_stripped])
+                await self.do_call(task, [self.peano_llc_path, file_core_llvmir_stripped, "-O2", "--march=" + aie_target.lower(), "--function-sections", "--filetype=obj", "-o", file_core_obj])
+            else:
+                file_core_obj = self.unified_file_core_obj
+
+            if self.opts.link and self.opts.xbridge:
+                link_with_obj = await extract_input_files(file_core_bcf)
+                await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-d", "-f", file_core_obj, link_with_obj, "+l", file_core_bcf, "-o", file_core_elf])
+            elif self.opts.link:
+                await self.do_call(task, [self.peano_clang_path, "-O2", "--target=" + aie_peano_target, file_core_obj, *clang_link_args, "-Wl,-T," + file_core_ldscript, "-o", file_core_elf], inputs=link_inputs)
+        # fmt: on
+
+        if cache_key is not None and not self.stopall:
+            self.cache.store(cache_key, cached_outputs)
+
+        self.progress_bar.update(self.completed_task, advance=1)
+        if task:
+            self.progress_bar.update(task, advance=0, visible=False)
+
+    def stage_elfs(self):
+        """Make the core ELFs visible in the project directory, where the CDO
+        generator looks for them. They are hard-linked when possible, as the
+        ELFs can be large and are only read."""
+        if os.path.abspath(self.elf_dir) == self.tmpdirname:
+            return
+        elfs = glob.glob(os.path.join(self.elf_dir, "*.elf"))
+        elfs += glob.glob(os.path.join(self.elf_dir, "*.elf.map"))
+        for elf in elfs:
+            dst = self.prepend_tmp(os.path.basename(elf))
+            if os.path.exists(dst):
+                if os.path.samefile(elf, dst):
+                    continue
+                os.remove(dst)
+            try:
+                os.link(elf, dst)
+            except OSError:
+                shutil.copy(elf, dst)
+
+    async def process_cdo(self, task, section):
+        """Generate one of the separate CDO binaries. Only the "elfs" section
+        needs the compiled cores, so the others can start as soon as the
+        design is routed, and the sections are generated concurrently."""
+        file_cdo = self.prepend_tmp(f"aie_cdo_{section}.bin")
+        inputs = []
+        if section == "elfs":
+            if self.opts.execute:
+                self.stage_elfs()
+            inputs = sorted(glob.glob(self.prepend_tmp("*.elf")))
+
+        if not self.opts.in_process:
+            # Each section is generated by its own process because the CDO
+            # generator writes through global state.
+            await self.do_call(
+                task,
+                [
+                    "aie-translate",
+                    "--aie-generate-cdo",
+                    "--cdo-section=" + section,
+                    "--work-dir-path=" + self.tmpdirname,
+                    self.prepend_tmp("input_physical.mlir"),
+                ],
+                inputs=inputs,
+                outputs=[file_cdo],
+            )
+            return
 
-    async def process_cdo(self):
         try:
             from aie.dialects.aie import generate_cdo
         except ImportError:
@@ -552,37 +860,38 @@ class FlowRunner:
                 "cdo generation not supported, recompile with AIE_ENABLE_GENERATE_CDO_DIRECT"
             )
 
-        with Context(), Location.unknown():
-            for elf in glob.glob("*.elf"):
-                try:
-                    shutil.copy(elf, self.tmpdirname)
-                except shutil.SameFileError:
-                    pass
-            for elf_map in glob.glob("*.elf.map"):
-                try:
-                    shutil.copy(elf_map, self.tmpdirname)
-                except shutil.SameFileError:
-                    pass
-            input_physical = Module.parse(
-                await read_file_async(self.prepend_tmp("input_physical.mlir"))
-            )
-            generate_cdo(input_physical.operation, self.tmpdirname)
-
-    async def process_xclbin_gen(self, has_cores):
-        if opts.progress:
-            task = self.progress_bar.add_task(
-                "[yellow] XCLBIN generation ", total=10, command="starting"
-            )
-        else:
-            task = None
+        if not self.opts.execute:
+            return
+        if self.manifest:
+            stamp = hashlib.sha256(str(self.physical_module).encode()).hexdigest()
+            if self.manifest.up_to_date(
+                "generate_cdo " + section, inputs, [file_cdo], stamp
+            ):
+                return
+        start = time.time()
+        generate_cdo(
+            self.physical_module.operation, self.tmpdirname, sections=[section]
+        )
+        end = time.time()
+        self.runtimes.append(("generate_cdo " + section, end - start))
+        self.trace_span("generate_cdo", start, end, section=section)
 
+    async def prepare_xclbin_gen(self, has_cores):
         await write_file_async(
             json.dumps(mem_topology, indent=2),
             self.prepend_tmp("mem_topology.json"),
         )
 
+        # A fresh PDI uuid on every build would make the xclbin always out of
+        # date, so incremental builds derive it from the design instead.
+        uuid = None
+        if self.manifest:
+            design_hash = hashlib.sha256(str(self.module).encode()).hexdigest()
+            uuid = 2222 + int(design_hash, 16) % (9999 - 2222 + 1)
         await write_file_async(
-            json.dumps(emit_partition(self.mlir_module_str, opts.kernel_id), indent=2),
+            json.dumps(
+                emit_partition(self.module, self.opts.kernel_id, uuid=uuid), indent=2
+            ),
             self.prepend_tmp("aie_partition.json"),
         )
 
@@ -590,9 +899,9 @@ class FlowRunner:
         await write_file_async(
             json.dumps(
                 emit_design_kernel_json(
-                    opts.kernel_name,
-                    opts.kernel_id,
-                    opts.instance_name,
+                    self.opts.kernel_name,
+                    self.opts.kernel_id,
+                    self.opts.instance_name,
                     buffer_arg_names,
                 ),
                 indent=2,
@@ -605,25 +914,31 @@ class FlowRunner:
             self.prepend_tmp("design.bif"),
         )
 
+    async def process_xclbin_gen(self):
+        if self.opts.progress:
+            task = self.progress_bar.add_task(
+                "[yellow] XCLBIN generation ", total=10, command="starting"
+            )
+        else:
+            task = None
+
         # fmt: off
-        await self.do_call(task, ["bootgen", "-arch", "versal", "-image", self.prepend_tmp("design.bif"), "-o", self.prepend_tmp("design.pdi"), "-w"])
-        await self.do_call(task, ["xclbinutil", "--add-replace-section", "MEM_TOPOLOGY:JSON:" + self.prepend_tmp("mem_topology.json"), "--add-kernel", self.prepend_tmp("kernels.json"), "--add-replace-section", "AIE_PARTITION:JSON:" + self.prepend_tmp("aie_partition.json"), "--force", "--output", opts.xclbin_name])
+        await self.do_call(task, ["bootgen", "-arch", "versal", "-image", self.prepend_tmp("design.bif"), "-o", self.prepend_tmp("design.pdi"), "-w"], inputs=sorted(glob.glob(self.prepend_tmp("aie_cdo_*.bin"))))
+        await self.do_call(task, ["xclbinutil", "--add-replace-section", "MEM_TOPOLOGY:JSON:" + self.prepend_tmp("mem_topology.json"), "--add-kernel", self.prepend_tmp("kernels.json"), "--add-replace-section", "AIE_PARTITION:JSON:" + self.prepend_tmp("aie_partition.json"), "--force", "--output", self.opts.xclbin_name], inputs=[self.prepend_tmp("design.pdi")])
         # fmt: on
 
-    async def process_host_cgen(self, aie_target, file_with_addresses):
-        async with self.limit:
-            if self.stopall:
-                return
-
-            if opts.progress:
-                task = self.progress_bar.add_task(
-                    "[yellow] Host compilation ", total=10, command="starting"
-                )
-            else:
-                task = None
-
-            # Generate the included host interface
-            file_physical = self.prepend_tmp("input_physical.mlir")
+    async def process_physical(self, task, file_with_addresses):
+        """Route the design, which is needed by the host code, the CDO and the
+        simulator alike."""
+        file_physical = self.prepend_tmp("input_physical.mlir")
+        if self.opts.in_process:
+            self.physical_module = await self.run_passes_in_process(
+                task, CREATE_PHYSICAL_FLOWS, self.module
+            )
+            # Only the airbin translation still needs the physical design on disk.
+            if self.opts.airbin:
+                await write_file_async(str(self.physical_module), file_physical)
+        else:
             await self.do_call(
                 task,
                 [
@@ -638,129 +953,147 @@ class FlowRunner:
                 ],
             )
 
-            if opts.airbin:
-                file_airbin = self.prepend_tmp("air.bin")
-                await self.do_call(
-                    task,
-                    [
-                        "aie-translate",
-                        "--aie-generate-airbin",
-                        file_physical,
-                        "-o",
-                        file_airbin,
-                    ],
-                )
-            else:
-                file_inc_cpp = self.prepend_tmp("aie_inc.cpp")
-                await self.do_call(
-                    task,
-                    [
-                        "aie-translate",
-                        "--aie-generate-xaie",
-                        file_physical,
-                        "-o",
-                        file_inc_cpp,
-                    ],
-                )
-
-            cmd = ["clang++", "-std=c++11"]
-            if opts.host_target:
-                cmd += ["--target=" + opts.host_target]
-                if (
-                    opts.aiesim
-                    and opts.host_target
-                    != aie.compiler.aiecc.configure.host_architecture
-                ):
-                    sys.exit(
-                        "Host cross-compile from "
-                        + aie.compiler.aiecc.configure.host_architecture
-                        + " to --target="
-                        + opts.host_target
-                        + " is not supported with --aiesim"
-                    )
+    async def process_host_cgen(self, aie_target):
+        if self.stopall:
+            return
 
-            if self.opts.sysroot:
-                cmd += ["--sysroot=" + opts.sysroot]
-                # In order to find the toolchain in the sysroot, we need to have
-                # a 'target' that includes 'linux' and for the 'lib/gcc/$target/$version'
-                # directory to have a corresponding 'include/gcc/$target/$version'.
-                # In some of our sysroots, it seems that we find a lib/gcc, but it
-                # doesn't have a corresponding include/gcc directory.  Instead
-                # force using '/usr/lib,include/gcc'
-                if opts.host_target == "aarch64-linux-gnu":
-                    cmd += [f"--gcc-toolchain={opts.sysroot}/usr"]
-
-            install_path = aie.compiler.aiecc.configure.install_path()
-
-            # Setting everything up if linking against HSA
-            if opts.link_against_hsa:
-                cmd += ["-DHSA_RUNTIME"]
-                arch_name = opts.host_target.split("-")[0] + "-hsa"
-                hsa_path = os.path.join(aie.compiler.aiecc.configure.hsa_dir)
-                hsa_include_path = os.path.join(hsa_path, "..", "..", "..", "include")
-                hsa_lib_path = os.path.join(hsa_path, "..", "..")
-                hsa_so_path = os.path.join(hsa_lib_path, "libhsa-runtime64.so")
-            else:
-                arch_name = opts.host_target.split("-")[0]
+        if self.opts.progress:
+            task = self.progress_bar.add_task(
+                "[yellow] Host compilation ", total=10, command="starting"
+            )
+        else:
+            task = None
 
-            # Getting a pointer to the libxaie include and library
-            runtime_xaiengine_path = os.path.join(
-                install_path, "runtime_lib", arch_name, "xaiengine"
+        # Generate the included host interface
+        file_physical = self.prepend_tmp("input_physical.mlir")
+        if self.opts.airbin:
+            file_airbin = self.prepend_tmp("air.bin")
+            await self.do_call(
+                task,
+                [
+                    "aie-translate",
+                    "--aie-generate-airbin",
+                    file_physical,
+                    "-o",
+                    file_airbin,
+                ],
             )
-            xaiengine_include_path = os.path.join(runtime_xaiengine_path, "include")
-            xaiengine_lib_path = os.path.join(runtime_xaiengine_path, "lib")
-
-            # Getting a pointer to the library test_lib
-            runtime_testlib_path = os.path.join(
-                install_path,
-                "runtime_lib",
-                arch_name,
-                "test_lib",
-                "lib",
+        elif self.opts.in_process:
+            await write_file_async(
+                aiedialect.generate_xaie(self.physical_module.operation),
+                self.prepend_tmp("aie_inc.cpp"),
+            )
+        else:
+            file_inc_cpp = self.prepend_tmp("aie_inc.cpp")
+            await self.do_call(
+                task,
+                [
+                    "aie-translate",
+                    "--aie-generate-xaie",
+                    file_physical,
+                    "-o",
+                    file_inc_cpp,
+                ],
             )
 
-            # Linking against the correct memory allocator
-            if opts.link_against_hsa:
-                memory_allocator = os.path.join(
-                    runtime_testlib_path, "libmemory_allocator_hsa.a"
-                )
-            else:
-                memory_allocator = os.path.join(
-                    runtime_testlib_path, "libmemory_allocator_ion.a"
+        cmd = ["clang++", "-std=c++11"]
+        if self.opts.host_target:
+            cmd += ["--target=" + self.opts.host_target]
+            if (
+                self.opts.aiesim
+                and self.opts.host_target
+                != aie.compiler.aiecc.configure.host_architecture
+            ):
+                sys.exit(
+                    "Host cross-compile from "
+                    + aie.compiler.aiecc.configure.host_architecture
+                    + " to --target="
+                    + self.opts.host_target
+                    + " is not supported with --aiesim"
                 )
 
-            cmd += [
-                memory_allocator,
-                "-I" + xaiengine_include_path,
-                "-L" + xaiengine_lib_path,
-                "-L" + os.path.join(opts.aietools_path, "lib", "lnx64.o"),
-                "-Wl,-R" + xaiengine_lib_path,
-                "-I" + self.tmpdirname,
-                "-fuse-ld=lld",
-                "-lm",
-                "-lxaiengine",
-            ]
-            # Linking against HSA
-            if opts.link_against_hsa:
-                cmd += [hsa_so_path]
-                cmd += ["-I%s" % hsa_include_path]
-                cmd += ["-Wl,-rpath,%s" % hsa_lib_path]
+        if self.opts.sysroot:
+            cmd += ["--sysroot=" + self.opts.sysroot]
+            # In order to find the toolchain in the sysroot, we need to have
+            # a 'target' that includes 'linux' and for the 'lib/gcc/$target/$version'
+            # directory to have a corresponding 'include/gcc/$target/$version'.
+            # In some of our sysroots, it seems that we find a lib/gcc, but it
+            # doesn't have a corresponding include/gcc directory.  Instead
+            # force using '/usr/lib,include/gcc'
+            if self.opts.host_target == "aarch64-linux-gnu":
+                cmd += [f"--gcc-toolchain={self.opts.sysroot}/usr"]
 
-            cmd += aie_target_defines(aie_target)
+        install_path = aie.compiler.aiecc.configure.install_path()
 
-            if len(opts.host_args) > 0:
-                await self.do_call(task, cmd + opts.host_args)
+        # Setting everything up if linking against HSA
+        if self.opts.link_against_hsa:
+            cmd += ["-DHSA_RUNTIME"]
+            arch_name = self.opts.host_target.split("-")[0] + "-hsa"
+            hsa_path = os.path.join(aie.compiler.aiecc.configure.hsa_dir)
+            hsa_include_path = os.path.join(hsa_path, "..", "..", "..", "include")
+            hsa_lib_path = os.path.join(hsa_path, "..", "..")
+            hsa_so_path = os.path.join(hsa_lib_path, "libhsa-runtime64.so")
+        else:
+            arch_name = self.opts.host_target.split("-")[0]
 
-            self.progress_bar.update(self.progress_bar.task_completed, advance=1)
-            if task:
-                self.progress_bar.update(task, advance=0, visible=False)
+        # Getting a pointer to the libxaie include and library
+        runtime_xaiengine_path = os.path.join(
+            install_path, "runtime_lib", arch_name, "xaiengine"
+        )
+        xaiengine_include_path = os.path.join(runtime_xaiengine_path, "include")
+        xaiengine_lib_path = os.path.join(runtime_xaiengine_path, "lib")
+
+        # Getting a pointer to the library test_lib
+        runtime_testlib_path = os.path.join(
+            install_path,
+            "runtime_lib",
+            arch_name,
+            "test_lib",
+            "lib",
+        )
+
+        # Linking against the correct memory allocator
+        if self.opts.link_against_hsa:
+            memory_allocator = os.path.join(
+                runtime_testlib_path, "libmemory_allocator_hsa.a"
+            )
+        else:
+            memory_allocator = os.path.join(
+                runtime_testlib_path, "libmemory_allocator_ion.a"
+            )
+
+        cmd += [
+            memory_allocator,
+            "-I" + xaiengine_include_path,
+            "-L" + xaiengine_lib_path,
+            "-L" + os.path.join(self.opts.aietools_path, "lib", "lnx64.o"),
+            "-Wl,-R" + xaiengine_lib_path,
+            "-I" + self.tmpdirname,
+            "-fuse-ld=lld",
+            "-lm",
+            "-lxaiengine",
+        ]
+        # Linking against HSA
+        if self.opts.link_against_hsa:
+            cmd += [hsa_so_path]
+            cmd += ["-I%s" % hsa_include_path]
+            cmd += ["-Wl,-rpath,%s" % hsa_lib_path]
+
+        cmd += aie_target_defines(aie_target)
+
+        if len(self.opts.host_args) > 0:
+            await self.do_call(task, cmd + self.opts.host_args, incremental=False)
+
+        self.progress_bar.update(self.completed_task, advance=1)
+        if task:
+            self.progress_bar.update(task, advance=0, visible=False)
 
     async def gen_sim(self, task, aie_target):
         # For simulation, we need to additionally parse the 'remaining' options to avoid things
         # which conflict with the options below (e.g. -o)
-        print(opts.host_args)
+        print(self.opts.host_args)
         host_opts = aie.compiler.aiecc.cl_arguments.strip_host_args_for_aiesim(
-            opts.host_args
+            self.opts.host_args
         )
 
         sim_dir = self.prepend_tmp("sim")
@@ -784,14 +1117,14 @@ class FlowRunner:
         runtime_testlib_path = os.path.join(
             install_path,
             "runtime_lib",
-            opts.host_target.split("-")[0],
+            self.opts.host_target.split("-")[0],
             "test_lib",
             "lib",
         )
         runtime_testlib_include_path = os.path.join(
             install_path,
             "runtime_lib",
-            opts.host_target.split("-")[0],
+            self.opts.host_target.split("-")[0],
             "test_lib",
             "include",
         )
@@ -816,19 +1149,21 @@ class FlowRunner:
             "-Og",
             "-Dmain(...)=ps_main(...)",
             "-I" + self.tmpdirname,
-            "-I" + opts.aietools_path + "/include",
-            "-I" + opts.aietools_path + "/include/drivers/aiengine",
-            "-I" + opts.aietools_path + "/data/osci_systemc/include",
-            "-I" + opts.aietools_path + "/include/xtlm/include",
-            "-I" + opts.aietools_path + "/include/common_cpp/common_cpp_v1_0/include",
+            "-I" + self.opts.aietools_path + "/include",
+            "-I" + self.opts.aietools_path + "/include/drivers/aiengine",
+            "-I" + self.opts.aietools_path + "/data/osci_systemc/include",
+            "-I" + self.opts.aietools_path + "/include/xtlm/include",
+            "-I"
+            + self.opts.aietools_path
+            + "/include/common_cpp/common_cpp_v1_0/include",
             "-I" + runtime_testlib_include_path,
             memory_allocator,
         ]  # clang is picky  # Pickup aie_inc.cpp
 
         # Don't use shipped version of xaiengine?
         sim_link_args = [
-            "-L" + opts.aietools_path + "/lib/lnx64.o",
-            "-L" + opts.aietools_path + "/data/osci_systemc/lib/lnx64",
+            "-L" + self.opts.aietools_path + "/lib/lnx64.o",
+            "-L" + self.opts.aietools_path + "/data/osci_systemc/lib/lnx64",
             "-Wl,--as-needed",
             "-lxioutils",
             "-lxaiengine",
@@ -838,54 +1173,76 @@ class FlowRunner:
             "-flto",
         ]
         processes = []
-        processes.append(
-            self.do_call(
-                task,
-                [
-                    "aie-translate",
-                    "--aie-mlir-to-xpe",
-                    file_physical,
-                    "-o",
-                    os.path.join(sim_reports_dir, "graph.xpe"),
-                ],
+        if self.opts.in_process:
+            physical = self.physical_module.operation
+            await write_file_async(
+                aiedialect.generate_xpe(physical),
+                os.path.join(sim_reports_dir, "graph.xpe"),
             )
-        )
-        processes.append(
-            self.do_call(
-                task,
-                [
-                    "aie-translate",
-                    "--aie-mlir-to-shim-solution",
-                    file_physical,
-                    "-o",
-                    os.path.join(sim_arch_dir, "aieshim_solution.aiesol"),
-                ],
+            await write_file_async(
+                aiedialect.generate_shim_solution(physical),
+                os.path.join(sim_arch_dir, "aieshim_solution.aiesol"),
             )
-        )
-        processes.append(
-            self.do_call(
-                task,
-                [
-                    "aie-translate",
-                    "--aie-mlir-to-scsim-config",
-                    file_physical,
-                    "-o",
-                    os.path.join(sim_config_dir, "scsim_config.json"),
-                ],
+            await write_file_async(
+                aiedialect.generate_scsim_config(physical),
+                os.path.join(sim_config_dir, "scsim_config.json"),
             )
-        )
-        processes.append(
-            self.do_call(
-                task,
-                [
-                    "aie-opt",
-                    "--aie-find-flows",
-                    file_physical,
-                    "-o",
-                    os.path.join(sim_dir, "flows_physical.mlir"),
-                ],
+            flows_physical = await self.run_passes_in_process(
+                task, FIND_FLOWS, self.physical_module
+            )
+            await write_file_async(
+                aiedialect.generate_flows_json(flows_physical.operation),
+                os.path.join(sim_dir, "flows_physical.json"),
+            )
+        else:
+            processes.append(
+                self.do_call(
+                    task,
+                    [
+                        "aie-translate",
+                        "--aie-mlir-to-xpe",
+                        file_physical,
+                        "-o",
+                        os.path.join(sim_reports_dir, "graph.xpe"),
+                    ],
+                )
+            )
+            processes.append(
+                self.do_call(
+                    task,
+                    [
+                        "aie-translate",
+                        "--aie-mlir-to-shim-solution",
+                        file_physical,
+                        "-o",
+                        os.path.join(sim_arch_dir, "aieshim_solution.aiesol"),
+                    ],
+                )
+            )
+            processes.append(
+                self.do_call(
+                    task,
+                    [
+                        "aie-translate",
+                        "--aie-mlir-to-scsim-config",
+                        file_physical,
+                        "-o",
+                        os.path.join(sim_config_dir, "scsim_config.json"),
+                    ],
+                )
+            )
+            processes.append(
+                self.do_call(
+                    task,
+                    [
+                        "aie-opt",
+                        "--aie-find-flows",
+                        file_physical,
+                        "-o",
+                        os.path.join(sim_dir, "flows_physical.mlir"),
+                    ],
+                )
             )
-        )
         processes.append(self.do_call(task, ["cp", sim_makefile, sim_dir]))
         processes.append(self.do_call(task, ["cp", sim_genwrapper, sim_ps_dir]))
         processes.append(
@@ -904,19 +1261,21 @@ class FlowRunner:
                     *sim_cc_args,
                     *sim_link_args,
                 ],
+                incremental=False,
             )
         )
         await asyncio.gather(*processes)
-        await self.do_call(
-            task,
-            [
-                "aie-translate",
-                "--aie-flows-to-json",
-                os.path.join(sim_dir, "flows_physical.mlir"),
-                "-o",
-                os.path.join(sim_dir, "flows_physical.json"),
-            ],
-        )
+        if not self.opts.in_process:
+            await self.do_call(
+                task,
+                [
+                    "aie-translate",
+                    "--aie-flows-to-json",
+                    os.path.join(sim_dir, "flows_physical.mlir"),
+                    "-o",
+                    os.path.join(sim_dir, "flows_physical.json"),
+                ],
+            )
 
         sim_script = self.prepend_tmp("aiesim.sh")
         sim_script_template = dedent(
@@ -944,25 +1303,96 @@ class FlowRunner:
         print("Simulation generated...")
         print("To run simulation: " + sim_script)
 
-    async def run_flow(self):
-        nworkers = int(opts.nthreads)
-        if nworkers == 0:
-            nworkers = os.cpu_count()
-
-        self.limit = asyncio.Semaphore(nworkers)
-        with progress.Progress(
-            *progress.Progress.get_default_columns(),
-            progress.TimeElapsedColumn(),
-            progress.MofNCompleteColumn(),
-            progress.TextColumn("{task.fields[command]}"),
-            redirect_stdout=False,
-            redirect_stderr=False,
-        ) as progress_bar:
-            self.progress_bar = progress_bar
-            progress_bar.task = progress_bar.add_task(
-                "[green] MLIR compilation:", total=1, command="1 Worker"
-            )
+    async def process_ipu(self, task, file_with_addresses):
+        # Designs that pick all their BD ids don't need (or want the warnings
+        # of) the BD id assignment.
+        assign_bd_ids = has_unassigned_bd_ids(self.module)
+        if self.opts.in_process:
+            pipeline = dma_to_ipu_pipeline(assign_bd_ids, self.opts.ipu_optimize)
+            ipu_module = await self.run_passes_in_process(task, pipeline, self.module)
+            insts = aiedialect.ipu_instgen(ipu_module.operation)
+            if self.opts.insts_format == "text":
+                await write_file_async("\n".join(insts) + "\n", self.opts.insts_name)
+                return
+            words = [int(w, 16) for w in insts]
+            if self.opts.insts_format == "length-prefixed":
+                words.insert(0, len(words))
+            async with aiofiles.open(self.opts.insts_name, mode="wb") as f:
+                await f.write(struct.pack(f"<{len(words)}I", *words))
+            return
+
+        generated_insts_mlir = self.prepend_tmp("generated_ipu_insts.mlir")
+        await self.do_call(
+            task,
+            [
+                "aie-opt",
+                *(["--aie-assign-ipu-bd-ids"] if assign_bd_ids else []),
+                "--aie-dma-to-ipu",
+                *(
+                    ["--aie-optimize-ipu-instructions"]
+                    if self.opts.ipu_optimize
+                    else []
+                ),
+                file_with_addresses,
+                "-o",
+                generated_insts_mlir,
+            ],
+        )
+        await self.do_call(
+            task,
+            [
+                "aie-translate",
+                "--aie-ipu-instgen",
+                f"--aie-ipu-instgen-format={self.opts.insts_format}",
+                generated_insts_mlir,
+                "-o",
+                self.opts.insts_name,
+            ],
+        )
 
+    async def process_unified(
+        self, task, aie_target, chess_intrinsic_wrapper_ll_path, file_with_addresses
+    ):
+        # fmt: off
+        file_llvmir = self.prepend_tmp("input.ll")
+        if self.opts.in_process:
+            llvm_module = await self.run_passes_in_process(task, AIE_LOWER_TO_LLVM, self.module)
+            await write_file_async(aiedialect.translate_mlir_to_llvmir(llvm_module.operation), file_llvmir)
+        else:
+            file_opt_with_addresses = self.prepend_tmp("input_opt_with_addresses.mlir")
+            await self.do_call(task, ["aie-opt", f"--pass-pipeline={AIE_LOWER_TO_LLVM}", file_with_addresses, "-o", file_opt_with_addresses])
+            await self.do_call(task, ["aie-translate", "--mlir-to-llvmir", file_opt_with_addresses, "-o", file_llvmir])
+
+        self.unified_file_core_obj = self.prepend_tmp("input.o")
+        if self.opts.compile and self.opts.xchesscc:
+            file_llvmir_hacked = await self.chesshack(task, file_llvmir, chess_intrinsic_wrapper_ll_path)
+            await self.do_call(task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+P", "4", file_llvmir_hacked, "-o", self.unified_file_core_obj])
+        elif self.opts.compile:
+            file_llvmir_opt = self.prepend_tmp("input.opt.ll")
+            await self.do_call(task, [self.peano_opt_path, "--passes=default<O2>", "-inline-threshold=10", "-S", file_llvmir, "-o", file_llvmir_opt])
+            await self.do_call(task, [self.peano_llc_path, file_llvmir_opt, "-O2", "--march=" + aie_target.lower(), "--function-sections", "--filetype=obj", "-o", self.unified_file_core_obj])
+        # fmt: on
+
+    async def run_flow(self, pool=None, progress_bar=None):
+        """Build the design. Designs compiled together pass in the worker
+        `pool` and `progress_bar` they share."""
+        if pool is None:
+            pool = make_pool(self.opts)
+        if progress_bar is None:
+            with make_progress_bar() as progress_bar:
+                await self.run_flow(pool, progress_bar)
+            return
+
+        self.pool = pool
+        self.progress_bar = progress_bar
+        label = f" {self.name}" if self.name else ""
+        self.mlir_task = progress_bar.add_task(
+            f"[green] MLIR compilation{label}:", total=1, command="1 Worker"
+        )
+
+        # Entering a Context is not safe across an await while other designs
+        # are being compiled, so it is only held for the synchronous front-end.
+        with self.ctx, Location.unknown():
             file_with_addresses = self.prepend_tmp("input_with_addresses.mlir")
             pass_pipeline = ",".join(
                 [
@@ -979,23 +1409,28 @@ class FlowRunner:
                     "convert-scf-to-cf",
                 ]
             )
-            run_passes(
+            # Only the external tools need the lowered design as a file.
+            run_passes_module(
                 "builtin.module(" + pass_pipeline + ")",
-                self.mlir_module_str,
-                file_with_addresses,
+                self.module,
+                None if self.opts.in_process else file_with_addresses,
                 self.opts.verbose,
             )
 
-            cores = generate_cores_list(await read_file_async(file_with_addresses))
-            t = do_run(
-                [
-                    "aie-translate",
-                    "--aie-generate-target-arch",
-                    file_with_addresses,
-                ],
-                self.opts.verbose,
-            )
-            aie_target = t.stdout.strip()
+            cores = generate_cores_list(self.module)
+            if self.opts.in_process:
+                aie_target = aiedialect.generate_target_arch(self.module.operation)
+            else:
+                t = do_run(
+                    [
+                        "aie-translate",
+                        "--aie-generate-target-arch",
+                        file_with_addresses,
+                    ],
+                    self.opts.verbose,
+                )
+                aie_target = t.stdout
+            aie_target = aie_target.strip()
             if not re.fullmatch("AIE.?", aie_target):
                 print(
                     "Unexpected target " + aie_target + ". Exiting...",
@@ -1004,101 +1439,159 @@ class FlowRunner:
                 exit(-3)
             aie_peano_target = aie_target.lower() + "-none-elf"
 
-            # Optionally generate insts.txt for IPU instruction stream
-            if opts.ipu or opts.only_ipu:
-                generated_insts_mlir = self.prepend_tmp("generated_ipu_insts.mlir")
-                await self.do_call(
-                    progress_bar.task,
-                    [
-                        "aie-opt",
-                        "--aie-dma-to-ipu",
-                        file_with_addresses,
-                        "-o",
-                        generated_insts_mlir,
-                    ],
-                )
-                await self.do_call(
-                    progress_bar.task,
-                    [
-                        "aie-translate",
-                        "--aie-ipu-instgen",
-                        generated_insts_mlir,
-                        "-o",
-                        opts.insts_name,
-                    ],
-                )
-                if opts.only_ipu:
-                    return
+        graph = TaskGraph(
+            pool, critical_path_first=self.opts.schedule == "critical-path"
+        )
 
-            chess_intrinsic_wrapper_ll_path = await self.prepare_for_chesshack(
-                progress_bar.task, aie_target
+        # Optionally generate insts.txt for IPU instruction stream
+        if self.opts.ipu or self.opts.only_ipu:
+            graph.add(
+                "ipu",
+                lambda: self.process_ipu(self.mlir_task, file_with_addresses),
+                cost=2,
             )
+            if self.opts.only_ipu:
+                await graph.run()
+                return
 
-            # fmt: off
-            if opts.unified:
-                file_opt_with_addresses = self.prepend_tmp("input_opt_with_addresses.mlir")
-                await self.do_call(progress_bar.task, ["aie-opt", f"--pass-pipeline={AIE_LOWER_TO_LLVM}", file_with_addresses, "-o", file_opt_with_addresses])
-
-                file_llvmir = self.prepend_tmp("input.ll")
-                await self.do_call(progress_bar.task, ["aie-translate", "--mlir-to-llvmir", file_opt_with_addresses, "-o", file_llvmir])
-
-                self.unified_file_core_obj = self.prepend_tmp("input.o")
-                if opts.compile and opts.xchesscc:
-                    file_llvmir_hacked = await self.chesshack(progress_bar.task, file_llvmir, chess_intrinsic_wrapper_ll_path)
-                    await self.do_call(progress_bar.task, ["xchesscc_wrapper", aie_target.lower(), "+w", self.prepend_tmp("work"), "-c", "-d", "-f", "+P", "4", file_llvmir_hacked, "-o", self.unified_file_core_obj])
-                elif opts.compile:
-                    file_llvmir_opt = self.prepend_tmp("input.opt.ll")
-                    await self.do_call(progress_bar.task, [self.peano_opt_path, "--passes=default<O2>", "-inline-threshold=10", "-S", file_llvmir, "-o", file_llvmir_opt])
-                    await self.do_call(progress_bar.task, [self.peano_llc_path, file_llvmir_opt, "-O2", "--march=" + aie_target.lower(), "--function-sections", "--filetype=obj", "-o", self.unified_file_core_obj])
-            # fmt: on
-
-            progress_bar.update(progress_bar.task, advance=0, visible=False)
-            progress_bar.task_completed = progress_bar.add_task(
-                "[green] AIE Compilation:",
-                total=len(cores) + 1,
-                command="%d Workers" % nworkers,
+        self.completed_task = progress_bar.add_task(
+            f"[green] AIE Compilation{label}:",
+            total=len(cores) + 1,
+            command="%d Workers" % pool.nworkers,
+        )
+
+        # The relative costs only steer which ready steps start first; the
+        # per-core compilations dominate, so they should never wait on
+        # cheap steps that nothing else depends on.
+        chess = graph.add(
+            "chess",
+            lambda: self.prepare_for_chesshack(self.mlir_task, aie_target),
+            cost=5,
+        )
+        unified = None
+        if self.opts.unified:
+            unified = graph.add(
+                "unified",
+                lambda: self.process_unified(
+                    self.mlir_task,
+                    aie_target,
+                    chess.result,
+                    file_with_addresses,
+                ),
+                deps=[chess],
+                cost=20,
+            )
+        physical = graph.add(
+            "physical",
+            lambda: self.process_physical(self.mlir_task, file_with_addresses),
+            cost=5,
+        )
+        host = graph.add(
+            "host",
+            lambda: self.process_host_cgen(aie_target),
+            deps=[physical],
+            cost=5,
+        )
+        if self.opts.aiesim:
+            # gen_sim reads the files written by process_host_cgen.
+            graph.add(
+                "sim",
+                lambda: self.gen_sim(self.mlir_task, aie_target),
+                deps=[host],
+                cost=10,
+            )
+        core_tasks = [
+            graph.add(
+                "core_%d_%d" % (core[0], core[1]),
+                # Bind the loop variable now, not when the task starts.
+                lambda core=core: self.process_core(
+                    core,
+                    aie_target,
+                    aie_peano_target,
+                    chess.result,
+                    file_with_addresses,
+                ),
+                deps=[chess, unified],
+                cost=10,
+                labels={"col": core[0], "row": core[1]},
             )
+            for core in cores
+        ]
 
-            processes = [self.process_host_cgen(aie_target, file_with_addresses)]
-            await asyncio.gather(
-                *processes
-            )  # ensure that process_host_cgen finishes before running gen_sim
-            processes = []
-            if opts.aiesim:
-                processes.append(self.gen_sim(progress_bar.task, aie_target))
-            for core in cores:
-                processes.append(
-                    self.process_core(
-                        core,
-                        aie_target,
-                        aie_peano_target,
-                        chess_intrinsic_wrapper_ll_path,
-                        file_with_addresses,
-                    )
+        # Must have elfs, before we build the final binary assembly
+        binaries = [host] + core_tasks
+        if self.opts.cdo:
+            sections = ["error_handling", "init"]
+            if cores:
+                sections += ["elfs", "enable"]
+            binaries = [
+                graph.add(
+                    "cdo_" + section,
+                    lambda section=section: self.process_cdo(self.mlir_task, section),
+                    deps=[physical] + (core_tasks if section == "elfs" else []),
+                    cost=5 if section == "elfs" else 1,
                 )
-            await asyncio.gather(*processes)
+                for section in sections
+            ]
+        if self.opts.cdo or self.opts.xcl:
+            prepare = graph.add(
+                "xclbin_prep",
+                lambda: self.prepare_xclbin_gen(bool(len(cores))),
+            )
+            graph.add(
+                "xclbin",
+                self.process_xclbin_gen,
+                deps=binaries + [prepare],
+                cost=5,
+            )
 
-            # Must have elfs, before we build the final binary assembly
-            if opts.cdo and opts.execute:
-                await self.process_cdo()
-            if opts.cdo or opts.xcl:
-                await self.process_xclbin_gen(bool(len(cores)))
+        await graph.run()
+        progress_bar.update(self.mlir_task, advance=0, visible=False)
 
     def dumpprofile(self):
-        sortedruntimes = sorted(
-            self.runtimes.items(), key=lambda item: item[1], reverse=True
-        )
+        sortedruntimes = sorted(self.runtimes, key=lambda item: item[1], reverse=True)
         for i in range(50):
             if i < len(sortedruntimes):
                 s1, s0 = sortedruntimes[i][1], sortedruntimes[i][0]
                 print(f"{s1:.4f} sec: {s0}")
 
 
-def run(mlir_module, args=None):
-    global opts
-    if args is not None:
-        opts = aie.compiler.aiecc.cl_arguments.parse_args(args)
+def make_progress_bar():
+    return progress.Progress(
+        *progress.Progress.get_default_columns(),
+        progress.TimeElapsedColumn(),
+        progress.MofNCompleteColumn(),
+        progress.TextColumn("{task.fields[command]}"),
+        redirect_stdout=False,
+        redirect_stderr=False,
+    )
+
+
+def make_toolchain(opts):
+    if opts.toolchain_cache and opts.execute:
+        return Toolchain(opts.cache_dir or DEFAULT_CACHE_DIR, opts.cache_max_size)
+    return Toolchain()
+
+
+def worker_count(opts):
+    nworkers = int(opts.nthreads)
+    if nworkers == 0:
+        nworkers = os.cpu_count()
+    return nworkers
 
+
+def make_pool(opts):
+    memory = None
+    if opts.max_memory:
+        memory = MemoryBudget(
+            opts.max_memory // 1024,
+            os.path.join(opts.cache_dir or DEFAULT_CACHE_DIR, "memory_estimates.json"),
+        )
+    return WorkerPool(worker_count(opts), memory)
+
+
+def setup_environment(opts):
+    """Find Vitis and peano and put them on the PATH."""
     if "VITIS" not in os.environ:
         # Try to find vitis in the path
         vpp_path = shutil.which("v++")
@@ -1137,6 +1630,41 @@ def run(mlir_module, args=None):
     if opts.aiesim and not opts.xbridge:
         sys.exit("AIE Simulation (--aiesim) currently requires --xbridge")
 
+
+def make_project_dir(tmpdirname, verbose=False):
+    tmpdirname = os.path.abspath(tmpdirname)
+    try:
+        os.mkdir(tmpdirname)
+    except FileExistsError:
+        pass
+    if verbose:
+        print("created temporary directory", tmpdirname)
+    return tmpdirname
+
+
+def report(runner):
+    opts = runner.opts
+    if opts.profiling:
+        runner.dumpprofile()
+
+    if runner.manifest:
+        runner.manifest.save()
+        if runner.manifest.reused:
+            print(f"Reused {len(runner.manifest.reused)} up-to-date steps:")
+            for step in runner.manifest.reused:
+                print("  " + step)
+
+    if runner.cache and opts.verbose:
+        print(f"Build cache: {runner.cache.hits} hits, {runner.cache.misses} misses")
+
+
+def run(mlir_module, args=None):
+    global opts
+    if args is not None:
+        opts = aie.compiler.aiecc.cl_arguments.parse_args(args)
+
+    setup_environment(opts)
+
     if opts.verbose:
         sys.stderr.write(f"\ncompiling {opts.filename}\n")
 
@@ -1146,25 +1674,108 @@ def run(mlir_module, args=None):
         tmpdirname = os.path.basename(opts.filename) + ".prj"
     else:
         tmpdirname = tempfile.mkdtemp()
-    tmpdirname = os.path.abspath(tmpdirname)
+    tmpdirname = make_project_dir(tmpdirname, opts.verbose)
 
-    try:
-        os.mkdir(tmpdirname)
-    except FileExistsError:
-        pass
-    if opts.verbose:
-        print("created temporary directory", tmpdirname)
-
-    runner = FlowRunner(str(mlir_module), opts, tmpdirname)
+    runner = FlowRunner(mlir_module, opts, tmpdirname)
     asyncio.run(runner.run_flow())
 
-    if opts.profiling:
-        runner.dumpprofile()
+    if runner.trace:
+        runner.trace.write(opts.trace_file)
+    if runner.pool.memory:
+        runner.pool.memory.save()
+    report(runner)
+
+
+def expand_designs(designs):
+    for design in designs:
+        if isinstance(design, str) and glob.has_magic(design):
+            yield from sorted(glob.glob(design))
+        else:
+            yield design
+
+
+def run_batch(designs, args=None):
+    """Compile many designs concurrently, with at most -j steps running at a
+    time across all of them.
+
+    `designs` is an iterable of .mlir file names, glob patterns of them, and
+    parsed Modules. Each design is built in its own `<name>.prj` directory
+    (under --tmpdir if given), where its core ELFs, xclbin and IPU
+    instructions are also written. Returns the FlowRunner of each design.
+    """
+    global opts
+    if args is not None:
+        opts = aie.compiler.aiecc.cl_arguments.parse_args(args)
+
+    setup_environment(opts)
+
+    toolchain = make_toolchain(opts)
+    trace = Trace() if opts.trace_file else None
+    runners = []
+    names = set()
+    for i, design in enumerate(expand_designs(designs)):
+        design_opts = copy.copy(opts)
+        if isinstance(design, str):
+            name = os.path.basename(design)
+            with open(design, "r") as f:
+                mlir_module = f.read()
+            design_opts.filename = design
+        else:
+            name = f"design_{i}"
+            mlir_module = design
+            design_opts.filename = None
+        if name in names:
+            name = f"{name}_{i}"
+        names.add(name)
+        if opts.verbose:
+            sys.stderr.write(f"\ncompiling {design_opts.filename or name}\n")
+
+        tmpdirname = make_project_dir(
+            os.path.join(opts.tmpdir or ".", name + ".prj"), opts.verbose
+        )
+        design_opts.tmpdir = tmpdirname
+        design_opts.xclbin_name = os.path.join(
+            tmpdirname, os.path.basename(opts.xclbin_name)
+        )
+        design_opts.insts_name = os.path.join(
+            tmpdirname, os.path.basename(opts.insts_name)
+        )
+        runners.append(
+            FlowRunner(
+                mlir_module,
+                design_opts,
+                tmpdirname,
+                toolchain=toolchain,
+                trace=trace,
+                elf_dir=tmpdirname,
+                name=name,
+            )
+        )
+
+    async def run_all():
+        pool = make_pool(opts)
+        with make_progress_bar() as progress_bar:
+            await asyncio.gather(
+                *(runner.run_flow(pool, progress_bar) for runner in runners)
+            )
+
+    asyncio.run(run_all())
+
+    if trace:
+        trace.write(opts.trace_file)
+    if runners and runners[0].pool.memory:
+        runners[0].pool.memory.save()
+    for runner in runners:
+        report(runner)
+    return runners
 
 
 def main():
     global opts
     opts = aie.compiler.aiecc.cl_arguments.parse_args()
+    if opts.batch:
+        run_batch(opts.batch + ([opts.filename] if opts.filename else []))
+        return
     if opts.filename is None:
         print("error: the 'file' positional argument is required.")
         sys.exit(1)
@@ -1173,8 +1784,7 @@ def main():
         with Context() as ctx, Location.unknown():
             with open(opts.filename, "r") as f:
                 module = Module.parse(f.read())
-            module_str = str(module)
     except Exception as e:
         print(e)
         sys.exit(1)
-    run(module_str)
+    run(module)
@@ -0,0 +1,95 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Memory budgeting for the subprocesses started by aiecc.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+# Assumed peak memory use, in KiB, of a tool that has not been measured yet.
+DEFAULT_ESTIMATE = 1 << 20
+
+
+class Reservation:
+    def __init__(self, tool, estimate):
+        self.tool = tool
+        self.estimate = estimate
+        self.rss = 0
+
+    @property
+    def usage(self):
+        return max(self.estimate, self.rss)
+
+    def update(self, rss):
+        self.rss = rss
+
+
+class MemoryBudget:
+    """Admits subprocesses only while their expected memory use fits in
+    `limit` KiB.
+
+    Every running subprocess is counted at the larger of the estimate for its
+    tool and its last sampled resident set size. The estimates are learned
+    from the peak use of earlier runs of the same tool and are kept in the
+    file `estimates_path`, if given, across aiecc invocations. A subprocess
+    is always admitted when nothing else is running, so a tool that needs
+    more than `limit` still runs, on its own.
+    """
+
+    def __init__(self, limit, estimates_path=None):
+        self.limit = limit
+        self.estimates_path = estimates_path
+        self.estimates = {}
+        self.running = []
+        self._changed = asyncio.Condition()
+        if estimates_path:
+            try:
+                with open(estimates_path) as f:
+                    self.estimates = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def estimate(self, tool):
+        return self.estimates.get(tool, DEFAULT_ESTIMATE)
+
+    def _fits(self, reservation):
+        if not self.running:
+            return True
+        used = sum(r.usage for r in self.running)
+        return used + reservation.usage <= self.limit
+
+    async def reserve(self, tool):
+        reservation = Reservation(tool, self.estimate(tool))
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._fits(reservation))
+            self.running.append(reservation)
+        return reservation
+
+    async def release(self, reservation, peak):
+        """Return the memory of a finished subprocess, whose peak resident set
+        size was `peak` KiB (or 0 if it could not be measured)."""
+        if peak > 0:
+            # Follow tools whose use goes down between runs, but only slowly,
+            # as a single small run says little about the next design.
+            old = self.estimates.get(reservation.tool, peak)
+            self.estimates[reservation.tool] = max(peak, (old + peak) // 2)
+        async with self._changed:
+            self.running.remove(reservation)
+            self._changed.notify_all()
+
+    def save(self):
+        if not self.estimates_path:
+            return
+        dirname = os.path.dirname(self.estimates_path)
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".staging-", dir=dirname)
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.estimates, f, indent=1)
+        os.replace(tmp, self.estimates_path)
@@ -0,0 +1,142 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Dependency-graph scheduling of the steps of the aiecc flow.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+
+# The Task being run and the worker slot it holds, for code running on its behalf.
+current_task = contextvars.ContextVar("current_task", default=None)
+current_slot = contextvars.ContextVar("current_slot", default=None)
+
+
+class WorkerPool:
+    """A counting semaphore that hands free slots to the highest priority
+    waiter first (and to waiters of equal priority in arrival order).
+
+    Slots are numbered from 0 to nworkers - 1; `acquire` returns the number of
+    the slot it took, which must be passed back to `release`. `memory` is an
+    optional MemoryBudget shared by the subprocesses the tasks start.
+    """
+
+    def __init__(self, nworkers, memory=None):
+        self.nworkers = nworkers
+        self.memory = memory
+        self.running = 0
+        self._free = list(range(nworkers))
+        self._waiters = []
+        self._seq = itertools.count()
+
+    async def acquire(self, priority=0):
+        if self._free and not self._waiters:
+            self.running += 1
+            return heapq.heappop(self._free)
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._seq), fut))
+        try:
+            return await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation.
+            if fut.done() and not fut.cancelled():
+                self.release(fut.result())
+            raise
+
+    def release(self, slot):
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                # Pass the slot straight on; self.running is unchanged.
+                fut.set_result(slot)
+                return
+        self.running -= 1
+        heapq.heappush(self._free, slot)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority=0):
+        slot = await self.acquire(priority)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+
+class Task:
+    def __init__(self, name, action, deps, cost, labels):
+        self.name = name
+        self.action = action
+        self.deps = deps
+        self.cost = cost
+        self.labels = labels
+        self.successors = []
+        self.priority = cost
+        self.result = None
+
+
+class TaskGraph:
+    """Runs each task as soon as all of the tasks it depends on are done,
+    with at most `pool.nworkers` tasks running at a time.
+
+    `action` is a function returning an awaitable; it is only called once the
+    task's dependencies have finished, so it can use their `result`s. `cost` is
+    a relative estimate of how long the task takes. With `critical_path_first`,
+    ready tasks with the longest chain of work behind them start first.
+    `labels` are free-form details about the task (such as the core it
+    compiles) for profiling.
+    """
+
+    def __init__(self, pool, critical_path_first=True):
+        self.pool = pool
+        self.critical_path_first = critical_path_first
+        self.tasks = []
+
+    def add(self, name, action, deps=(), cost=1, labels=None):
+        task = Task(
+            name, action, [d for d in deps if d is not None], cost, labels or {}
+        )
+        for dep in task.deps:
+            dep.successors.append(task)
+        self.tasks.append(task)
+        return task
+
+    def prioritize(self):
+        # Dependencies are always added before their dependents, so reverse
+        # insertion order visits every task after all of its successors.
+        for task in reversed(self.tasks):
+            task.priority = task.cost + max(
+                (s.priority for s in task.successors), default=0
+            )
+
+    async def _run_task(self, task, deps):
+        for dep in deps:
+            await dep
+        priority = task.priority if self.critical_path_first else 0
+        async with self.pool.slot(priority) as slot:
+            # Each task runs in its own copy of the context, so these are
+            # only visible to the task's own code.
+            current_task.set(task)
+            current_slot.set(slot)
+            task.result = await task.action()
+        return task.result
+
+    async def run(self):
+        self.prioritize()
+        futures = {}
+        for task in self.tasks:
+            futures[task] = asyncio.ensure_future(
+                self._run_task(task, [futures[d] for d in task.deps])
+            )
+        try:
+            await asyncio.gather(*futures.values())
+        except BaseException:
+            for f in futures.values():
+                f.cancel()
+            raise
@@ -0,0 +1,138 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Lookups that depend only on the installed tools, shared by every design that
+is compiled in one aiecc process.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import aie.compiler.aiecc.configure
+from aie.compiler.aiecc.cache import BuildCache, toolchain_fingerprint
+
+# The tools whose version decides the results of the path lookups.
+LOOKUP_TOOLS = ["clang", "xchesscc_wrapper", "aie-opt"]
+
+
+class Toolchain:
+    """Memoizes tool and runtime library lookups, and artifacts built once from
+    the toolchain (such as the chess intrinsic wrapper), so that compiling
+    many cores or many designs does not repeat them.
+
+    Asynchronous results are shared as futures, so a Toolchain must only be
+    used from a single event loop.
+
+    With a `cache_dir`, results are also kept across runs: persistent lookups
+    in a file named after the toolchain's fingerprint, and built artifacts in
+    a BuildCache (see `cache`).
+    """
+
+    def __init__(self, cache_dir=None, max_size=None):
+        self._lookups = {}
+        self._futures = {}
+        self.cache = None
+        self._lookups_path = None
+        self._persistent = {}
+        if cache_dir is None:
+            return
+        self.cache = BuildCache(cache_dir, max_size)
+        version = hashlib.sha256()
+        version.update(aie.compiler.aiecc.configure.install_path().encode())
+        for tool in self.fingerprint(LOOKUP_TOOLS):
+            version.update(tool.encode())
+        self._lookups_path = os.path.join(
+            self.cache.cache_dir, "toolchain", version.hexdigest() + ".json"
+        )
+        try:
+            with open(self._lookups_path) as f:
+                self._persistent = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def lookup(self, key, compute, persistent=False):
+        """Returns `compute()`, computed once per key. Persistent results must
+        be JSON-serializable and are reused by later runs with the same
+        toolchain."""
+        if key in self._lookups:
+            return self._lookups[key]
+        name = "/".join(map(str, key))
+        if persistent and name in self._persistent:
+            value = self._persistent[name]
+        else:
+            value = compute()
+            if persistent and self._lookups_path:
+                self._persistent[name] = value
+                self._save_lookups()
+        self._lookups[key] = value
+        return value
+
+    def _save_lookups(self):
+        dirname = os.path.dirname(self._lookups_path)
+        os.makedirs(dirname, exist_ok=True)
+        # Write a private file and rename it into place, as other aiecc
+        # processes may be reading or writing the same file.
+        fd, tmp = tempfile.mkstemp(prefix=".staging-", dir=dirname)
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._persistent, f, indent=1)
+        os.replace(tmp, self._lookups_path)
+
+    def build_once(self, key, build):
+        """Returns a future for the result of the coroutine function `build`,
+        which is only run for the first caller with this key."""
+        if key not in self._futures:
+            self._futures[key] = asyncio.ensure_future(build())
+        # One of the waiters being cancelled must not cancel the build for the others.
+        return asyncio.shield(self._futures[key])
+
+    def fingerprint(self, tools):
+        return self.lookup(
+            ("fingerprint", *tools), lambda: toolchain_fingerprint(tools)
+        )
+
+    def runtime_lib_path(self, aie_target):
+        install_path = aie.compiler.aiecc.configure.install_path()
+        return os.path.join(install_path, "aie_runtime_lib", aie_target.upper())
+
+    def core_link_args(self, aie_target):
+        """The runtime objects and libraries every core is linked with."""
+        return self.lookup(
+            ("core_link_args", aie_target),
+            lambda: self._core_link_args(aie_target),
+            persistent=True,
+        )
+
+    def _core_link_args(self, aie_target):
+        clang_path = os.path.dirname(shutil.which("clang"))
+        # The build path for libc can be very different from where it's installed.
+        llvmlibc_build_lib_path = os.path.join(
+            clang_path,
+            "..",
+            "runtimes",
+            "runtimes-" + aie_target.lower() + "-none-unknown-elf-bins",
+            "libc",
+            "lib",
+            "libc.a",
+        )
+        llvmlibc_install_lib_path = os.path.join(
+            clang_path,
+            "..",
+            "lib",
+            aie_target.lower() + "-none-unknown-elf",
+            "libc.a",
+        )
+        me_basic_o = os.path.join(self.runtime_lib_path(aie_target), "me_basic.o")
+        if os.path.isfile(llvmlibc_build_lib_path):
+            libc = llvmlibc_build_lib_path
+        else:
+            libc = llvmlibc_install_lib_path
+
+        return [me_basic_o, libc, "-Wl,--gc-sections"]
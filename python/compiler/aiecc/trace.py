@@ -0,0 +1,101 @@
+# This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+# See https://llvm.org/LICENSE.txt for license information.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+#
+# (c) Copyright 2024 Advanced Micro Devices, Inc.
+
+"""
+Timeline tracing of the aiecc flow in the Chrome trace event format, which can
+be opened with chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+
+def process_tree_rss(pid):
+    """Returns the resident set size in KiB of process `pid` and all of its
+    descendants (tools such as xchesscc_wrapper are scripts that do their work
+    in child processes), or 0 if it has exited. Only supported on Linux."""
+    total = 0
+    pending = [pid]
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+            for tid in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{tid}/children") as f:
+                    pending += [int(child) for child in f.read().split()]
+        except (OSError, ValueError):
+            # The process exited while we were looking at it.
+            pass
+    return total
+
+
+async def peak_rss(proc, interval=0.05, on_sample=None):
+    """Samples the memory use of `proc` and its children until it exits and
+    returns the highest value seen, in KiB. `on_sample` is called with each
+    sample."""
+    peak = 0
+    while proc.returncode is None:
+        rss = process_tree_rss(proc.pid)
+        if on_sample:
+            on_sample(rss)
+        peak = max(peak, rss)
+        try:
+            await asyncio.wait_for(asyncio.shield(proc.wait()), interval)
+        except asyncio.TimeoutError:
+            pass
+    return peak
+
+
+class Trace:
+    """Collects one complete ("X") event per traced step. Events are laid out
+    by worker slot, so that idle workers show up as gaps in their row."""
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.origin = time.time()
+        self.events = []
+        self.slots = set()
+
+    def _us(self, t):
+        return round((t - self.origin) * 1e6)
+
+    def span(self, name, start, end, slot=None, **args):
+        tid = -1 if slot is None else slot
+        self.slots.add(tid)
+        self.events.append(
+            {
+                "name": name,
+                "cat": "aiecc",
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": max(round((end - start) * 1e6), 0),
+                "pid": self.pid,
+                "tid": tid,
+                "args": args,
+            }
+        )
+
+    def write(self, path):
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": "driver" if tid < 0 else f"worker {tid}"},
+            }
+            for tid in sorted(self.slots)
+        ]
+        with open(path, "w") as f:
+            json.dump(
+                {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f
+            )
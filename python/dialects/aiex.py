@@ -3,6 +3,8 @@
 from contextlib import contextmanager
 from functools import partial
 
+import numpy as np
+
 from ._aiex_ops_gen import *
 from .aie import DMAChannelDir, LockAction, dma, dma_bd, lock, use_lock
 from .transform.structured import MixedValues, _dispatch_mixed_values
@@ -39,6 +41,9 @@ class IpuDmaMemcpyNd(IpuDmaMemcpyNdOp):
             sizes = [0] * 4
         if strides is None:
             strides = [0] * 3
+        # Left to aie-assign-ipu-bd-ids.
+        if bd_id is None:
+            bd_id = -1
         dynamic_offsets, _packed_offsets, static_offsets = _dispatch_mixed_values(
             offsets
         )
@@ -102,86 +107,137 @@ def _get_prolog():
     return _PROLOG[:]
 
 
+# Every encoder takes scalars or arrays for its arguments, broadcasts them
+# against each other, and returns the instructions of all the elements back to
+# back in one contiguous uint32 array. The unsuffixed encoders are the scalar
+# forms, returning the words of one instruction as a list.
+
+
+def _broadcast(*args):
+    return [a.astype(np.uint64) for a in np.broadcast_arrays(*map(np.asarray, args))]
+
+
+def _wrap_size(size):
+    # None means do not wrap which is 0 on the arch
+    size = np.asarray(size)
+    if size.dtype == object:
+        size = np.array(
+            [0 if s is None else s for s in size.flat], dtype=np.int64
+        ).reshape(size.shape)
+    return size
+
+
 # based on https://github.com/Xilinx/mlir-aie/blob/cb232a43383ef3b8efd8b408545c9b74885578ad/lib/Targets/AIETargetIPU.cpp
+def _ipu_sync_batch(column, row=0, direction=0, channel=0, column_num=1, row_num=1):
+    column, row, direction, channel, column_num, row_num = _broadcast(
+        column, row, direction, channel, column_num, row_num
+    )
+    words = np.empty(column.shape + (2,), dtype=np.uint64)
+    op_code = 3
+    words[..., 0] = (op_code & 0xFF) << 24
+    words[..., 0] |= (column & 0xFF) << 16
+    words[..., 0] |= (row & 0xFF) << 8
+    words[..., 0] |= direction & 0x1
+
+    words[..., 1] = (channel & 0xFF) << 24
+    words[..., 1] |= (column_num & 0xFF) << 16
+    words[..., 1] |= (row_num & 0xFF) << 8
+    return words.astype(np.uint32).reshape(-1)
+
+
 def _ipu_sync(column, row=0, direction=0, channel=0, column_num=1, row_num=1):
     if isinstance(channel, IntegerAttr):
         channel = int(channel)
-    words = [None] * 2
-    op_code = 3
-    words[0] = (op_code & 0xFF) << 24
-    words[0] |= (column & 0xFF) << 16
-    words[0] |= (row & 0xFF) << 8
-    words[0] |= direction & 0x1
+    return _ipu_sync_batch(
+        column, row, direction, channel, column_num, row_num
+    ).tolist()
+
 
-    words[1] = (channel & 0xFF) << 24
-    words[1] |= (column_num & 0xFF) << 16
-    words[1] |= (row_num & 0xFF) << 8
-    assert not any(w is None for w in words)
-    return words
+def _ipu_write32_batch(column, row, address, value):
+    column, row, address, value = _broadcast(column, row, address, value)
+    words = np.empty(column.shape + (3,), dtype=np.uint64)
+    op_code = 2
+    words[..., 0] = (op_code & 0xFF) << 24
+    words[..., 0] |= (column & 0xFF) << 16
+    words[..., 0] |= (row & 0xFF) << 8
+    words[..., 1] = address
+    words[..., 2] = value
+    return words.astype(np.uint32).reshape(-1)
 
 
 def _ipu_write32(column, row, address, value):
-    words = [None] * 3
-    op_code = 2
-    words[0] = (op_code & 0xFF) << 24
-    words[0] |= (column & 0xFF) << 16
-    words[0] |= (row & 0xFF) << 8
-    words[1] = address
-    words[2] = value
-    assert not any(w is None for w in words)
-    return words
+    return _ipu_write32_batch(column, row, address, value).tolist()
+
+
+def _ipu_shimtile_push_queue_batch(
+    channel_dir, channel_index, column, bd_id, repeats=0
+):
+    channel_dir, channel_index, column, bd_id, repeats = np.broadcast_arrays(
+        *map(np.asarray, (channel_dir, channel_index, column, bd_id, repeats))
+    )
+    s2mm = channel_dir == int(DMAChannelDir.S2MM)
+    address = np.where(
+        s2mm,
+        XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE,
+        XAIEMLGBL_NOC_MODULE_DMA_MM2S_0_TASK_QUEUE,
+    ) + np.where(channel_index == 1, 0x8, 0)
+    value = (
+        bd_id.astype(np.uint64)
+        & XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE_START_BD_ID_MASK
+    )
+    value |= (repeats.astype(np.uint64) & 0xFF) << 16
+    # issue token
+    value |= np.where(
+        s2mm, XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE_ENABLE_TOKEN_ISSUE_MASK, 0
+    ).astype(np.uint64)
+
+    row = 0
+    return _ipu_write32_batch(column, row, address, value)
 
 
 def _ipu_shimtile_push_queue(channel_dir, channel_index, column, bd_id, repeats=0):
     if isinstance(channel_index, IntegerAttr):
         channel_index = int(channel_index)
-    if channel_dir == DMAChannelDir.MM2S:
-        address = XAIEMLGBL_NOC_MODULE_DMA_MM2S_0_TASK_QUEUE
-    else:
-        address = XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE
-    if channel_index == 1:
-        address += 0x8
-    value = bd_id & XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE_START_BD_ID_MASK
-    value |= (repeats & 0xFF) << 16
-    if channel_dir == DMAChannelDir.S2MM:
-        # issue token
-        value |= XAIEMLGBL_NOC_MODULE_DMA_S2MM_0_TASK_QUEUE_ENABLE_TOKEN_ISSUE_MASK
-
-    row = 0
-    return _ipu_write32(column, row, address, value)
+    return _ipu_shimtile_push_queue_batch(
+        int(channel_dir), channel_index, column, bd_id, repeats
+    ).tolist()
 
 
 # based on ExecWriteBdExtendShimTileOpt @ dpufw/src/include/RunInstOpt.h:666
-def _exec_write_bd_extend_shim_tile_opt(iptr, tensor_addr=None):
-    bd_id = iptr[0] & 0x0000000F
-    column = (iptr[0] & 0x00FF0000) >> 16
-    _addr_incr = iptr[1]
-    addr_low = iptr[3]
+def _exec_write_bd_extend_shim_tile_opt_batch(iptrs, tensor_addrs=None):
+    """`iptrs` holds the 10 words of one writebd_shimtile instruction per row."""
+    iptrs = np.asarray(iptrs, dtype=np.uint64).reshape(-1, 10)
+    bd_id = iptrs[:, 0] & 0x0000000F
+    column = (iptrs[:, 0] & 0x00FF0000) >> 16
+    addr_low = iptrs[:, 3]
     # upper 16 bits are for packets...
-    addr_high = iptr[4] & 0x0000FFFF
-    if tensor_addr is None:
-        tensor_addr = (addr_high << 32) | addr_low
-    tensor_addr += DDR_AIE_ADDR_OFFSET
-    t_word0 = tensor_addr & 0xFFFFFFFC
-    t_word1 = (iptr[4] & 0xFFFF0000) | (tensor_addr >> 32)
-
-    base_addr = SHIM_DMA_BD0_BASE_ADDR + (bd_id * SHIM_BD_OFFSET)
+    addr_high = iptrs[:, 4] & 0x0000FFFF
+    if tensor_addrs is None:
+        tensor_addrs = (addr_high << 32) | addr_low
+    tensor_addrs = np.broadcast_to(
+        np.asarray(tensor_addrs, dtype=np.uint64), bd_id.shape
+    )
+    tensor_addrs = tensor_addrs + DDR_AIE_ADDR_OFFSET
+    t_word0 = tensor_addrs & 0xFFFFFFFC
+    t_word1 = (iptrs[:, 4] & 0xFFFF0000) | (tensor_addrs >> 32)
+
+    base_addr = SHIM_DMA_BD0_BASE_ADDR + bd_id * SHIM_BD_OFFSET
+    values = np.stack(
+        [iptrs[:, 2], t_word0, t_word1, *(iptrs[:, i] for i in range(5, 10))],
+        axis=1,
+    )
     row = 0
-    words = [
-        *_ipu_write32(column, row, base_addr, iptr[2]),
-        *_ipu_write32(column, row, base_addr + 4, t_word0),
-        *_ipu_write32(column, row, base_addr + 8, t_word1),
-        *_ipu_write32(column, row, base_addr + 12, iptr[5]),
-        *_ipu_write32(column, row, base_addr + 16, iptr[6]),
-        *_ipu_write32(column, row, base_addr + 20, iptr[7]),
-        *_ipu_write32(column, row, base_addr + 24, iptr[8]),
-        *_ipu_write32(column, row, base_addr + 28, iptr[9]),
-    ]
-    return words
+    return _ipu_write32_batch(
+        column[:, None], row, base_addr[:, None] + 4 * np.arange(8), values
+    )
+
+
+def _exec_write_bd_extend_shim_tile_opt(iptr, tensor_addr=None):
+    return _exec_write_bd_extend_shim_tile_opt_batch(iptr, tensor_addr).tolist()
 
 
 # corresponds to ExecWriteBdExtendShimTileOpt
-def _ipu_writebd_shimtile(
+def _ipu_writebd_shimtile_batch(
     bd_id,
     buffer_length,
     buffer_offset=0,
@@ -204,18 +260,57 @@ def _ipu_writebd_shimtile(
     use_next_bd=0,
     data_width=32,
 ):
-    d2_stride -= 1
-    d1_stride -= 1
-    d0_stride -= 1
-    assert d2_stride >= 0 and d1_stride >= 0 and d0_stride >= 0
+    d1_size = _wrap_size(d1_size)
+    d0_size = _wrap_size(d0_size)
+    d2_stride, d1_stride, d0_stride = (
+        np.asarray(d) - 1 for d in (d2_stride, d1_stride, d0_stride)
+    )
+    assert (d2_stride >= 0).all() and (d1_stride >= 0).all() and (d0_stride >= 0).all()
     # byte offset
-    buffer_offset *= data_width // 8
-    # None means do not wrap which is 0 on the arch
-    if d1_size is None:
-        d1_size = 0
-    # None means do not wrap which is 0 on the arch
-    if d0_size is None:
-        d0_size = 0
+    buffer_offset = np.asarray(buffer_offset) * (data_width // 8)
+    (
+        bd_id,
+        buffer_length,
+        buffer_offset,
+        ddr_id,
+        column,
+        d2_stride,
+        d1_size,
+        d1_stride,
+        d0_size,
+        d0_stride,
+        iteration_size,
+        iteration_stride,
+        iteration_current,
+        lock_acq_enable,
+        lock_acq_id,
+        lock_acq_val,
+        lock_rel_id,
+        lock_rel_val,
+        next_bd,
+        use_next_bd,
+    ) = _broadcast(
+        bd_id,
+        buffer_length,
+        buffer_offset,
+        ddr_id,
+        column,
+        d2_stride,
+        d1_size,
+        d1_stride,
+        d0_size,
+        d0_stride,
+        iteration_size,
+        iteration_stride,
+        iteration_current,
+        lock_acq_enable,
+        lock_acq_id,
+        lock_acq_val,
+        lock_rel_id,
+        lock_rel_val,
+        next_bd,
+        use_next_bd,
+    )
 
     column_num = 1
     enable_packet = 0
@@ -224,54 +319,100 @@ def _ipu_writebd_shimtile(
     packet_type = 0
     valid_bd = 1
 
-    words = [None] * 10
+    words = np.zeros(bd_id.shape + (10,), dtype=np.uint64)
     op_code = 6
-    words[0] = (op_code & 0xFF) << 24
-    words[0] |= (column & 0xFF) << 16
-    words[0] |= (column_num & 0xFF) << 8
-    words[0] |= (ddr_id & 0xF) << 4
-    words[0] |= bd_id & 0xF
+    words[..., 0] = (op_code & 0xFF) << 24
+    words[..., 0] |= (column & 0xFF) << 16
+    words[..., 0] |= (column_num & 0xFF) << 8
+    words[..., 0] |= (ddr_id & 0xF) << 4
+    words[..., 0] |= bd_id & 0xF
 
     # TODO: Address Incr
-    words[1] = 0
-    words[2] = buffer_length
-    words[3] = buffer_offset
+    words[..., 1] = 0
+    words[..., 2] = buffer_length
+    words[..., 3] = buffer_offset
 
     # En Packet , OoO BD ID , Packet ID , Packet Type
-    words[4] = (enable_packet & 0x1) << 30
-    words[4] |= (out_of_order_id & 0x3F) << 24
-    words[4] |= (packet_id & 0x1F) << 19
-    words[4] |= (packet_type & 0x7) << 16
+    words[..., 4] = (enable_packet & 0x1) << 30
+    words[..., 4] |= (out_of_order_id & 0x3F) << 24
+    words[..., 4] |= (packet_id & 0x1F) << 19
+    words[..., 4] |= (packet_type & 0x7) << 16
 
     # TODO: Secure Access
-    words[5] = (d0_size & 0x3FF) << 20
-    words[5] |= d0_stride & 0xFFFFF
+    words[..., 5] = (d0_size & 0x3FF) << 20
+    words[..., 5] |= d0_stride & 0xFFFFF
 
     # burst length;
-    words[6] = 0x80000000
-    words[6] |= (d1_size & 0x3FF) << 20
-    words[6] |= d1_stride & 0xFFFFF
+    words[..., 6] = 0x80000000
+    words[..., 6] |= (d1_size & 0x3FF) << 20
+    words[..., 6] |= d1_stride & 0xFFFFF
 
     # TODO: SIMID, AxCache, AXQoS
-    words[7] = d2_stride & 0xFFFFF
+    words[..., 7] = d2_stride & 0xFFFFF
 
-    words[8] = (iteration_current & 0x3F) << 26
-    words[8] |= (iteration_size & 0x3F) << 20
-    words[8] |= iteration_stride & 0xFFFFF
+    words[..., 8] = (iteration_current & 0x3F) << 26
+    words[..., 8] |= (iteration_size & 0x3F) << 20
+    words[..., 8] |= iteration_stride & 0xFFFFF
 
     # TODO: TLAST Suppress
-    words[9] = (next_bd & 0xF) << 27
-    words[9] |= (use_next_bd & 0x1) << 26
-    words[9] |= (valid_bd & 0x1) << 25
-    words[9] |= (lock_rel_val & 0xEF) << 18
-    words[9] |= (lock_rel_id & 0xF) << 13
-    words[9] |= (lock_acq_enable & 0x1) << 12
-    words[9] |= (lock_acq_val & 0xEF) << 5
-    words[9] |= lock_acq_id & 0xF
+    words[..., 9] = (next_bd & 0xF) << 27
+    words[..., 9] |= (use_next_bd & 0x1) << 26
+    words[..., 9] |= (valid_bd & 0x1) << 25
+    words[..., 9] |= (lock_rel_val & 0xEF) << 18
+    words[..., 9] |= (lock_rel_id & 0xF) << 13
+    words[..., 9] |= (lock_acq_enable & 0x1) << 12
+    words[..., 9] |= (lock_acq_val & 0xEF) << 5
+    words[..., 9] |= lock_acq_id & 0xF
 
-    assert not any(w is None for w in words)
+    return words.astype(np.uint32).reshape(-1)
 
-    return words
+
+def _ipu_writebd_shimtile(
+    bd_id,
+    buffer_length,
+    buffer_offset=0,
+    ddr_id=0,
+    column=0,
+    d2_stride=1,
+    d1_size=None,
+    d1_stride=1,
+    d0_size=None,
+    d0_stride=1,
+    iteration_size=0,
+    iteration_stride=0,
+    iteration_current=0,
+    lock_acq_enable=0,
+    lock_acq_id=0,
+    lock_acq_val=0,
+    lock_rel_id=0,
+    lock_rel_val=0,
+    next_bd=0,
+    use_next_bd=0,
+    data_width=32,
+):
+    return _ipu_writebd_shimtile_batch(
+        bd_id,
+        buffer_length,
+        buffer_offset,
+        ddr_id,
+        column,
+        d2_stride,
+        d1_size,
+        d1_stride,
+        d0_size,
+        d0_stride,
+        iteration_size,
+        iteration_stride,
+        iteration_current,
+        lock_acq_enable,
+        lock_acq_id,
+        lock_acq_val,
+        lock_rel_id,
+        lock_rel_val,
+        next_bd,
+        use_next_bd,
+        data_width,
+    ).tolist()
 
 
 class ipu:
@@ -282,6 +423,14 @@ class ipu:
     get_prolog = _get_prolog
     _exec_write_bd_extend_shim_tile_opt = _exec_write_bd_extend_shim_tile_opt
 
+    write32_batch = _ipu_write32_batch
+    shimtile_push_queue_batch = _ipu_shimtile_push_queue_batch
+    writebd_shimtile_batch = _ipu_writebd_shimtile_batch
+    sync_batch = _ipu_sync_batch
+    _exec_write_bd_extend_shim_tile_opt_batch = (
+        _exec_write_bd_extend_shim_tile_opt_batch
+    )
+
 
 def process_bd(
     acq_lock,
@@ -0,0 +1,299 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+"""
+Static cost model of the runtime sequences of IPU devices.
+
+The ops of a runtime sequence (aiex.ipu.dma_memcpy_nd, aiex.ipu.sync and
+aiex.ipu.write32) are replayed on a simple model of the array controller and
+the shim DMAs, without hardware:
+
+- The controller issues the instructions one after the other, each taking
+  `instruction_ns`, and blocks at a sync until the transfers on its channel
+  are done, plus `sync_ns`.
+- Each shim DMA channel runs the tasks pushed on it in order. A transfer moves
+  its data in contiguous runs, which are split into AXI bursts of at most
+  `burst_bytes` bytes; every burst costs `burst_ns` on top of its bytes at
+  `bytes_per_ns`. A push blocks while `queue_depth` tasks are pending on the
+  channel.
+
+The default parameters are rough, and meant for comparing data movement
+schedules with each other rather than for predicting absolute times.
+
+Example:
+    for name, estimate in estimate_runtime_sequences(module).items():
+        print(name, estimate["total_ns"])
+        for step in estimate["critical_path"]:
+            print(" ", step)
+"""
+
+import math
+from collections import defaultdict, namedtuple
+
+DEFAULT_COST_MODEL = {
+    "instruction_ns": 20.0,
+    "sync_ns": 500.0,
+    "bytes_per_ns": 4.0,
+    "burst_bytes": 64,
+    "burst_ns": 4.0,
+    "queue_depth": 4,
+    "num_bds": 16,
+}
+
+S2MM = 0
+MM2S = 1
+
+# A shim DMA channel: (column, direction, channel index).
+Channel = namedtuple("Channel", ["col", "direction", "index"])
+Memcpy = namedtuple(
+    "Memcpy", ["op", "channel", "sizes", "strides", "element_bytes", "instructions"]
+)
+Sync = namedtuple("Sync", ["op", "columns", "direction", "index"])
+Write = namedtuple("Write", ["op"])
+
+# One step of the critical path: what happened, from when to when (in ns).
+Step = namedtuple("Step", ["kind", "op", "start", "end"])
+
+
+def contiguous_run(sizes, strides):
+    """The number of contiguous elements moved at a time by a transfer with
+    `sizes` and `strides` (innermost first, as in AIEDmaToIpu.cpp).
+
+    A stride of 0 leaves the dimension unused, so that it continues the
+    dimensions inside it. The outermost size is a repeat count, and every
+    repetition starts over.
+    """
+    run = sizes[0]
+    for size, stride in zip(sizes[1:3], strides[0:2]):
+        if stride not in (0, run):
+            break
+        run *= size
+    return run
+
+
+def transfer_cost(sizes, strides, element_bytes, model):
+    """The bytes moved by a transfer, the time it takes on its channel in ns,
+    and its burst efficiency: the share of the bytes of the bursts it issues
+    that carry data."""
+    total = math.prod(sizes) * element_bytes
+    if total == 0:
+        return 0, 0.0, 1.0
+    run = contiguous_run(sizes, strides) * element_bytes
+    runs = total // run
+    bursts = runs * math.ceil(run / model["burst_bytes"])
+    time = bursts * model["burst_ns"] + total / model["bytes_per_ns"]
+    return total, time, total / (bursts * model["burst_bytes"])
+
+
+def estimate_sequence(steps, **cost_model):
+    """Estimate the run time of a runtime sequence given as Memcpy, Sync and
+    Write steps, with the parameters of DEFAULT_COST_MODEL overridden by
+    `cost_model`.
+
+    Returns a dict with the predicted total time ("total_ns"), statistics per
+    channel ("channels"), the largest number of BDs in use per column
+    ("max_bds_in_flight") and the columns where that is more than their
+    `num_bds` BDs ("bd_pressure"), the time the controller spent blocked at
+    each sync and push ("stalls"), and the chain of steps that determine the
+    total time ("critical_path", a list of Step).
+    """
+    model = {**DEFAULT_COST_MODEL, **cost_model}
+    now = 0.0
+    # The step that the controller last waited for.
+    host = None
+    # Per channel, the pending tasks as (end, step) in order.
+    queues = defaultdict(list)
+    channels = defaultdict(
+        lambda: {"bytes": 0, "transfers": 0, "busy_ns": 0.0, "burst_bytes": 0}
+    )
+    # The transfers whose BDs are in use, per column.
+    in_flight = defaultdict(list)
+    max_bds = defaultdict(int)
+    stalls = []
+    # The step that each step (by id) waited for, for the critical path.
+    preds = {}
+
+    def issue(kind, op, cost):
+        nonlocal now, host
+        step = Step(kind, op, now, now + cost)
+        preds[id(step)] = host
+        host = step
+        now = step.end
+        return step
+
+    def block(kind, op, until):
+        nonlocal now, host
+        if until[0] > now:
+            stalls.append({"kind": kind, "op": op, "wait_ns": until[0] - now})
+            now = until[0]
+            host = until[1]
+
+    for s in steps:
+        if isinstance(s, Write):
+            issue("write32", s.op, model["instruction_ns"])
+        elif isinstance(s, Memcpy):
+            queue = queues[s.channel]
+            queue[:] = [t for t in queue if t[0] > now]
+            if len(queue) >= model["queue_depth"]:
+                # The push waits for a slot in the task queue.
+                block("push", s.op, queue[len(queue) - model["queue_depth"]])
+                queue[:] = [t for t in queue if t[0] > now]
+            issued = issue("issue", s.op, s.instructions * model["instruction_ns"])
+
+            nbytes, time, efficiency = transfer_cost(
+                s.sizes, s.strides, s.element_bytes, model
+            )
+            start, pred = issued.end, issued
+            if queue and queue[-1][0] > start:
+                start, pred = queue[-1]
+            transfer = Step("transfer", s.op, start, start + time)
+            preds[id(transfer)] = pred
+            queue.append((transfer.end, transfer))
+
+            stats = channels[s.channel]
+            stats["bytes"] += nbytes
+            stats["transfers"] += 1
+            stats["busy_ns"] += time
+            if efficiency:
+                stats["burst_bytes"] += nbytes / efficiency
+
+            bds = in_flight[s.channel.col]
+            bds.append(s.channel)
+            max_bds[s.channel.col] = max(max_bds[s.channel.col], len(bds))
+        elif isinstance(s, Sync):
+            ends = []
+            for col in s.columns:
+                channel = Channel(col, s.direction, s.index)
+                ends += queues.pop(channel, [])
+                # The BDs of the channel are free again.
+                in_flight[col] = [c for c in in_flight[col] if c != channel]
+            # As in aie-assign-ipu-bd-ids, the inputs are consumed once every
+            # output issued so far has been received.
+            if s.direction == S2MM and not any(
+                c.direction == S2MM for bds in in_flight.values() for c in bds
+            ):
+                for col in in_flight:
+                    in_flight[col] = [c for c in in_flight[col] if c.direction != MM2S]
+            if ends:
+                block("sync", s.op, max(ends, key=lambda t: t[0]))
+            issue("sync", s.op, model["instruction_ns"] + model["sync_ns"])
+
+    # The transfers that were not waited for still have to finish.
+    end = (now, host)
+    for queue in queues.values():
+        if queue and queue[-1][0] > end[0]:
+            end = queue[-1]
+
+    critical_path = []
+    step = end[1]
+    while step is not None:
+        critical_path.append(step)
+        step = preds[id(step)]
+    critical_path.reverse()
+
+    for stats in channels.values():
+        burst_bytes = stats.pop("burst_bytes")
+        stats["burst_efficiency"] = stats["bytes"] / burst_bytes if burst_bytes else 1.0
+
+    return {
+        "total_ns": end[0],
+        "channels": dict(channels),
+        "max_bds_in_flight": dict(max_bds),
+        "bd_pressure": sorted(
+            col for col, n in max_bds.items() if n > model["num_bds"]
+        ),
+        "stalls": stalls,
+        "critical_path": critical_path,
+    }
+
+
+def _int(attr):
+    from .ir import IntegerAttr
+
+    return IntegerAttr(attr).value
+
+
+def _mixed_values(static_values, dynamic_values):
+    """The values of a dynamic index list, whose dynamic values must come from
+    arith.constant ops."""
+    from .ir import ShapedType
+
+    dynamic = iter(dynamic_values)
+    values = []
+    for v in static_values:
+        if v == ShapedType.get_dynamic_size():
+            v = _int(next(dynamic).owner.attributes["value"])
+        values.append(v)
+    return values
+
+
+def runtime_sequence_steps(func_op, allocations):
+    """The Memcpy, Sync and Write steps of the runtime sequence `func_op`,
+    where `allocations` maps the symbols of the shim_dma_allocation ops of the
+    device to their channels."""
+    from .ir import FlatSymbolRefAttr, MemRefType
+
+    steps = []
+    for op in func_op.regions[0].blocks[0].operations:
+        op = op.operation
+        attrs = op.attributes
+        if op.name == "aiex.ipu.dma_memcpy_nd":
+            memcpy = op.opview
+            sizes = _mixed_values(memcpy.static_sizes, memcpy.sizes)
+            strides = _mixed_values(memcpy.static_strides, memcpy.strides)
+            memref = MemRefType(memcpy.memref.type)
+            steps.append(
+                Memcpy(
+                    op,
+                    allocations[FlatSymbolRefAttr(attrs["metadata"]).value],
+                    # Innermost first.
+                    sizes[::-1],
+                    strides[::-1],
+                    memref.element_type.width // 8,
+                    # writebd_shimtile and the push on the task queue.
+                    instructions=2,
+                )
+            )
+        elif op.name == "aiex.ipu.sync":
+            col = _int(attrs["column"])
+            steps.append(
+                Sync(
+                    op,
+                    range(col, col + _int(attrs["column_num"])),
+                    _int(attrs["direction"]),
+                    _int(attrs["channel"]),
+                )
+            )
+        elif op.name in ("aiex.ipu.write32", "aiex.ipu.rtp_write"):
+            steps.append(Write(op))
+    return steps
+
+
+def estimate_runtime_sequences(module, **cost_model):
+    """Estimate every runtime sequence (func.func) of the IPU devices of
+    `module` with estimate_sequence, keyed by the name of the function."""
+    from .ir import FlatSymbolRefAttr, StringAttr
+
+    estimates = {}
+    for device in module.body.operations:
+        if device.operation.name != "aie.device":
+            continue
+        allocations = {}
+        funcs = []
+        for op in device.regions[0].blocks[0].operations:
+            op = op.operation
+            if op.name == "aie.shim_dma_allocation":
+                name = FlatSymbolRefAttr(op.attributes["sym_name"]).value
+                allocations[name] = Channel(
+                    _int(op.attributes["col"]),
+                    _int(op.attributes["channel_dir"]),
+                    _int(op.attributes["channel_index"]),
+                )
+            elif op.name == "func.func" and len(op.regions[0].blocks):
+                funcs.append(op)
+        for f in funcs:
+            name = StringAttr(f.attributes["sym_name"]).value
+            estimates[name] = estimate_sequence(
+                runtime_sequence_steps(f, allocations), **cost_model
+            )
+    return estimates
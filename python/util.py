@@ -1,70 +1,126 @@
 # Copyright (C) 2022, Advanced Micro Devices, Inc.
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+import hashlib
 import inspect
+import json
 import multiprocessing
 import numbers
 import os
+import tempfile
+import time
 from collections import defaultdict
 from typing import List, Tuple, Dict, Set
 
 
+# Graphs built by build_graph, by array size and switchbox capacities.
+_graphs = {}
+
+
 def build_graph(max_cols, max_rows, target_model):
+    """The switchbox graph of the array, with an edge of the given capacity for
+    every bundle between neighbouring switchboxes that has connections.
+
+    The graph is built once per array size and target model; callers get a
+    copy, which they are free to modify.
+    """
     import networkx as nx
     from ._mlir_libs._aie_python_passes import WireBundle, Switchbox
 
-    DG = nx.DiGraph()
+    # One call for the capacities of all switchboxes.
+    sources, dests = target_model.get_switchbox_capacities(max_cols, max_rows)
+    capacities = [
+        sources[WireBundle.South],
+        dests[WireBundle.South],
+        sources[WireBundle.West],
+        dests[WireBundle.West],
+    ]
+    key = (max_cols, max_rows, *(c.tobytes() for c in capacities))
+    if key in _graphs:
+        return _graphs[key].copy()
+
+    source_south, dest_south, source_west, dest_west = (c.tolist() for c in capacities)
+    switchboxes = [
+        [Switchbox(c, r) for r in range(max_rows + 1)] for c in range(max_cols + 1)
+    ]
+    # Nodes and edges are added in the same order as ever, since the solvers
+    # number their variables in this order.
+    nodes = []
+    edges = []
     for c in range(max_cols + 1):
         for r in range(max_rows + 1):
-            this_switchbox = Switchbox(c, r)
-            DG.add_node(this_switchbox)
+            this_switchbox = switchboxes[c][r]
+            nodes.append(this_switchbox)
             if r > 0:
-                southern_neighbor = Switchbox(c, r - 1)
+                southern_neighbor = switchboxes[c][r - 1]
                 # Get the number of outgoing connections on the south side - outgoing
                 # because these correspond to rhs of a connect op.
-                if max_capacity := target_model.get_num_dest_switchbox_connections(
-                    c, r, WireBundle.South
-                ):
-                    DG.add_edge(
-                        this_switchbox,
-                        southern_neighbor,
-                        bundle=WireBundle.South,
-                        capacity=max_capacity,
+                if max_capacity := dest_south[c][r]:
+                    edges.append(
+                        (
+                            this_switchbox,
+                            southern_neighbor,
+                            {"bundle": WireBundle.South, "capacity": max_capacity},
+                        )
                     )
                 # Get the number of incoming connections on the south side - incoming
                 # because they correspond to connections on the southside that are then
                 # routed using internal connect ops through the switchbox (i.e., lhs of
                 # connect ops).
-                if max_capacity := target_model.get_num_source_switchbox_connections(
-                    c, r, WireBundle.South
-                ):
-                    DG.add_edge(
-                        southern_neighbor,
-                        this_switchbox,
-                        bundle=WireBundle.North,
-                        capacity=max_capacity,
+                if max_capacity := source_south[c][r]:
+                    edges.append(
+                        (
+                            southern_neighbor,
+                            this_switchbox,
+                            {"bundle": WireBundle.North, "capacity": max_capacity},
+                        )
                     )
             if c > 0:
-                western_neighbor = Switchbox(c - 1, r)
-                if max_capacity := target_model.get_num_source_switchbox_connections(
-                    c, r, WireBundle.West
-                ):
-                    DG.add_edge(
-                        western_neighbor,
-                        this_switchbox,
-                        bundle=WireBundle.East,
-                        capacity=max_capacity,
+                western_neighbor = switchboxes[c - 1][r]
+                if max_capacity := source_west[c][r]:
+                    edges.append(
+                        (
+                            western_neighbor,
+                            this_switchbox,
+                            {"bundle": WireBundle.East, "capacity": max_capacity},
+                        )
                     )
-                if max_capacity := target_model.get_num_dest_switchbox_connections(
-                    c, r, WireBundle.West
-                ):
-                    DG.add_edge(
-                        this_switchbox,
-                        western_neighbor,
-                        bundle=WireBundle.West,
-                        capacity=max_capacity,
+                if max_capacity := dest_west[c][r]:
+                    edges.append(
+                        (
+                            this_switchbox,
+                            western_neighbor,
+                            {"bundle": WireBundle.West, "capacity": max_capacity},
+                        )
                     )
 
-    return DG
+    DG = nx.DiGraph()
+    DG.add_nodes_from(nodes)
+    DG.add_edges_from(edges)
+    _graphs[key] = DG
+    return DG.copy()
+
+
+def _simple_path(edges, flow):
+    """The path of `flow` through the `edges` a solver picked for it, without
+    the cycles that flow conservation allows in solutions that are not
+    optimal (e.g., when the solver runs out of time)."""
+    src, tgt = flow[0].sb, flow[1].sb
+    successors = defaultdict(list)
+    for u, v in edges:
+        successors[u].append(v)
+    path = [src]
+    position = {src: 0}
+    while path[-1] != tgt:
+        node = successors[path[-1]].pop()
+        if node in position:
+            # Went around a cycle; drop it.
+            for dropped in path[position[node] + 1 :]:
+                del position[dropped]
+            del path[position[node] + 1 :]
+        else:
+            position[node] = len(path)
+            path.append(node)
+    return list(zip(path, path[1:]))
 
 
 def route_using_cp(
@@ -74,9 +130,38 @@ def route_using_cp(
     seed=42,
     num_workers=multiprocessing.cpu_count() // 2,
     timeout=600,
+    formulation="pairwise",
+    hint=None,
+    stats=None,
+    gap=None,
+    first_feasible=False,
+    on_solution=None,
 ):
+    """Route `flows` over `DG` with CP-SAT, minimizing total wire length plus
+    the number of pairs of flows that share an edge (or, with `min_edges`, the
+    number of edges used).
+
+    With the "pairwise" formulation the overlaps are counted with a product
+    variable for every pair of flows on every edge, so the model grows with
+    flows² x edges. The "linear" formulation minimizes the same objective
+    using only the per-edge demand, and stays linear in flows x edges.
+
+    `hint` maps flows to paths (such as those found by
+    `route_using_pathfinder`) that the solver starts its search from.
+
+    If `stats` is a dict, the size of the model and the outcome of the solve
+    are recorded in it.
+
+    The search stops at the first solution with `first_feasible`, or once
+    the relative gap between the best solution and the lower bound is below
+    `gap`. `on_solution(objective, bound, elapsed)` is called for every
+    improving solution.
+    """
     from ortools.sat.python import cp_model
 
+    if formulation not in {"pairwise", "linear"}:
+        raise ValueError(f"unknown CP formulation {formulation!r}")
+
     # Create model object
     model = cp_model.CpModel()
     solver = cp_model.CpSolver()
@@ -84,6 +169,17 @@ def route_using_cp(
     solver.parameters.random_seed = seed
     solver.parameters.num_workers = num_workers
     solver.parameters.max_time_in_seconds = timeout
+    if gap is not None:
+        solver.parameters.relative_gap_limit = gap
+
+    class SolutionCallback(cp_model.CpSolverSolutionCallback):
+        def on_solution_callback(self):
+            if on_solution:
+                on_solution(
+                    self.ObjectiveValue(), self.BestObjectiveBound(), self.WallTime()
+                )
+            if first_feasible:
+                self.StopSearch()
 
     # Create variable for each edge, for each path
     flow_vars = {
@@ -91,6 +187,12 @@ def route_using_cp(
     }
     flat_flow_vars = list(flow_vars.values())
 
+    if hint:
+        for flow, path in hint.items():
+            path = set(path)
+            for e, var in flow_vars[flow].items():
+                model.AddHint(var, int(e in path))
+
     # Add flow-balance constraints at all nodes (besides sources and targets)
     for (src, tgt), flow_var in zip(flows, flat_flow_vars):
         src, tgt = src.sb, tgt.sb
@@ -116,9 +218,16 @@ def route_using_cp(
     total_demand = {
         (i, j): model.NewIntVar(0, len(flat_flow_vars), "") for i, j in DG.edges
     }
-    overlapping_demands = {
-        (i, j): model.NewIntVar(0, len(flat_flow_vars), "") for i, j in DG.edges
-    }
+    if formulation == "linear":
+        # At most capacity flows share an edge.
+        overlapping_demands = {
+            (i, j): model.NewIntVar(0, c * (c - 1) // 2, "")
+            for i, j, c in DG.edges(data="capacity")
+        }
+    else:
+        overlapping_demands = {
+            (i, j): model.NewIntVar(0, len(flat_flow_vars), "") for i, j in DG.edges
+        }
     used_edges = {(i, j): model.NewIntVar(0, 1, "") for i, j in DG.edges}
 
     for i, j, attrs in DG.edges(data=True):
@@ -128,6 +237,16 @@ def route_using_cp(
         if min_edges:
             # counts whether an edge is used by any flow
             model.AddMaxEquality(used_edges[i, j], [f[i, j] for f in flat_flow_vars])
+        elif formulation == "linear":
+            # d flows on an edge overlap in d * (d - 1) / 2 pairs. This is
+            # convex in d, so for integer d it is the largest of the tangents
+            # k * d - k * (k + 1) / 2, and minimizing the objective pulls
+            # overlapping_demands down onto it.
+            for k in range(1, attrs["capacity"]):
+                model.Add(
+                    overlapping_demands[i, j]
+                    >= k * total_demand[i, j] - k * (k + 1) // 2
+                )
         else:
             # counts the number of overlapping flows
             overlapping_flows = {}
@@ -163,16 +282,35 @@ def route_using_cp(
         obj += sum(overlapping_demands[i, j] for i, j in DG.edges)
     model.Minimize(obj)
 
-    status = solver.Solve(model)
+    if on_solution or first_feasible:
+        status = solver.Solve(model, SolutionCallback())
+    else:
+        status = solver.Solve(model)
+    if stats is not None:
+        proto = model.Proto()
+        stats.update(
+            variables=len(proto.variables),
+            constraints=len(proto.constraints),
+            status=solver.StatusName(status),
+            # Anything short of optimal means the solver ran out of time,
+            # unless it was asked to stop early.
+            timed_out=status not in {cp_model.OPTIMAL, cp_model.INFEASIBLE}
+            and not (first_feasible and status == cp_model.FEASIBLE),
+            objective=solver.ObjectiveValue(),
+            best_bound=solver.BestObjectiveBound(),
+        )
     if status in {cp_model.OPTIMAL, cp_model.FEASIBLE}:
         flow_paths = {}
         for flow, flow_varss in flow_vars.items():
-            flow_paths[flow] = [
-                # solver.Value > 0.5 means the edge is used
-                (i, j)
-                for i, j in DG.edges
-                if solver.Value(flow_varss[i, j]) > 0.5
-            ]
+            flow_paths[flow] = _simple_path(
+                [
+                    # solver.Value > 0.5 means the edge is used
+                    (i, j)
+                    for i, j in DG.edges
+                    if solver.Value(flow_varss[i, j]) > 0.5
+                ],
+                flow,
+            )
 
         return flow_paths
 
@@ -183,12 +321,21 @@ def route_using_ilp(
     DG,
     flows,
     timeout=600,
+    stats=None,
+    gap=None,
+    first_feasible=False,
+    on_solution=None,
 ):
+    """Like `route_using_cp`, with Gurobi."""
     import gurobipy as gp
     from gurobipy import GRB
 
     m = gp.Model()
     m.setParam("TimeLimit", timeout)
+    if gap is not None:
+        m.setParam("MIPGap", gap)
+    if first_feasible:
+        m.setParam("SolutionLimit", 1)
 
     flow_vars = {
         flow: m.addVars(DG.edges, vtype=GRB.BINARY, name="flow") for flow in flows
@@ -241,19 +388,359 @@ def route_using_ilp(
     )
 
     # Solve
-    m.optimize()
+    def callback(model, where):
+        if where == GRB.Callback.MIPSOL:
+            on_solution(
+                model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                model.cbGet(GRB.Callback.MIPSOL_OBJBND),
+                model.cbGet(GRB.Callback.RUNTIME),
+            )
+
+    m.optimize(callback if on_solution else None)
 
+    if stats is not None:
+        stats.update(
+            variables=m.NumVars,
+            constraints=m.NumConstrs,
+            status=m.Status,
+            timed_out=m.Status == GRB.TIME_LIMIT,
+        )
     if m.Status == GRB.INFEASIBLE:
         raise RuntimeError("Couldn't route.")
 
     flow_paths = {}
     for flow, flow_varss in flow_vars.items():
         # x > 0.5 means the edge is used
-        flow_paths[flow] = [(i, j) for i, j in DG.edges if flow_varss[i, j].x > 0.5]
+        flow_paths[flow] = _simple_path(
+            [(i, j) for i, j in DG.edges if flow_varss[i, j].x > 0.5], flow
+        )
+
+    return flow_paths
+
+
+def route_using_pathfinder(
+    DG,
+    flows,
+    max_iterations=100,
+    present_factor=0.5,
+    present_factor_growth=1.5,
+    history_factor=1.0,
+    timeout=600,
+    stats=None,
+):
+    """Route `flows` over `DG` by negotiated congestion (PathFinder, McMurchie
+    and Ebeling).
+
+    Flows with the same source form a net, whose paths share channels like
+    they do in the routing solution. Every iteration rips up and reroutes each
+    net along the cheapest paths, where using an edge costs more the more it
+    is overused now (present congestion) and has been overused in earlier
+    iterations (history). The present congestion penalty grows with every
+    iteration, until the nets have negotiated away all overuse.
+
+    If `stats` is a dict, the number of iterations is recorded in it.
+    """
+    import networkx as nx
+    import numpy as np
+
+    start = time.time()
+    edges = list(DG.edges)
+    index = {e: k for k, e in enumerate(edges)}
+    capacity = np.array([DG.edges[e]["capacity"] for e in edges])
+    occupancy = np.zeros(len(edges), dtype=int)
+    history = np.ones(len(edges))
+
+    nets = defaultdict(list)
+    for flow in flows:
+        nets[flow[0]].append(flow)
+    net_edges = {}
+    flow_paths = {}
+
+    if stats is None:
+        stats = {}
+    stats.update(iterations=0, timed_out=False)
+    for _ in range(max_iterations):
+        stats["iterations"] += 1
+        for src, net_flows in nets.items():
+            if src in net_edges:
+                occupancy[net_edges[src]] -= 1
+            overuse = np.maximum(occupancy + 1 - capacity, 0)
+            cost = history * (1 + present_factor * overuse)
+            tree = set()
+            for flow in net_flows:
+                # Edges already taken by the net are free to share.
+                cost[list(tree)] = 0
+                try:
+                    path = nx.dijkstra_path(
+                        DG,
+                        src.sb,
+                        flow[1].sb,
+                        weight=lambda u, v, _: cost[index[u, v]],
+                    )
+                except nx.NetworkXNoPath:
+                    raise RuntimeError("Couldn't route.")
+                flow_paths[flow] = list(zip(path, path[1:]))
+                tree.update(index[e] for e in flow_paths[flow])
+            net_edges[src] = list(tree)
+            occupancy[net_edges[src]] += 1
+
+        overuse = np.maximum(occupancy - capacity, 0)
+        if not overuse.any():
+            return flow_paths
+        if time.time() - start > timeout:
+            stats["timed_out"] = True
+            break
+        history += history_factor * overuse
+        present_factor *= present_factor_growth
+
+    raise RuntimeError("Couldn't route.")
+
+
+def route(
+    DG,
+    flows,
+    backend,
+    timeout=600,
+    warm_start=False,
+    num_workers=10,
+    hint=None,
+    gap=None,
+    first_feasible=False,
+    on_solution=None,
+    stats=None,
+):
+    """Route `flows` over `DG` with one of the ROUTER_BACKENDS. The CP-SAT
+    backends start from the paths in `hint`, if given. See `route_using_cp`
+    for `gap`, `first_feasible` and `on_solution`, which pathfinder ignores as
+    it stops at the first legal routing anyway. `stats` is passed on to the
+    backend."""
+    anytime = dict(gap=gap, first_feasible=first_feasible, on_solution=on_solution)
+    if backend == "ilp":
+        return route_using_ilp(DG, flows, timeout=timeout, stats=stats, **anytime)
+    if backend == "pathfinder":
+        return route_using_pathfinder(DG, flows, timeout=timeout, stats=stats)
+
+    if hint is None and warm_start:
+        start = time.time()
+        try:
+            hint = route_using_pathfinder(DG, flows, timeout=timeout)
+        except RuntimeError:
+            # CP-SAT may still find a routing the heuristic can't.
+            pass
+        # The warm start comes out of the same time budget.
+        timeout = max(timeout - (time.time() - start), 0)
+    return route_using_cp(
+        DG,
+        flows,
+        num_workers=num_workers,
+        timeout=timeout,
+        formulation="linear" if backend == "cp_linear" else "pairwise",
+        hint=hint,
+        stats=stats,
+        **anytime,
+    )
+
 
+def partition_flows(flows, margin=1):
+    """Group `flows` into independent regions of whole columns.
+
+    Each flow covers the columns between its source and its target, widened by
+    `margin` columns on either side to leave room for detours. Flows whose
+    columns overlap end up in the same region. Returns a list of
+    (first_col, last_col, flows) in column order.
+    """
+    spans = sorted(
+        (
+            min(src.sb.col, tgt.sb.col) - margin,
+            max(src.sb.col, tgt.sb.col) + margin,
+            i,
+        )
+        for i, (src, tgt) in enumerate(flows)
+    )
+    regions = []
+    for first, last, i in spans:
+        if regions and first <= regions[-1][1]:
+            regions[-1][1] = max(regions[-1][1], last)
+            regions[-1][2].append(flows[i])
+        else:
+            regions.append([first, last, [flows[i]]])
+    return [tuple(region) for region in regions]
+
+
+def route_by_region(DG, flows, backend, margin=1, stats=None, **options):
+    """Like `route` (which takes the same `options`), but solves the
+    independent column regions found by `partition_flows` concurrently, each
+    restricted to its own columns. Falls back to routing the whole device if a
+    region can't be routed on its own.
+
+    The regions are solved in threads of this process, which overlap as the
+    solvers release the GIL, splitting the CP-SAT workers between them. (A
+    process pool would re-import the caller's __main__ in every worker.)
+    `on_solution` is only called for the fallback, as the objectives of the
+    regions can't be told apart. If `stats` is a dict, the number of regions
+    routed separately is recorded in it, and "timed_out" is set if any of them
+    ran out of time.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if stats is None:
+        stats = {}
+    regions = partition_flows(flows, margin)
+    if len(regions) < 2:
+        stats["regions"] = 1
+        return route(DG, flows, backend, stats=stats, **options)
+
+    region_options = {k: v for k, v in options.items() if k != "on_solution"}
+    region_options["num_workers"] = max(1, multiprocessing.cpu_count() // len(regions))
+    region_stats = [{} for _ in regions]
+
+    def route_region(region, region_stats):
+        first, last, region_flows = region
+        region_DG = DG.subgraph(n for n in DG.nodes if first <= n.col <= last).copy()
+        return route(
+            region_DG, region_flows, backend, stats=region_stats, **region_options
+        )
+
+    try:
+        with ThreadPoolExecutor(len(regions)) as pool:
+            results = list(pool.map(route_region, regions, region_stats))
+    except RuntimeError:
+        stats.clear()
+        stats["regions"] = 1
+        return route(DG, flows, backend, stats=stats, **options)
+
+    stats["regions"] = len(regions)
+    stats["timed_out"] = any(s.get("timed_out", False) for s in region_stats)
+    flow_paths = {}
+    for paths in results:
+        flow_paths.update(paths)
     return flow_paths
 
 
+def _end_point_key(p):
+    return [p.sb.col, p.sb.row, int(p.port.bundle), p.port.channel]
+
+
+def _hash_json(value):
+    return hashlib.sha256(json.dumps(value).encode()).hexdigest()
+
+
+class RoutingCache:
+    """Paths found for earlier routing problems, kept on disk in `cache_dir`.
+
+    Entries are grouped by device: the array size, the capacities left on
+    every edge, the channels taken by fixed connections and the backend.
+    Within a device, an entry is found by its set of flows. When there is no
+    entry for the exact set of flows, the largest entry whose flows are all
+    part of it gives paths to use as a hint.
+
+    Every device keeps at most `max_entries` entries, evicting the least
+    recently used ones, which also bounds the entries read for a hint.
+    """
+
+    # Bump this whenever the layout of the entries changes.
+    VERSION = 1
+
+    def __init__(self, cache_dir, max_entries=64):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def device_dir(self, max_col, max_row, DG, used_channels, backend):
+        capacities = sorted(
+            [u.col, u.row, v.col, v.row, int(bundle), capacity]
+            for u, v, bundle, capacity in (
+                (u, v, e["bundle"], e["capacity"]) for u, v, e in DG.edges(data=True)
+            )
+        )
+        fixed = sorted(
+            [sb.col, sb.row, int(bundle), sorted(channels)]
+            for (sb, bundle), channels in used_channels.items()
+            if channels
+        )
+        key = _hash_json([self.VERSION, backend, max_col, max_row, capacities, fixed])
+        return os.path.join(self.cache_dir, "router", key)
+
+    def _load(self, path, DG, flows_by_key):
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        nodes = {(n.col, n.row): n for n in DG.nodes}
+        flow_paths = {}
+        for key, path in zip(entry["flows"], entry["paths"]):
+            flow = flows_by_key.get(tuple(map(tuple, key)))
+            if flow is None:
+                return None
+            flow_paths[flow] = [
+                (nodes[uc, ur], nodes[vc, vr]) for uc, ur, vc, vr in path
+            ]
+        return flow_paths
+
+    def lookup(self, device_dir, DG, flows):
+        """Returns the cached paths for `flows` and None, or None and a hint
+        for some of the flows (which may be None too)."""
+        flows_by_key = {
+            (tuple(_end_point_key(src)), tuple(_end_point_key(tgt))): (src, tgt)
+            for src, tgt in flows
+        }
+        name = _hash_json(sorted(map(list, flows_by_key))) + ".json"
+        flow_paths = self._load(os.path.join(device_dir, name), DG, flows_by_key)
+        if flow_paths is not None:
+            # Mark the entry as recently used.
+            try:
+                os.utime(os.path.join(device_dir, name))
+            except OSError:
+                pass
+            return flow_paths, None
+
+        try:
+            entries = os.listdir(device_dir)
+        except OSError:
+            return None, None
+        hint = None
+        for entry in entries:
+            if not entry.endswith(".json"):
+                continue
+            # Entries for other sets of flows fail to load.
+            paths = self._load(os.path.join(device_dir, entry), DG, flows_by_key)
+            if paths is not None and len(paths) > len(hint or ()):
+                hint = paths
+        return None, hint
+
+    def store(self, device_dir, flow_paths):
+        flows = [[_end_point_key(src), _end_point_key(tgt)] for src, tgt in flow_paths]
+        paths = [
+            [[u.col, u.row, v.col, v.row] for u, v in path]
+            for path in flow_paths.values()
+        ]
+        name = _hash_json(sorted(flows)) + ".json"
+        os.makedirs(device_dir, exist_ok=True)
+        # Write a private file and rename it into place, as other processes
+        # may be routing the same design.
+        fd, tmp = tempfile.mkstemp(prefix=".staging-", dir=device_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"flows": flows, "paths": paths}, f)
+        os.replace(tmp, os.path.join(device_dir, name))
+        self._evict(device_dir)
+
+    def _evict(self, device_dir):
+        entries = []
+        for entry in os.scandir(device_dir):
+            if entry.name.endswith(".json"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+        entries.sort()
+        for _, path in entries[: max(len(entries) - self.max_entries, 0)]:
+            # Another process may have evicted it already.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
 def rgb2hex(r, g, b, a):
     return f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}{int(a * 255):02x}"
 
@@ -305,28 +792,31 @@ def get_routing_solution(DG, flow_paths, used_channels):
         get_connecting_bundle,
     )
 
-    def get_pred(path, curr_sb):
-        path_subgraph = DG.edge_subgraph(path)
-        pred_sb = list(path_subgraph.predecessors(curr_sb))
-        assert len(pred_sb) == 1
-        pred_sb = pred_sb[0]
-        incoming_edge = pred_sb, curr_sb
-        # outgoing bundle of pred, corresponding to rhs of connect op
-        outgoing_bundle = path_subgraph.get_edge_data(*incoming_edge)["bundle"]
-        return pred_sb, outgoing_bundle
+    def get_preds(path):
+        # For every switchbox on the path, its predecessor and the outgoing
+        # bundle of the predecessor (corresponding to rhs of connect op).
+        preds = {v: (u, DG.edges[u, v]["bundle"]) for u, v in path}
+        assert len(preds) == len(path)
+        return preds
 
     flow_dsts = defaultdict(list)
     for flow, path in flow_paths.items():
         src, tgt = flow
-        flow_dsts[src].append((tgt, path))
+        flow_dsts[src].append((tgt, get_preds(path)))
         # endpoints function as "fixed connections" i.e., already
         # assigned channels on some bundle
         used_channels[tgt.sb, tgt.port.bundle].add(tgt.port.channel)
 
+    # The channels in use on each bundle, as a bitset.
+    used_masks = {}
+
     def get_next_avail_channel(sb, bundle):
-        i = 0
-        while i in used_channels[sb, bundle]:
-            i += 1
+        mask = used_masks.get((sb, bundle))
+        if mask is None:
+            mask = sum(1 << c for c in used_channels[sb, bundle])
+        # lowest clear bit
+        i = (~mask & (mask + 1)).bit_length() - 1
+        used_masks[sb, bundle] = mask | (1 << i)
         used_channels[sb, bundle].add(i)
         return i
 
@@ -336,13 +826,12 @@ def get_routing_solution(DG, flow_paths, used_channels):
         processed = {src.sb}
 
         # Trace backwards until a vertex already processed is reached
-        for end_point, path in dsts:
+        for end_point, preds in dsts:
             curr_sb = end_point.sb
-            pred_sb, _ = get_pred(path, curr_sb)
             switch_settings[curr_sb].dsts.add(end_point.port)
 
             while curr_sb not in processed:
-                pred_sb, outgoing_bundle = get_pred(path, curr_sb)
+                pred_sb, outgoing_bundle = preds[curr_sb]
                 # connecting bundle on curr, lhs of connect op
                 incoming_bundle = get_connecting_bundle(outgoing_bundle)
                 # next avail channel on outgoing side on pred
@@ -377,11 +866,36 @@ def pythonize_bool(value):
     raise ValueError(f'"{value}" is not a valid boolean')
 
 
+# The routing backends Router can use, selected with its `backend` argument or
+# the ROUTER_BACKEND environment variable:
+#   cp: CP-SAT, counting overlaps with a variable per pair of flows per edge;
+#   cp_linear: CP-SAT, with the same objective computed from per-edge demands;
+#   ilp: Gurobi (also selected by use_gurobi or ROUTER_USE_GUROBI);
+#   pathfinder: negotiated congestion, a fast heuristic.
+# With `warm_start` (or ROUTER_WARM_START), the CP-SAT backends start from the
+# paths found by pathfinder. With `decompose` (or ROUTER_DECOMPOSE), flows in
+# disjoint column ranges are routed as separate problems, in parallel. With a
+# `cache_dir` (or ROUTER_CACHE_DIR), routed paths are kept in a RoutingCache.
+# The exact backends can trade quality for time: they stop at the first legal
+# routing with `first_feasible` (or ROUTER_FIRST_FEASIBLE), or once within a
+# relative `gap` (or ROUTER_GAP) of optimal, and report every improving
+# solution to `on_solution(objective, bound, elapsed)`. The statistics of the
+# last solve of find_paths (see route_using_cp) are kept in `stats`.
+ROUTER_BACKENDS = ("cp", "cp_linear", "ilp", "pathfinder")
+
+
 class Router:
     max_col: int
     max_row: int
     timeout: int
     use_gurobi: bool = False
+    backend: str
+    warm_start: bool = False
+    decompose: bool = False
+    cache_dir: str = None
+    gap: float = None
+    first_feasible: bool = False
+    stats: dict
     # Don't use actual binding here to prevent a blow up since class bodies are executed
     # at module load time.
     target_model: "AIETargetModel"
@@ -389,12 +903,47 @@ class Router:
     used_channels: Dict[Tuple["Switchbox", "Switchbox"], Set[int]]
     routing_solution: Dict["PathEndPoint", "SwitchSettings"]
 
-    def __init__(self, use_gurobi=False, timeout=600):
+    def __init__(
+        self,
+        use_gurobi=False,
+        timeout=600,
+        backend=None,
+        warm_start=False,
+        decompose=False,
+        cache_dir=None,
+        gap=None,
+        first_feasible=False,
+        on_solution=None,
+    ):
         self.flows = []
         self.routing_solution = None
+        self.flow_paths = None
+        self.stats = {}
         self.use_gurobi = use_gurobi or pythonize_bool(
             os.getenv("ROUTER_USE_GUROBI", "False")
         )
+        if backend is None:
+            backend = "ilp" if self.use_gurobi else os.getenv("ROUTER_BACKEND", "cp")
+        if backend not in ROUTER_BACKENDS:
+            raise ValueError(
+                f"unknown router backend {backend!r}, expected one of {ROUTER_BACKENDS}"
+            )
+        self.backend = backend
+        self.use_gurobi = backend == "ilp"
+        self.warm_start = warm_start or pythonize_bool(
+            os.getenv("ROUTER_WARM_START", "False")
+        )
+        self.decompose = decompose or pythonize_bool(
+            os.getenv("ROUTER_DECOMPOSE", "False")
+        )
+        self.cache_dir = cache_dir or os.getenv("ROUTER_CACHE_DIR")
+        if gap is None and os.getenv("ROUTER_GAP"):
+            gap = float(os.getenv("ROUTER_GAP"))
+        self.gap = gap
+        self.first_feasible = first_feasible or pythonize_bool(
+            os.getenv("ROUTER_FIRST_FEASIBLE", "False")
+        )
+        self.on_solution = on_solution
         self.timeout = timeout
         self.used_channels = defaultdict(set)
 
@@ -403,6 +952,13 @@ class Router:
         self.max_row = max_row
         self.target_model = target_model
         self.DG = build_graph(self.max_col, self.max_row, self.target_model)
+        # The edges by (col, row, bundle, direction) of the tile at either end,
+        # i.e., the outgoing edges by their source and the incoming edges by
+        # their target.
+        self.edge_index = {}
+        for u, v, e in self.DG.edges(data=True):
+            self.edge_index[u.col, u.row, e["bundle"], "out"] = u, v, e
+            self.edge_index[v.col, v.row, e["bundle"], "in"] = u, v, e
 
     def add_flow(self, src: "PathEndPoint", tgt: "PathEndPoint"):
         self.flows.append((src, tgt))
@@ -416,52 +972,171 @@ class Router:
 
         # find the correct Channel and indicate the fixed direction
 
-        # outgoing connection
-        matching_outgoing_edges = [
-            (u, v, e)
-            for u, v, e in self.DG.edges(data=True)
-            if e["bundle"] == rhs_port.bundle
-            and u == tileid  # i.e., this tile is the source
-        ]
-        if len(matching_outgoing_edges):
-            assert len(matching_outgoing_edges) == 1
-            u, v, e = matching_outgoing_edges[0]
+        # outgoing connection, i.e., this tile is the source
+        outgoing_edge = self.edge_index.get(
+            (tileid.col, tileid.row, rhs_port.bundle, "out")
+        )
+        if outgoing_edge:
+            u, v, e = outgoing_edge
             e["capacity"] -= 1
             self.used_channels[u, rhs_port.bundle].add(rhs_port.channel)
             return True
 
-        # incoming connection
-        matching_incoming_edges = [
-            (u, v, e)
-            for u, v, e in self.DG.edges(data=True)
-            if e["bundle"] == get_connecting_bundle(lhs_port.bundle)
-            and v == tileid  # i.e., this tile is the target
-        ]
-        if len(matching_incoming_edges):
-            assert len(matching_incoming_edges) == 1
-            u, v, e = matching_incoming_edges[0]
+        # incoming connection, i.e., this tile is the target
+        incoming_edge = self.edge_index.get(
+            (tileid.col, tileid.row, get_connecting_bundle(lhs_port.bundle), "in")
+        )
+        if incoming_edge:
+            u, v, e = incoming_edge
             e["capacity"] -= 1
             # this is where the assumption that connection ports across
             # tiles use the same channel comes in
-            assert e["bundle"] == get_connecting_bundle(lhs_port.bundle)
             self.used_channels[u, e["bundle"]].add(lhs_port.channel)
             return True
 
         return False
 
+    def add_fixed_connections(self, connect_ops):
+        """Applies `add_fixed_connection` to every op in `connect_ops` and
+        returns its results."""
+        return [self.add_fixed_connection(op) for op in connect_ops]
+
+    def _route_options(self):
+        return dict(
+            timeout=self.timeout,
+            warm_start=self.warm_start,
+            gap=self.gap,
+            first_feasible=self.first_feasible,
+            on_solution=self.on_solution,
+        )
+
+    def _set_flow_paths(self, flow_paths):
+        self.flow_paths = flow_paths
+        # Channels are assigned from scratch, starting from those taken by the
+        # fixed connections.
+        self.used_channels = defaultdict(
+            set, {k: set(v) for k, v in self.fixed_channels.items()}
+        )
+        self.routing_solution = get_routing_solution(
+            self.DG, flow_paths, self.used_channels
+        )
+
     def find_paths(self):
         if self.routing_solution is None:
-            if self.use_gurobi:
-                flow_paths = route_using_ilp(self.DG, self.flows, timeout=self.timeout)
-            else:
-                flow_paths = route_using_cp(
-                    self.DG, self.flows, num_workers=10, timeout=self.timeout
+            self.fixed_channels = {k: set(v) for k, v in self.used_channels.items()}
+            flow_paths = hint = cache = None
+            if self.cache_dir:
+                cache = RoutingCache(self.cache_dir)
+                device_dir = cache.device_dir(
+                    self.max_col,
+                    self.max_row,
+                    self.DG,
+                    self.used_channels,
+                    self.backend,
                 )
+                flow_paths, hint = cache.lookup(device_dir, self.DG, self.flows)
+
+            self.stats = {}
+            if flow_paths is None:
+                options = self._route_options()
+                if self.decompose:
+                    flow_paths = route_by_region(
+                        self.DG, self.flows, self.backend, stats=self.stats, **options
+                    )
+                else:
+                    flow_paths = route(
+                        self.DG,
+                        self.flows,
+                        self.backend,
+                        hint=hint,
+                        stats=self.stats,
+                        **options,
+                    )
+                # Don't let a routing that was cut short stand in for the
+                # solver's best.
+                if (
+                    cache
+                    and self.gap is None
+                    and not self.first_feasible
+                    and not self.stats.get("timed_out", False)
+                ):
+                    cache.store(device_dir, flow_paths)
 
-            self.routing_solution = get_routing_solution(
-                self.DG, flow_paths, self.used_channels
-            )
+            self._set_flow_paths(flow_paths)
+
+        return {k: dict(v) for k, v in self.routing_solution.items()}
+
+    def reroute(self, add=(), remove=(), margin=1):
+        """Updates the routing found by `find_paths` for the flows in `add` and
+        `remove`, and returns it like `find_paths` does.
+
+        Only the added flows and the flows whose paths pass through the
+        bounding box of the added flows' end points, widened by `margin`
+        switchboxes, are routed again; the paths of all other flows are kept
+        and their channels are taken out of the graph. Flows from the same
+        source as a flow that is routed again are routed again with it, as they
+        share its channels. If the flows can't be routed around the kept paths,
+        everything is routed from scratch. `stats` records the number of flows
+        that were routed again and whether that was all of them.
+        """
+        remove = set(remove)
+        self.flows = [flow for flow in self.flows if flow not in remove] + list(add)
+        if self.flow_paths is None:
+            return self.find_paths()
+
+        self.stats = {"rerouted": 0, "full_reroute": False}
+
+        flow_paths = {
+            flow: path for flow, path in self.flow_paths.items() if flow not in remove
+        }
+        if add:
+            cols = [p.sb.col for flow in add for p in flow]
+            rows = [p.sb.row for flow in add for p in flow]
+
+            def near(sb):
+                return (
+                    min(cols) - margin <= sb.col <= max(cols) + margin
+                    and min(rows) - margin <= sb.row <= max(rows) + margin
+                )
+
+            ripped = [
+                flow
+                for flow, path in flow_paths.items()
+                if any(near(u) or near(v) for u, v in path)
+            ]
+            # Flows from the same source share their channels, so they are
+            # routed together.
+            sources = {src for src, _ in ripped} | {src for src, _ in add}
+            ripped += [
+                flow for flow in flow_paths if flow[0] in sources and flow not in ripped
+            ]
+            for flow in ripped:
+                del flow_paths[flow]
+
+            nets = defaultdict(set)
+            for (src, _), path in flow_paths.items():
+                nets[src].update(path)
+            DG = self.DG.copy()
+            for edges in nets.values():
+                for e in edges:
+                    DG.edges[e]["capacity"] -= 1
+
+            options = self._route_options()
+            flows = ripped + list(add)
+            try:
+                flow_paths.update(
+                    route(DG, flows, self.backend, stats=self.stats, **options)
+                )
+                self.stats["rerouted"] = len(flows)
+            except RuntimeError:
+                self.stats = {}
+                flow_paths = route(
+                    self.DG, self.flows, self.backend, stats=self.stats, **options
+                )
+                self.stats["rerouted"] = len(self.flows)
+                self.stats["full_reroute"] = True
 
+        self._set_flow_paths(flow_paths)
         return {k: dict(v) for k, v in self.routing_solution.items()}
 
     def is_legal(self):
@@ -0,0 +1,14 @@
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// REQUIRES: cdo_direct_generation
+//
+// RUN: not aie-translate --aie-generate-cdo --cdo-section=init,elf %s 2>&1 | FileCheck %s
+
+// CHECK: error: unknown CDO section 'elf'; expected one of error_handling, elfs, init, enable
+
+module {
+  aie.device(ipu) {
+    %tile_0_2 = aie.tile(0, 2)
+  }
+}
@@ -0,0 +1,30 @@
+//===- ipu_instgen_binary.mlir ---------------------------------*- MLIR -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+// RUN: aie-translate --aie-ipu-instgen --aie-ipu-instgen-format=binary %s | od -A n -t x1 -v | FileCheck %s --check-prefix=BINARY
+// RUN: aie-translate --aie-ipu-instgen --aie-ipu-instgen-format=length-prefixed %s | od -A n -t x1 -v | FileCheck %s --check-prefix=PREFIXED
+
+// The prolog and the sync, as little-endian words.
+// BINARY:      11 00 00 00 05 04 00 01 00 01 00 01 00 01 59 0b
+// BINARY:      ff 55 00 00 01 04 03 03 00 02 01 05
+// BINARY-NOT:  {{.}}
+
+// The same, preceded by the number of words.
+// PREFIXED:      13 00 00 00 11 00 00 00 05 04 00 01 00 01 00 01
+// PREFIXED:      30 96 bd 07 ff 55 00 00 01 04 03 03 00 02 01 05
+// PREFIXED-NOT:  {{.}}
+module {
+  aie.device(ipu) {
+    func.func @test0() {
+      aiex.ipu.sync { column = 3 : i32, row = 4 : i32, direction = 1 : i32, channel = 5 : i32, column_num = 1 : i32, row_num = 2 : i32 }
+      return
+    }
+  }
+}
@@ -0,0 +1,35 @@
+//===- batch.mlir ----------------------------------------------*- MLIR -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// Copyright (C) 2024, Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+// RUN: rm -rf %t && mkdir -p %t
+// RUN: %PYTHON aiecc.py --batch %s --batch %S/simple.mlir --tmpdir=%t --compile --xchesscc --no-link --no-compile-host --no-toolchain-cache -nv > %t/log
+// RUN: FileCheck %s --input-file=%t/log
+// RUN: FileCheck %s --input-file=%t/log --check-prefix=WRAPPER
+
+// Each design is built in a project directory of its own.
+// CHECK-DAG: created temporary directory {{.*}}/batch.mlir.prj
+// CHECK-DAG: created temporary directory {{.*}}/simple.mlir.prj
+// CHECK-DAG: xchesscc_wrapper aie {{.*}}-o {{.*}}/batch.mlir.prj/input.o
+// CHECK-DAG: xchesscc_wrapper aie {{.*}}-o {{.*}}/simple.mlir.prj/input.o
+
+// Both designs target AIE, so the chess intrinsic wrapper is only built once.
+// WRAPPER: xchesscc_wrapper aie {{.*}}chess_intrinsic_wrapper.cpp
+// WRAPPER-NOT: chess_intrinsic_wrapper.cpp
+
+module {
+  %23 = aie.tile(2, 3)
+  %buf = aie.buffer(%23) : memref<256xi32>
+  %4 = aie.core(%23)  {
+    %0 = arith.constant 0 : i32
+    %1 = arith.constant 0 : index
+    memref.store %0, %buf[%1] : memref<256xi32>
+    aie.end
+  }
+}
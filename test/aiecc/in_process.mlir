@@ -0,0 +1,37 @@
+//===- in_process.mlir -----------------------------------------*- MLIR -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// Copyright (C) 2024, Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+// RUN: %PYTHON aiecc.py --in-process --no-unified --compile --no-xchesscc --no-link --no-compile-host -nv %s > %t.log
+// RUN: FileCheck %s --input-file=%t.log
+// RUN: FileCheck %s --input-file=%t.log --check-prefix=PHYSICAL
+// RUN: FileCheck %s --input-file=%t.log --check-prefix=TOOLS
+
+// The passes and translations run through the Python bindings, and only the
+// compilers are called as external tools. The design is routed concurrently
+// with the core being compiled.
+
+// CHECK: Running: {{.*}}aie-standard-lowering
+// CHECK: Running: {{.*}}convert-func-to-llvm
+// CHECK: {{^[^ ]*llc}}
+// CHECK-SAME: --march=aie
+// PHYSICAL: Running: {{.*}}aie-create-pathfinder-flows
+// TOOLS-NOT: {{^[^ ]*aie-opt}}
+// TOOLS-NOT: {{^[^ ]*aie-translate}}
+
+module {
+  %12 = aie.tile(1, 2)
+  %buf = aie.buffer(%12) : memref<256xi32>
+  %4 = aie.core(%12)  {
+    %0 = arith.constant 0 : i32
+    %1 = arith.constant 0 : index
+    memref.store %0, %buf[%1] : memref<256xi32>
+    aie.end
+  }
+}
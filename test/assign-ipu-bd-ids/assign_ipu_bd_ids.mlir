@@ -0,0 +1,251 @@
+//===- assign_ipu_bd_ids.mlir ----------------------------------*- MLIR -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+// RUN: aie-opt --aie-assign-ipu-bd-ids -verify-diagnostics %s | FileCheck %s
+
+// CHECK-LABEL: func.func @reuse_after_sync
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 5 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in1}
+
+// CHECK-LABEL: func.func @bd_pressure
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 3 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 4 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 5 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 6 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 7 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 8 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 9 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 10 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 11 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 12 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 13 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 14 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 15 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @in0}
+
+// CHECK-LABEL: func.func @loop
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 0 : i64, metadata = @out0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 1 : i64, metadata = @in0}
+// CHECK-NEXT: aiex.ipu.dma_memcpy_nd({{.*}}) {id = 2 : i64, metadata = @in1}
+// CHECK-NEXT: aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+
+module {
+  aie.device(ipu) {
+    aie.shim_dma_allocation @in0 (MM2S, 0, 0)
+    aie.shim_dma_allocation @in1 (MM2S, 1, 0)
+    aie.shim_dma_allocation @out0 (S2MM, 0, 0)
+    func.func @reuse_after_sync(%buf : memref<16xi32>) {
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      // Waiting for the only output frees its BD, and those of the inputs sent
+      // before it.
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      // Explicit IDs are kept.
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = 5 : i64 } : memref<16xi32>
+      // expected-note@+1 {{earlier transfer here}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      // expected-warning@+1 {{BD 1 of shim column 0 may still be in use by an earlier transfer}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = 1 : i64 } : memref<16xi32>
+      return
+    }
+    func.func @bd_pressure(%buf : memref<16xi32>) {
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      // No input is sent after the output, so waiting for it can't deadlock.
+      // expected-warning@+1 {{all 16 BDs of shim column 0 are in use: waiting for the transfer on S2MM channel 0 serializes this one}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      return
+    }
+    // More transfers than BDs, which are recycled at every sync.
+    func.func @loop(%buf : memref<16xi32>) {
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in1, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      return
+    }
+  }
+}
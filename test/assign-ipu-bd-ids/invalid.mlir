@@ -0,0 +1,70 @@
+//===- invalid.mlir --------------------------------------------*- MLIR -*-===//
+//
+// This file is licensed under the Apache License v2.0 with LLVM Exceptions.
+// See https://llvm.org/LICENSE.txt for license information.
+// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+//
+// (c) Copyright 2024 Advanced Micro Devices, Inc.
+//
+//===----------------------------------------------------------------------===//
+
+// RUN: aie-opt --aie-assign-ipu-bd-ids -split-input-file -verify-diagnostics %s
+
+module {
+  aie.device(ipu) {
+    aie.shim_dma_allocation @in0 (MM2S, 0, 0)
+    aie.shim_dma_allocation @out0 (S2MM, 0, 0)
+    func.func @output_before_inputs(%buf : memref<16xi32>) {
+      // expected-note@+1 {{S2MM transfer here}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @out0, id = -1 : i64 } : memref<16xi32>
+      // expected-note@+1 {{later MM2S transfer here}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      // expected-error@+1 {{all 16 BDs of shim column 0 are in use, and waiting for the transfer on S2MM channel 0 could deadlock, as it may depend on an MM2S transfer issued after it}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      return
+    }
+  }
+}
+
+// -----
+
+module {
+  aie.device(ipu) {
+    aie.shim_dma_allocation @in0 (MM2S, 0, 0)
+    func.func @only_inputs(%buf : memref<16xi32>) {
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      // expected-error@+1 {{all 16 BDs of shim column 0 are in use by MM2S transfers, which can't be waited for}}
+      aiex.ipu.dma_memcpy_nd(0, 0, %buf[0, 0, 0, 0][1, 1, 1, 16][0, 0, 0]) { metadata = @in0, id = -1 : i64 } : memref<16xi32>
+      return
+    }
+  }
+}
@@ -0,0 +1,67 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import os
+import tempfile
+
+from aie.compiler.aiecc.cache import BuildCache
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    with tempfile.TemporaryDirectory() as d:
+        f(d)
+
+
+def write(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+    return path
+
+
+# CHECK-LABEL: TEST: test_hit_and_miss
+@run
+def test_hit_and_miss(d):
+    cache = BuildCache(os.path.join(d, "cache"))
+    core = write(os.path.join(d, "core_1_2.mlir"), "core")
+    elf = write(os.path.join(d, "core_1_2.elf"), "elf")
+
+    key = cache.key(files=[core], strings=["AIE2"])
+    # CHECK: False
+    print(cache.lookup(key, {"core.elf": elf}))
+    cache.store(key, {"core.elf": elf})
+
+    os.remove(elf)
+    # CHECK: True
+    print(cache.lookup(key, {"core.elf": elf}))
+    # CHECK: elf
+    print(open(elf).read())
+
+    # A different flag or a changed input misses.
+    # CHECK: False
+    print(cache.lookup(cache.key(files=[core], strings=["AIE1"]), {"core.elf": elf}))
+    write(core, "edited core")
+    # CHECK: False
+    print(cache.lookup(cache.key(files=[core], strings=["AIE2"]), {"core.elf": elf}))
+
+
+# CHECK-LABEL: TEST: test_lru_eviction
+@run
+def test_lru_eviction(d):
+    cache = BuildCache(os.path.join(d, "cache"), max_size=250)
+    keys = []
+    for i in range(3):
+        elf = write(os.path.join(d, f"core_{i}.elf"), "x" * 100)
+        keys.append(cache.key(strings=[i]))
+        cache.store(keys[-1], {"core.elf": elf})
+        # Make the entries' last-use times distinct and ordered.
+        entry = os.path.join(cache.cache_dir, keys[-1][:2], keys[-1])
+        os.utime(entry, (i, i))
+
+    # CHECK: 2
+    print(len(list(cache.entries())))
+    elf = os.path.join(d, "out.elf")
+    # CHECK: False True True
+    print(*(cache.lookup(k, {"core.elf": elf}) for k in keys))
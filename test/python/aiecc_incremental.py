@@ -0,0 +1,61 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import os
+import tempfile
+
+from aie.compiler.aiecc.incremental import Manifest, command_files
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    with tempfile.TemporaryDirectory() as d:
+        f(d)
+
+
+def write(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+    return path
+
+
+# CHECK-LABEL: TEST: test_command_files
+@run
+def test_command_files(d):
+    obj = write(os.path.join(d, "core_1_2.o"), "obj")
+    ldscript = write(os.path.join(d, "core_1_2.ld.script"), "ld")
+    elf = os.path.join(d, "core_1_2.elf")
+    inputs, outputs = command_files(
+        ["clang", "-O2", obj, "-Wl,-T," + ldscript, "-o", elf]
+    )
+    # CHECK: ['core_1_2.o', 'core_1_2.ld.script'] ['core_1_2.elf']
+    print([os.path.basename(f) for f in inputs], [os.path.basename(f) for f in outputs])
+
+
+# CHECK-LABEL: TEST: test_up_to_date
+@run
+def test_up_to_date(d):
+    ll = write(os.path.join(d, "input.ll"), "ll")
+    obj = os.path.join(d, "input.o")
+    cmd = "llc input.ll -o input.o"
+
+    manifest = Manifest(d)
+    # CHECK: False
+    print(manifest.up_to_date(cmd, [ll], [obj]))
+    write(obj, "obj")
+    manifest.save()
+
+    # CHECK: True [{{.}}llc input.ll -o input.o{{.}}]
+    manifest = Manifest(d)
+    print(manifest.up_to_date(cmd, [ll], [obj]), manifest.reused)
+
+    # A changed input or a missing output makes the step run again.
+    write(ll, "edited ll")
+    # CHECK: False
+    print(Manifest(d).up_to_date(cmd, [ll], [obj]))
+    write(ll, "ll")
+    os.remove(obj)
+    # CHECK: False
+    print(Manifest(d).up_to_date(cmd, [ll], [obj]))
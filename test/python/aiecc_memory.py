@@ -0,0 +1,60 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import asyncio
+import os
+import tempfile
+
+from aie.compiler.aiecc.memory import MemoryBudget
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    asyncio.run(f())
+
+
+# CHECK-LABEL: TEST: test_admission
+@run
+async def test_admission():
+    budget = MemoryBudget(3000)
+    budget.estimates = {"xchesscc": 2000, "llc": 500}
+    log = []
+
+    async def call(tool, peak):
+        reservation = await budget.reserve(tool)
+        log.append(tool)
+        await asyncio.sleep(0.01)
+        await budget.release(reservation, peak)
+
+    await asyncio.gather(
+        call("xchesscc", 2500), call("xchesscc", 2500), call("llc", 400)
+    )
+    # The second xchesscc only starts once the first one is done.
+    # CHECK: xchesscc llc xchesscc
+    print(*log)
+    # CHECK: 2500 450
+    print(budget.estimates["xchesscc"], budget.estimates["llc"])
+
+
+# CHECK-LABEL: TEST: test_oversized_runs_alone
+@run
+async def test_oversized_runs_alone():
+    budget = MemoryBudget(100)
+    reservation = await budget.reserve("opt")
+    # CHECK: 1
+    print(len(budget.running))
+    await budget.release(reservation, 0)
+
+
+# CHECK-LABEL: TEST: test_saved_estimates
+@run
+async def test_saved_estimates():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "memory_estimates.json")
+        budget = MemoryBudget(1 << 30, path)
+        await budget.release(await budget.reserve("llc"), 1234)
+        budget.save()
+        # CHECK: 1234
+        print(MemoryBudget(1 << 30, path).estimate("llc"))
@@ -0,0 +1,86 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import asyncio
+
+from aie.compiler.aiecc.scheduler import TaskGraph, WorkerPool
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    asyncio.run(f())
+
+
+def step(log, name, result=None):
+    async def action():
+        log.append(name)
+        await asyncio.sleep(0)
+        return result
+
+    return action
+
+
+# CHECK-LABEL: TEST: test_dependencies
+@run
+async def test_dependencies():
+    log = []
+    graph = TaskGraph(WorkerPool(4))
+    chess = graph.add("chess", step(log, "chess", "wrapper.ll"))
+    host = graph.add("host", step(log, "host"))
+    graph.add("sim", step(log, "sim"), deps=[host])
+    cores = [
+        graph.add(f"core{i}", step(log, f"core{i}"), deps=[chess, None])
+        for i in range(2)
+    ]
+    graph.add("xclbin", step(log, "xclbin"), deps=[host] + cores)
+    await graph.run()
+    # CHECK: True True True
+    print(
+        log.index("chess") < log.index("core0"),
+        log.index("host") < log.index("sim"),
+        log[-1] == "xclbin",
+    )
+    # CHECK: wrapper.ll
+    print(chess.result)
+
+
+# CHECK-LABEL: TEST: test_critical_path_first
+@run
+async def test_critical_path_first():
+    for critical_path_first in [True, False]:
+        log = []
+        pool = WorkerPool(1)
+        graph = TaskGraph(pool, critical_path_first)
+        graph.add("short", step(log, "short"), cost=1)
+        long = graph.add("long", step(log, "long"), cost=1)
+        graph.add("tail", step(log, "tail"), deps=[long], cost=10)
+        # Hold the only worker until both tasks are waiting for it.
+        slot = await pool.acquire()
+        run = asyncio.ensure_future(graph.run())
+        await asyncio.sleep(0.01)
+        pool.release(slot)
+        await run
+        # CHECK: long short tail
+        # CHECK: short long tail
+        print(*log)
+
+
+# CHECK-LABEL: TEST: test_bounded
+@run
+async def test_bounded():
+    pool = WorkerPool(2)
+    graph = TaskGraph(pool)
+    peak = 0
+
+    async def action():
+        nonlocal peak
+        peak = max(peak, pool.running)
+        await asyncio.sleep(0.01)
+
+    for i in range(6):
+        graph.add(f"core{i}", action)
+    await graph.run()
+    # CHECK: 2
+    print(peak)
@@ -0,0 +1,37 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import tempfile
+
+from aie.compiler.aiecc.toolchain import Toolchain
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    with tempfile.TemporaryDirectory() as d:
+        f(d)
+
+
+# CHECK-LABEL: TEST: test_persistent_lookup
+@run
+def test_persistent_lookup(d):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return ["me_basic.o", "libc.a"]
+
+    toolchain = Toolchain(d)
+    # CHECK: ['me_basic.o', 'libc.a']
+    print(toolchain.lookup(("core_link_args", "AIE2"), compute, persistent=True))
+    toolchain.lookup(("core_link_args", "AIE2"), compute, persistent=True)
+
+    # A later run with the same toolchain does not recompute it...
+    # CHECK: ['me_basic.o', 'libc.a']
+    print(Toolchain(d).lookup(("core_link_args", "AIE2"), compute, persistent=True))
+    # ...unless the results are not kept across runs.
+    Toolchain().lookup(("core_link_args", "AIE2"), compute, persistent=True)
+    # CHECK: 2
+    print(len(calls))
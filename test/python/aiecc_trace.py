@@ -0,0 +1,56 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+from aie.compiler.aiecc.trace import Trace, peak_rss
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    f()
+
+
+# CHECK-LABEL: TEST: test_peak_rss
+@run
+def test_peak_rss():
+    async def measure():
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            "import time; x = bytearray(64 << 20); time.sleep(0.3)",
+        )
+        rss = await peak_rss(proc)
+        return rss, await proc.wait()
+
+    rss, ret = asyncio.run(measure())
+    # CHECK: True 0
+    print(rss > 64 << 10, ret)
+
+
+# CHECK-LABEL: TEST: test_write
+@run
+def test_write():
+    trace = Trace()
+    start = time.time()
+    trace.span("llc", start, start + 0.5, 1, task="core_1_2", col=1, row=2)
+    trace.span("aie-opt", start, start + 0.1)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "trace.json")
+        trace.write(path)
+        events = json.load(open(path))["traceEvents"]
+    # CHECK: M thread_name -1 {'name': 'driver'}
+    # CHECK: M thread_name 1 {'name': 'worker 1'}
+    # CHECK: X llc 1 {'task': 'core_1_2', 'col': 1, 'row': 2}
+    # CHECK: X aie-opt -1 {}
+    for e in events:
+        print(e["ph"], e["name"], e["tid"], e["args"])
+    # CHECK: 500000
+    print(events[2]["dur"])
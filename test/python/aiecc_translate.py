@@ -0,0 +1,82 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# The translations that aiecc.py --in-process calls through the Python bindings
+# must produce the same output as the aie-translate/aie-opt calls they replace.
+
+# RUN: rm -rf %t && mkdir -p %t
+# RUN: %PYTHON %s %t | FileCheck %s
+# RUN: aie-translate --aie-generate-ldscript --tilecol=2 --tilerow=3 %t/physical.mlir -o %t/ldscript.ref
+# RUN: diff %t/ldscript %t/ldscript.ref
+# RUN: aie-translate --aie-generate-target-arch %t/physical.mlir -o %t/target_arch.ref
+# RUN: diff %t/target_arch %t/target_arch.ref
+# RUN: aie-translate --aie-mlir-to-xpe %t/physical.mlir -o %t/xpe.ref
+# RUN: diff %t/xpe %t/xpe.ref
+# RUN: aie-translate --aie-mlir-to-shim-solution %t/physical.mlir -o %t/shim_solution.ref
+# RUN: diff %t/shim_solution %t/shim_solution.ref
+# RUN: aie-translate --aie-mlir-to-scsim-config %t/physical.mlir -o %t/scsim_config.ref
+# RUN: diff %t/scsim_config %t/scsim_config.ref
+# RUN: aie-opt --aie-find-flows %t/physical.mlir -o %t/flows_physical.mlir
+# RUN: aie-translate --aie-flows-to-json %t/flows_physical.mlir -o %t/flows_json.ref
+# RUN: diff %t/flows_json %t/flows_json.ref
+
+import os
+import sys
+
+from aie.compiler.aiecc.main import (
+    CREATE_PATH_FINDER_FLOWS,
+    FIND_FLOWS,
+    INPUT_WITH_ADDRESSES_PIPELINE,
+)
+from aie.dialects import aie as aiedialect
+from aie.ir import Context, Location, Module
+from aie.passmanager import PassManager
+
+module = """
+module {
+  aie.device(xcvc1902) {
+    %t20 = aie.tile(2, 0)
+    %t23 = aie.tile(2, 3)
+    %t33 = aie.tile(3, 3)
+    %buf_a = aie.buffer(%t23) {sym_name = "a"} : memref<256xi32>
+    %buf_b = aie.buffer(%t33) {sym_name = "b"} : memref<256xi32>
+    aie.flow(%t20, DMA : 0, %t23, DMA : 0)
+    aie.flow(%t23, Core : 0, %t33, Core : 1)
+    aie.flow(%t33, DMA : 0, %t20, DMA : 0)
+    aie.core(%t23) {
+      %0 = arith.constant 0 : i32
+      %1 = arith.constant 0 : index
+      memref.store %0, %buf_a[%1] : memref<256xi32>
+      aie.end
+    }
+  }
+}
+"""
+
+outdir = sys.argv[1]
+
+
+def write(name, contents):
+    with open(os.path.join(outdir, name), "w") as f:
+        f.write(contents)
+
+
+with Context(), Location.unknown():
+    physical = Module.parse(module)
+    PassManager.parse(str(INPUT_WITH_ADDRESSES_PIPELINE)).run(physical.operation)
+    PassManager.parse(str(CREATE_PATH_FINDER_FLOWS)).run(physical.operation)
+    write("physical.mlir", str(physical))
+
+    op = physical.operation
+    write("ldscript", aiedialect.generate_ldscript(op, 2, 3))
+    write("target_arch", aiedialect.generate_target_arch(op))
+    write("xpe", aiedialect.generate_xpe(op))
+    write("shim_solution", aiedialect.generate_shim_solution(op))
+    write("scsim_config", aiedialect.generate_scsim_config(op))
+
+    flows_physical = Module.parse(str(physical))
+    PassManager.parse(str(FIND_FLOWS)).run(flows_physical.operation)
+    write("flows_json", aiedialect.generate_flows_json(flows_physical.operation))
+
+# CHECK: {{^}}a = .;
+print(open(os.path.join(outdir, "ldscript")).read())
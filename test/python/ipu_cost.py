@@ -0,0 +1,142 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+# noinspection PyUnresolvedReferences
+import aie.dialects.aie
+from aie.ipu_cost import (
+    MM2S,
+    S2MM,
+    Channel,
+    Memcpy,
+    Sync,
+    estimate_runtime_sequences,
+    estimate_sequence,
+)
+from aie.ir import Context, Location, Module
+
+SEQUENCES = """
+module {
+  aie.device(ipu) {
+    aie.shim_dma_allocation @in0 (MM2S, 0, 0)
+    aie.shim_dma_allocation @out0 (S2MM, 0, 0)
+    func.func @contiguous(%in : memref<1024xi32>, %out : memref<1024xi32>) {
+      aiex.ipu.dma_memcpy_nd(0, 0, %in[0, 0, 0, 0][1, 1, 1, 1024][0, 0, 0]) { metadata = @in0, id = 0 : i64 } : memref<1024xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %out[0, 0, 0, 0][1, 1, 1, 1024][0, 0, 0]) { metadata = @out0, id = 1 : i64 } : memref<1024xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      return
+    }
+    func.func @strided(%in : memref<1024xi32>, %out : memref<1024xi32>) {
+      %c1 = arith.constant 1 : i64
+      %c8 = arith.constant 8 : i64
+      aiex.ipu.dma_memcpy_nd(0, 0, %in[0, 0, 0, 0][%c1, 1, 128, %c8][0, 0, 64]) { metadata = @in0, id = 0 : i64 } : memref<1024xi32>
+      aiex.ipu.dma_memcpy_nd(0, 0, %out[0, 0, 0, 0][1, 1, 1, 1024][0, 0, 0]) { metadata = @out0, id = 1 : i64 } : memref<1024xi32>
+      aiex.ipu.sync {channel = 0 : i32, column = 0 : i32, column_num = 1 : i32, direction = 0 : i32, row = 0 : i32, row_num = 1 : i32}
+      return
+    }
+  }
+}
+"""
+
+COST_MODEL = dict(
+    instruction_ns=10.0, sync_ns=100.0, bytes_per_ns=4.0, burst_bytes=64, burst_ns=4.0
+)
+
+with Context(), Location.unknown():
+    estimates = estimate_runtime_sequences(Module.parse(SEQUENCES), **COST_MODEL)
+
+for name, estimate in estimates.items():
+    print("\nTEST:", name)
+    print("total", estimate["total_ns"])
+    for (col, direction, index), stats in sorted(estimate["channels"].items()):
+        print(
+            "channel",
+            col,
+            direction,
+            index,
+            stats["bytes"],
+            stats["busy_ns"],
+            stats["burst_efficiency"],
+        )
+    for stall in estimate["stalls"]:
+        print("stall", stall["kind"], stall["wait_ns"])
+    for step in estimate["critical_path"]:
+        print("step", step.kind, step.op.name, step.start, step.end)
+
+# 4 KiB in 64 bursts of 64 B per channel. The controller waits for the
+# output, which starts after both transfers are issued.
+# CHECK-LABEL: TEST: contiguous
+# CHECK: total 1430.0
+# CHECK: channel 0 0 0 4096 1280.0 1.0
+# CHECK: channel 0 1 0 4096 1280.0 1.0
+# CHECK: stall sync 1280.0
+# CHECK: step issue aiex.ipu.dma_memcpy_nd 0.0 20.0
+# CHECK: step issue aiex.ipu.dma_memcpy_nd 20.0 40.0
+# CHECK: step transfer aiex.ipu.dma_memcpy_nd 40.0 1320.0
+# CHECK: step sync aiex.ipu.sync 1320.0 1430.0
+
+# Runs of 8 words (32 B) take a burst each, which is only half used.
+# CHECK-LABEL: TEST: strided
+# CHECK: channel 0 1 0 4096 1536.0 0.5
+
+# The remaining sequences are built from steps directly: 1 KiB transfers,
+# which take 320 ns on their channel.
+
+
+def memcpy(name, col, direction, index=0):
+    return Memcpy(name, Channel(col, direction, index), [256, 1, 1, 1], [0, 0, 0], 4, 2)
+
+
+def sync(name, col, num_cols=1):
+    return Sync(name, range(col, col + num_cols), S2MM, 0)
+
+
+# With a task queue of depth 2, the third and fourth pushes each wait for
+# the transfer two places ahead of them to finish.
+print("\nTEST: push_stall")
+estimate = estimate_sequence(
+    [memcpy(f"in{i}", 0, MM2S) for i in range(4)], queue_depth=2, **COST_MODEL
+)
+print("total", estimate["total_ns"])
+for stall in estimate["stalls"]:
+    print("stall", stall["kind"], stall["op"], stall["wait_ns"])
+# CHECK-LABEL: TEST: push_stall
+# CHECK: total 1300.0
+# CHECK: stall push in2 300.0
+# CHECK: stall push in3 300.0
+# CHECK-NOT: stall
+
+# A loop that sends two inputs, receives the output and syncs on it reuses
+# its BDs at every sync. Sending all the inputs up front does not.
+print("\nTEST: bd_pressure")
+loop = []
+for i in range(10):
+    loop += [
+        memcpy(f"out{i}", 0, S2MM),
+        memcpy(f"a{i}", 0, MM2S, 0),
+        memcpy(f"b{i}", 0, MM2S, 1),
+        sync(f"sync{i}", 0),
+    ]
+estimate = estimate_sequence(loop, num_bds=4, **COST_MODEL)
+print("loop", estimate["max_bds_in_flight"], estimate["bd_pressure"])
+up_front = [memcpy(f"a{i}", 0, MM2S) for i in range(5)]
+up_front += [memcpy("out", 0, S2MM), sync("sync", 0)]
+estimate = estimate_sequence(up_front, num_bds=4, **COST_MODEL)
+print("up front", estimate["max_bds_in_flight"], estimate["bd_pressure"])
+# CHECK-LABEL: TEST: bd_pressure
+# CHECK: loop {0: 3} []
+# CHECK: up front {0: 6} [0]
+
+# One sync waits for the outputs of two columns, the second of which is
+# pushed last and so finishes last.
+print("\nTEST: multi_column_sync")
+estimate = estimate_sequence(
+    [memcpy("out0", 0, S2MM), memcpy("out1", 1, S2MM), sync("sync", 0, 2)],
+    **COST_MODEL,
+)
+print("total", estimate["total_ns"])
+print("path", *(f"{step.kind}:{step.op}" for step in estimate["critical_path"]))
+# CHECK-LABEL: TEST: multi_column_sync
+# CHECK: total 470.0
+# CHECK: path issue:out0 issue:out1 transfer:out1 sync:sync
@@ -0,0 +1,110 @@
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# RUN: %PYTHON %s | FileCheck %s
+
+import numpy as np
+
+from aie.dialects.aie import DMAChannelDir
+from aie.dialects.aiex import ipu
+
+
+def run(f):
+    print("\nTEST:", f.__name__)
+    f()
+
+
+def hex_words(words):
+    print(" ".join(f"{int(w):08X}" for w in words))
+
+
+# CHECK-LABEL: TEST: test_writebd_shimtile_batch
+@run
+def test_writebd_shimtile_batch():
+    # The fields of the writebd_shimtile in test/Targets/IPU/ipu_instgen.mlir,
+    # which encodes to the same words but for its column_num of 4.
+    words = ipu.writebd_shimtile_batch(
+        bd_id=[6, 7],
+        buffer_length=1,
+        buffer_offset=[2, 3],
+        column=3,
+        ddr_id=10,
+        d0_size=6,
+        d0_stride=6,
+        d1_size=8,
+        d1_stride=8,
+        d2_stride=10,
+        iteration_current=11,
+        iteration_stride=12,
+        iteration_size=13,
+        lock_acq_enable=1,
+        lock_acq_id=1,
+        lock_acq_val=2,
+        lock_rel_id=3,
+        lock_rel_val=4,
+        next_bd=5,
+        use_next_bd=1,
+        data_width=8,
+    )
+    # CHECK: uint32 (20,)
+    print(words.dtype, words.shape)
+    # CHECK: 060301A6 00000000 00000001 00000002 00000000 00600005 80800007 00000009 2CD0000C 2E107041
+    # CHECK: 060301A7 00000000 00000001 00000003 00000000 00600005 80800007 00000009 2CD0000C 2E107041
+    for bd in words.reshape(-1, 10):
+        hex_words(bd)
+
+
+# CHECK-LABEL: TEST: test_batch_matches_scalar
+@run
+def test_batch_matches_scalar():
+    columns = np.arange(4)
+    bd_ids = np.arange(4) + 2
+    lengths = 64 * (np.arange(4) + 1)
+    offsets = 1024 * np.arange(4)
+
+    scalar = []
+    for column, bd_id, length, offset in zip(columns, bd_ids, lengths, offsets):
+        scalar.extend(
+            ipu.writebd_shimtile(
+                int(bd_id),
+                buffer_length=int(length),
+                buffer_offset=int(offset),
+                column=int(column),
+                d0_size=16,
+            )
+        )
+        scalar.extend(
+            ipu.shimtile_push_queue(DMAChannelDir.S2MM, 1, int(column), int(bd_id))
+        )
+        scalar.extend(ipu.sync(column=int(column)))
+
+    bds = ipu.writebd_shimtile_batch(
+        bd_ids, buffer_length=lengths, buffer_offset=offsets, column=columns, d0_size=16
+    ).reshape(-1, 10)
+    queues = ipu.shimtile_push_queue_batch(
+        DMAChannelDir.S2MM, 1, columns, bd_ids
+    ).reshape(-1, 3)
+    syncs = ipu.sync_batch(column=columns).reshape(-1, 2)
+    batch = np.concatenate([bds, queues, syncs], axis=1).reshape(-1)
+
+    # CHECK: True
+    print(batch.tolist() == scalar)
+
+    expanded = []
+    for bd in bds.tolist():
+        expanded.extend(ipu._exec_write_bd_extend_shim_tile_opt(bd))
+    # CHECK: True
+    print(ipu._exec_write_bd_extend_shim_tile_opt_batch(bds).tolist() == expanded)
+
+
+# CHECK-LABEL: TEST: test_writebd_shimtile_batch_no_wrap
+@run
+def test_writebd_shimtile_batch_no_wrap():
+    # None (do not wrap) encodes as a size of 0, also per element of an array.
+    words = ipu.writebd_shimtile_batch(
+        bd_id=[0, 1], buffer_length=8, d0_size=[None, 3], d1_size=[4, None]
+    ).reshape(-1, 10)
+    # CHECK: 00000000 80400000
+    # CHECK: 00300000 80000000
+    for bd in words:
+        hex_words(bd[5:7])
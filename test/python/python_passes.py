@@ -1509,3 +1509,352 @@ def test_simple_flows_shim():
     # CHECK:  %{{.*}} = aie.shim_mux(%[[T30]])  {
     # CHECK:    aie.connect<North : 3, DMA : 1>
     # CHECK:  }
+
+
+# CHECK-LABEL: TEST: test_many_flows_cp_linear
+@run
+def test_many_flows_cp_linear():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "many_flows.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT, backend="cp_linear")
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T02:.*]] = aie.tile(0, 2)
+    # CHECK: %[[T03:.*]] = aie.tile(0, 3)
+    # CHECK: %[[T11:.*]] = aie.tile(1, 1)
+    # CHECK: %[[T13:.*]] = aie.tile(1, 3)
+    # CHECK: %[[T20:.*]] = aie.tile(2, 0)
+    # CHECK: %[[T22:.*]] = aie.tile(2, 2)
+    # CHECK: %[[T30:.*]] = aie.tile(3, 0)
+    # CHECK: %[[T31:.*]] = aie.tile(3, 1)
+    # CHECK: %[[T60:.*]] = aie.tile(6, 0)
+    # CHECK: %[[T70:.*]] = aie.tile(7, 0)
+    # CHECK: %[[T73:.*]] = aie.tile(7, 3)
+    # CHECK: aie.flow(%[[T02]], Core : 1, %[[T22]], Core : 1)
+    # CHECK: aie.flow(%[[T02]], DMA : 0, %[[T60]], DMA : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 0, %[[T13]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 1, %[[T02]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], DMA : 0, %[[T70]], DMA : 0)
+    # CHECK: aie.flow(%[[T13]], Core : 1, %[[T22]], Core : 0)
+    # CHECK: aie.flow(%[[T13]], DMA : 0, %[[T70]], DMA : 1)
+    # CHECK: aie.flow(%[[T22]], DMA : 0, %[[T60]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 0, %[[T20]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 1, %[[T30]], DMA : 1)
+    # CHECK: aie.flow(%[[T73]], Core : 0, %[[T31]], Core : 0)
+    # CHECK: aie.flow(%[[T73]], Core : 1, %[[T31]], Core : 1)
+    # CHECK: aie.flow(%[[T73]], DMA : 0, %[[T20]], DMA : 0)
+    # CHECK: aie.flow(%[[T73]], DMA : 1, %[[T30]], DMA : 0)
+    print(mlir_module)
+
+
+# CHECK-LABEL: TEST: test_many_flows_pathfinder
+@run
+def test_many_flows_pathfinder():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "many_flows.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT, backend="pathfinder")
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T02:.*]] = aie.tile(0, 2)
+    # CHECK: %[[T03:.*]] = aie.tile(0, 3)
+    # CHECK: %[[T11:.*]] = aie.tile(1, 1)
+    # CHECK: %[[T13:.*]] = aie.tile(1, 3)
+    # CHECK: %[[T20:.*]] = aie.tile(2, 0)
+    # CHECK: %[[T22:.*]] = aie.tile(2, 2)
+    # CHECK: %[[T30:.*]] = aie.tile(3, 0)
+    # CHECK: %[[T31:.*]] = aie.tile(3, 1)
+    # CHECK: %[[T60:.*]] = aie.tile(6, 0)
+    # CHECK: %[[T70:.*]] = aie.tile(7, 0)
+    # CHECK: %[[T73:.*]] = aie.tile(7, 3)
+    # CHECK: aie.flow(%[[T02]], Core : 1, %[[T22]], Core : 1)
+    # CHECK: aie.flow(%[[T02]], DMA : 0, %[[T60]], DMA : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 0, %[[T13]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 1, %[[T02]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], DMA : 0, %[[T70]], DMA : 0)
+    # CHECK: aie.flow(%[[T13]], Core : 1, %[[T22]], Core : 0)
+    # CHECK: aie.flow(%[[T13]], DMA : 0, %[[T70]], DMA : 1)
+    # CHECK: aie.flow(%[[T22]], DMA : 0, %[[T60]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 0, %[[T20]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 1, %[[T30]], DMA : 1)
+    # CHECK: aie.flow(%[[T73]], Core : 0, %[[T31]], Core : 0)
+    # CHECK: aie.flow(%[[T73]], Core : 1, %[[T31]], Core : 1)
+    # CHECK: aie.flow(%[[T73]], DMA : 0, %[[T20]], DMA : 0)
+    # CHECK: aie.flow(%[[T73]], DMA : 1, %[[T30]], DMA : 0)
+    print(mlir_module)
+
+
+# CHECK-LABEL: TEST: test_simple_warm_start
+@run
+def test_simple_warm_start():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "simple.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT, backend="cp_linear", warm_start=True)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T01:.*]] = aie.tile(0, 1)
+    # CHECK: %[[T12:.*]] = aie.tile(1, 2)
+    # CHECK: aie.flow(%[[T01]], DMA : 0, %[[T12]], Core : 1)
+    print(mlir_module)
+
+
+# CHECK-LABEL: TEST: test_many_flows_decompose
+@run
+def test_many_flows_decompose():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "many_flows.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT, decompose=True)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T02:.*]] = aie.tile(0, 2)
+    # CHECK: %[[T03:.*]] = aie.tile(0, 3)
+    # CHECK: %[[T11:.*]] = aie.tile(1, 1)
+    # CHECK: %[[T13:.*]] = aie.tile(1, 3)
+    # CHECK: %[[T20:.*]] = aie.tile(2, 0)
+    # CHECK: %[[T22:.*]] = aie.tile(2, 2)
+    # CHECK: %[[T30:.*]] = aie.tile(3, 0)
+    # CHECK: %[[T31:.*]] = aie.tile(3, 1)
+    # CHECK: %[[T60:.*]] = aie.tile(6, 0)
+    # CHECK: %[[T70:.*]] = aie.tile(7, 0)
+    # CHECK: %[[T73:.*]] = aie.tile(7, 3)
+    # CHECK: aie.flow(%[[T02]], Core : 1, %[[T22]], Core : 1)
+    # CHECK: aie.flow(%[[T02]], DMA : 0, %[[T60]], DMA : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 0, %[[T13]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], Core : 1, %[[T02]], Core : 0)
+    # CHECK: aie.flow(%[[T03]], DMA : 0, %[[T70]], DMA : 0)
+    # CHECK: aie.flow(%[[T13]], Core : 1, %[[T22]], Core : 0)
+    # CHECK: aie.flow(%[[T13]], DMA : 0, %[[T70]], DMA : 1)
+    # CHECK: aie.flow(%[[T22]], DMA : 0, %[[T60]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 0, %[[T20]], DMA : 1)
+    # CHECK: aie.flow(%[[T31]], DMA : 1, %[[T30]], DMA : 1)
+    # CHECK: aie.flow(%[[T73]], Core : 0, %[[T31]], Core : 0)
+    # CHECK: aie.flow(%[[T73]], Core : 1, %[[T31]], Core : 1)
+    # CHECK: aie.flow(%[[T73]], DMA : 0, %[[T20]], DMA : 0)
+    # CHECK: aie.flow(%[[T73]], DMA : 1, %[[T30]], DMA : 0)
+    print(mlir_module)
+
+
+# CHECK-LABEL: TEST: test_disjoint_columns_decompose
+@run
+def test_disjoint_columns_decompose():
+    src = dedent(
+        """\
+        module {
+          aie.device(xcvc1902) {
+            %tile_0_2 = aie.tile(0, 2)
+            %tile_1_3 = aie.tile(1, 3)
+            %tile_7_2 = aie.tile(7, 2)
+            %tile_8_3 = aie.tile(8, 3)
+            aie.flow(%tile_0_2, DMA : 0, %tile_1_3, DMA : 0)
+            aie.flow(%tile_1_3, Core : 0, %tile_0_2, Core : 0)
+            aie.flow(%tile_7_2, DMA : 0, %tile_8_3, DMA : 0)
+            aie.flow(%tile_8_3, Core : 0, %tile_7_2, Core : 0)
+          }
+        }
+    """
+    )
+    mlir_module = Module.parse(src)
+    r = Router(timeout=TIMEOUT, decompose=True)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T02:.*]] = aie.tile(0, 2)
+    # CHECK: %[[T13:.*]] = aie.tile(1, 3)
+    # CHECK: %[[T72:.*]] = aie.tile(7, 2)
+    # CHECK: %[[T83:.*]] = aie.tile(8, 3)
+    # CHECK-DAG: aie.flow(%[[T02]], DMA : 0, %[[T13]], DMA : 0)
+    # CHECK-DAG: aie.flow(%[[T13]], Core : 0, %[[T02]], Core : 0)
+    # CHECK-DAG: aie.flow(%[[T72]], DMA : 0, %[[T83]], DMA : 0)
+    # CHECK-DAG: aie.flow(%[[T83]], Core : 0, %[[T72]], Core : 0)
+    print(mlir_module)
+
+    # The two column groups were routed as separate regions.
+    # CHECK: regions: 2
+    print("regions:", r.stats["regions"])
+
+
+# CHECK-LABEL: TEST: test_simple_cache
+@run
+def test_simple_cache():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for _ in range(2):
+            with open(
+                Path(THIS_FILE).parent.parent / "create-flows" / "simple.mlir"
+            ) as f:
+                mlir_module = Module.parse(f.read())
+            r = Router(timeout=TIMEOUT, cache_dir=cache_dir)
+            pass_ = create_python_router_pass(r)
+            pm = PassManager()
+            pass_manager_add_owned_pass(pm, pass_)
+            pm.add("aie-find-flows")
+
+            device = mlir_module.body.operations[0]
+            pm.run(device.operation)
+
+            # CHECK: %[[T01:.*]] = aie.tile(0, 1)
+            # CHECK: %[[T12:.*]] = aie.tile(1, 2)
+            # CHECK: aie.flow(%[[T01]], DMA : 0, %[[T12]], Core : 1)
+            print(mlir_module)
+
+        # The second run reuses the paths of the first.
+        # CHECK: cache entries: 1
+        print("cache entries:", len(list(Path(cache_dir).glob("router/*/*.json"))))
+
+
+# CHECK-LABEL: TEST: test_simple_first_feasible
+@run
+def test_simple_first_feasible():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "simple.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    solutions = []
+    r = Router(
+        timeout=TIMEOUT,
+        first_feasible=True,
+        on_solution=lambda objective, bound, elapsed: solutions.append(objective),
+    )
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+    pm.add("aie-find-flows")
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    # CHECK: %[[T01:.*]] = aie.tile(0, 1)
+    # CHECK: %[[T12:.*]] = aie.tile(1, 2)
+    # CHECK: aie.flow(%[[T01]], DMA : 0, %[[T12]], Core : 1)
+    print(mlir_module)
+    # CHECK: solutions: 1
+    print("solutions:", len(solutions))
+
+
+# CHECK-LABEL: TEST: test_many_flows_reroute
+@run
+def test_many_flows_reroute():
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "many_flows.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    routed = r.find_paths()
+    flow = r.flows[0]
+    without = r.reroute(remove=[flow])
+    # CHECK: sources: 14 13
+    print("sources:", len(routed), len(without))
+    # CHECK: rerouted: True
+    print("rerouted:", set(r.reroute(add=[flow])) == set(routed))
+
+
+# CHECK-LABEL: TEST: test_reroute_shared_source
+@run
+def test_reroute_shared_source():
+    src = dedent(
+        """\
+        module {
+          aie.device(xcvc1902) {
+            %tile_1_2 = aie.tile(1, 2)
+            %tile_1_3 = aie.tile(1, 3)
+            %tile_2_3 = aie.tile(2, 3)
+            %tile_7_3 = aie.tile(7, 3)
+            %tile_7_4 = aie.tile(7, 4)
+            aie.flow(%tile_7_3, DMA : 0, %tile_7_4, DMA : 0)
+            aie.flow(%tile_7_3, DMA : 0, %tile_1_3, DMA : 0)
+            aie.flow(%tile_1_2, DMA : 0, %tile_2_3, DMA : 0)
+          }
+        }
+    """
+    )
+    mlir_module = Module.parse(src)
+    r = Router(timeout=TIMEOUT)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    routed = r.find_paths()
+    flow = next(f for f in r.flows if (f[0].sb.col, f[0].sb.row) == (1, 2))
+    r.reroute(remove=[flow])
+    rerouted = r.reroute(add=[flow])
+    # CHECK: rerouted: True
+    print("rerouted:", set(rerouted) == set(routed))
+    # The flow to (1, 3) passes by the added flow, and the flow to (7, 4)
+    # shares its source, so both are routed again along with the added flow.
+    # CHECK: flows: 3 full: False
+    print("flows:", r.stats["rerouted"], "full:", r.stats["full_reroute"])
+
+
+# CHECK-LABEL: TEST: test_many_flows_full_reroute
+@run
+def test_many_flows_full_reroute():
+    import aie.util
+
+    with open(Path(THIS_FILE).parent.parent / "create-flows" / "many_flows.mlir") as f:
+        mlir_module = Module.parse(f.read())
+    r = Router(timeout=TIMEOUT)
+    pass_ = create_python_router_pass(r)
+    pm = PassManager()
+    pass_manager_add_owned_pass(pm, pass_)
+
+    device = mlir_module.body.operations[0]
+    pm.run(device.operation)
+
+    routed = r.find_paths()
+    flow = r.flows[0]
+    r.reroute(remove=[flow])
+
+    # Routing around the kept paths fails, so everything is routed again.
+    route = aie.util.route
+    calls = []
+
+    def route_around_fails(DG, flows, *args, **kwargs):
+        calls.append(len(flows))
+        if len(calls) == 1:
+            raise RuntimeError("no routing")
+        return route(DG, flows, *args, **kwargs)
+
+    aie.util.route = route_around_fails
+    try:
+        rerouted = r.reroute(add=[flow])
+    finally:
+        aie.util.route = route
+    # CHECK: rerouted: True
+    print("rerouted:", set(rerouted) == set(routed))
+    # CHECK: flows: 14 full: True
+    print("flows:", r.stats["rerouted"], "full:", r.stats["full_reroute"])
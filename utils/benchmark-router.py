@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Benchmark the routing backends of aie.util.Router.
+
+Every backend is run on the routing problems of the designs in
+test/create-flows (or the designs given on the command line) and on synthetic
+problems with growing numbers of random flows. For each run the size of the
+model, the solve time, the total wire length, the largest edge utilization and
+whether the solver ran out of time are written to a JSON file, for tracking
+regressions across versions.
+
+Example usage:
+$ benchmark-router.py --timeout 60 --flows 16,32,64 -o router_benchmark.json
+$ benchmark-router.py --backends cp_linear,pathfinder test/create-flows/mmult.mlir
+"""
+
+# Copyright (C) 2024, Advanced Micro Devices, Inc.
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from aie._mlir_libs._aie_python_passes import (
+    Port,
+    WireBundle,
+    create_python_router_pass,
+    pass_manager_add_owned_pass,
+)
+
+# noinspection PyUnresolvedReferences
+import aie.dialects.aie
+from aie.ir import Context, Location, Module
+from aie.passmanager import PassManager
+from aie.util import (
+    Router,
+    route_using_cp,
+    route_using_ilp,
+    route_using_pathfinder,
+)
+
+DESIGNS = Path(__file__).parent.parent / "test" / "create-flows"
+
+# The routing functions only need the switchbox and port of an end point, and
+# PathEndPoint can't be constructed from Python.
+SyntheticEndPoint = namedtuple("SyntheticEndPoint", ["sb", "port"])
+
+
+def backends(num_workers):
+    def cp(**kwargs):
+        return lambda DG, flows, timeout, stats: route_using_cp(
+            DG, flows, timeout=timeout, num_workers=num_workers, stats=stats, **kwargs
+        )
+
+    found = {
+        "cp": cp(),
+        "cp_min_edges": cp(min_edges=True),
+        "cp_linear": cp(formulation="linear"),
+        "pathfinder": route_using_pathfinder,
+    }
+    if importlib.util.find_spec("gurobipy"):
+        found["ilp"] = route_using_ilp
+    return found
+
+
+class RecordingRouter(Router):
+    """Routes with the fast backend, and keeps the problem for benchmarking."""
+
+    def __init__(self, problems):
+        super().__init__(backend="pathfinder")
+        self.problems = problems
+
+    def find_paths(self):
+        self.problems.append((self.DG.copy(), list(self.flows)))
+        return super().find_paths()
+
+
+def design_problems(path):
+    problems = []
+    # Files may hold several test modules.
+    for i, src in enumerate(Path(path).read_text().split("// -----")):
+        with Context(), Location.unknown():
+            try:
+                module = Module.parse(src)
+            except Exception as e:
+                print(f"skipping {path}:{i}: {e}", file=sys.stderr)
+                continue
+            recorded = []
+            pm = PassManager()
+            pass_manager_add_owned_pass(
+                pm, create_python_router_pass(RecordingRouter(recorded))
+            )
+            for device in module.body.operations:
+                try:
+                    pm.run(device.operation)
+                except Exception as e:
+                    print(f"skipping {path}:{i}: {e}", file=sys.stderr)
+            for DG, flows in recorded:
+                if flows:
+                    problems.append((f"{Path(path).stem}:{i}", DG, flows))
+    return problems
+
+
+def synthetic_problems(DG, num_flows, seed):
+    """Random flows between the DMAs of the switchboxes of `DG`."""
+    rng = random.Random(seed)
+    switchboxes = list(DG.nodes)
+    for n in num_flows:
+        flows = []
+        while len(flows) < n:
+            src, tgt = rng.sample(switchboxes, 2)
+            channel = len(flows) % 2
+            flows.append(
+                (
+                    SyntheticEndPoint(src, Port(WireBundle.DMA, channel)),
+                    SyntheticEndPoint(tgt, Port(WireBundle.DMA, channel)),
+                )
+            )
+        yield f"synthetic:{n}", DG.copy(), flows
+
+
+def quality(DG, flow_paths):
+    wire_length = sum(len(path) for path in flow_paths.values())
+    # Flows from the same source share their channels.
+    nets = {}
+    for (src, _), path in flow_paths.items():
+        nets.setdefault(src, set()).update(path)
+    demand = Counter(e for edges in nets.values() for e in edges)
+    utilization = [
+        demand[e] / DG.edges[e]["capacity"]
+        for e in demand
+        if DG.edges[e]["capacity"] > 0
+    ]
+    return wire_length, max(utilization, default=0.0)
+
+
+def run(name, backend, route, DG, flows, timeout):
+    stats = {}
+    record = {"problem": name, "backend": backend, "flows": len(flows)}
+    start = time.time()
+    try:
+        flow_paths = route(DG, flows, timeout=timeout, stats=stats)
+    except Exception as e:
+        flow_paths = None
+        record["error"] = str(e)
+    record["solve_time"] = time.time() - start
+    record["variables"] = stats.get("variables")
+    record["constraints"] = stats.get("constraints")
+    record["timed_out"] = stats.get("timed_out", False)
+    record["routed"] = flow_paths is not None
+    if flow_paths is not None:
+        record["wire_length"], record["max_utilization"] = quality(DG, flow_paths)
+    for key in ("status", "objective", "best_bound", "iterations"):
+        if key in stats:
+            record[key] = stats[key]
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "designs",
+        nargs="*",
+        help="MLIR designs to route (default: the designs in test/create-flows)",
+    )
+    parser.add_argument(
+        "--backends",
+        type=lambda s: s.split(","),
+        help="comma-separated backends to run (default: all available)",
+    )
+    parser.add_argument(
+        "--flows",
+        type=lambda s: [int(n) for n in s.split(",")],
+        default=[16, 32, 64, 128],
+        help="numbers of random flows of the synthetic problems (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=int, default=60, help="per solve, in seconds")
+    parser.add_argument("--num-workers", type=int, default=10)
+    parser.add_argument("-o", "--output", default="router_benchmark.json")
+    args = parser.parse_args()
+
+    available = backends(args.num_workers)
+    selected = args.backends or list(available)
+    for backend in selected:
+        if backend not in available:
+            parser.error(f"backend {backend} is not available")
+
+    designs = args.designs or sorted(DESIGNS.glob("*.mlir"))
+    problems = []
+    for design in designs:
+        problems += design_problems(design)
+    if not problems:
+        parser.error("no routing problems found")
+    # The synthetic problems use the largest device among the designs.
+    _, largest, _ = max(problems, key=lambda p: p[1].number_of_nodes())
+    problems += synthetic_problems(largest, args.flows, args.seed)
+
+    results = []
+    for name, DG, flows in problems:
+        for backend in selected:
+            record = run(name, backend, available[backend], DG, flows, args.timeout)
+            results.append(record)
+            print(
+                f"{name:40} {backend:14} {record['flows']:5} flows "
+                f"{record['solve_time']:8.2f}s "
+                f"wire length {record.get('wire_length', '-')!s:>6} "
+                f"max utilization {record.get('max_utilization', float('nan')):.2f}"
+                + (" (timed out)" if record["timed_out"] else "")
+                + ("" if record["routed"] else " (not routed)")
+            )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "timeout": args.timeout,
+                "seed": args.seed,
+                "results": results,
+            },
+            f,
+            indent=1,
+        )
+
+
+if __name__ == "__main__":
+    main()